@@ -60,6 +60,10 @@ class ExprVisitor(ABC):
 
 
 class Expr(ABC):
+    __slots__ = ()
+    # The static type the TypeChecker proved for the expression, if any; only some node classes store one.
+    ctype = None
+
     @abstractmethod
     def accept(self, visitor):
         pass
@@ -68,6 +72,8 @@ class Expr(ABC):
 
 
 class List(Expr):
+    __slots__ = ("values",)
+
     def __init__(self, values):
         self.values = values
 
@@ -76,6 +82,8 @@ class List(Expr):
 
 
 class Subscript(Expr):
+    __slots__ = ("name", "index", "value", "paren", "type")
+
     def __init__(self, name, index, value, paren, type):
         self.name = name
         self.index = index
@@ -90,26 +98,41 @@ class Subscript(Expr):
 # Implement other Expr subclasses for Assign, Binary, Call, Get, Grouping, Literal, Logical, Set, Super, This, Unary, and Variable.
 
 class Assign(Expr):
+    __slots__ = ("name", "value", "type", "depth", "slot", "ctype", "needs_check", "specialization")
+
     def __init__(self, name, value, type):
         self.name = name
         self.value = value
         self.type = type
+        # Written by the Resolver; depth stays None for globals looked up by name.
+        self.depth = None
+        self.slot = None
+        self.ctype = None
+        self.needs_check = True
+        self.specialization = None
 
     def accept(self, visitor):
         return visitor.visit_assign_expr(self)
 
 
 class Binary(Expr):
+    __slots__ = ("left", "operator", "right", "ctype", "specialization")
+
     def __init__(self, left, operator, right):
         self.left = left
         self.operator = operator
         self.right = right
+        self.ctype = None
+        # A Specialization from Runtime.specialization, set by the TypeChecker or the first evaluation.
+        self.specialization = None
 
     def accept(self, visitor):
         return visitor.visit_binary_expr(self)
 
 
 class Call(Expr):
+    __slots__ = ("callee", "paren", "arguments")
+
     def __init__(self, callee, paren, arguments):
         self.callee = callee
         self.paren = paren
@@ -120,41 +143,56 @@ class Call(Expr):
 
 
 class Get(Expr):
+    __slots__ = ("object", "name", "cache")
+
     def __init__(self, object, name):
         self.object = object
         self.name = name
+        # (class, method) last seen at this site, kept as one tuple so it is always replaced whole.
+        self.cache = None
 
     def accept(self, visitor):
         return visitor.visit_get_expr(self)
 
 
 class Grouping(Expr):
+    __slots__ = ("expression", "ctype")
+
     def __init__(self, expression):
         self.expression = expression
+        self.ctype = None
 
     def accept(self, visitor):
         return visitor.visit_grouping_expr(self)
 
 
 class Literal(Expr):
+    __slots__ = ("value", "ctype")
+
     def __init__(self, value):
         self.value = value
+        self.ctype = None
 
     def accept(self, visitor):
         return visitor.visit_literal_expr(self)
 
 
 class Logical(Expr):
+    __slots__ = ("left", "operator", "right", "ctype")
+
     def __init__(self, left, operator, right):
         self.left = left
         self.operator = operator
         self.right = right
+        self.ctype = None
 
     def accept(self, visitor):
         return visitor.visit_logical_expr(self)
 
 
 class Set(Expr):
+    __slots__ = ("object", "name", "value", "type")
+
     def __init__(self, object, name, value, type):
         self.object = object
         self.name = name
@@ -166,34 +204,50 @@ class Set(Expr):
 
 
 class Super(Expr):
+    __slots__ = ("keyword", "method", "depth", "slot")
+
     def __init__(self, keyword, method):
         self.keyword = keyword
         self.method = method
+        self.depth = None
+        self.slot = None
 
     def accept(self, visitor):
         return visitor.visit_super_expr(self)
 
 
 class This(Expr):
+    __slots__ = ("keyword", "depth", "slot")
+
     def __init__(self, keyword):
         self.keyword = keyword
+        self.depth = None
+        self.slot = None
 
     def accept(self, visitor):
         return visitor.visit_this_expr(self)
 
 
 class Unary(Expr):
+    __slots__ = ("operator", "right", "ctype")
+
     def __init__(self, operator, right):
         self.operator = operator
         self.right = right
+        self.ctype = None
 
     def accept(self, visitor):
         return visitor.visit_unary_expr(self)
 
 
 class Variable(Expr):
+    __slots__ = ("name", "depth", "slot", "ctype")
+
     def __init__(self, name):
         self.name = name
+        self.depth = None
+        self.slot = None
+        self.ctype = None
 
     def accept(self, visitor):
         return visitor.visit_variable_expr(self)
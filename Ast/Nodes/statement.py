@@ -46,12 +46,16 @@ class StmtVisitor(Generic[ReturnTypeStmt], ABC):
 
 
 class Stmt(ABC):
+    __slots__ = ()
+
     @abstractmethod
     def accept(self, visitor: StmtVisitor[ReturnTypeStmt]) -> ReturnTypeStmt:
         pass
 
 
 class Block(Stmt):
+    __slots__ = ("statements",)
+
     def __init__(self, statements):
         self.statements = statements
 
@@ -60,6 +64,8 @@ class Block(Stmt):
 
 
 class Class(Stmt):
+    __slots__ = ("name", "superclass", "methods")
+
     def __init__(self, name: Token, superclass: Optional[Variable], methods):
         self.name = name
         self.superclass = superclass
@@ -70,6 +76,8 @@ class Class(Stmt):
 
 
 class Expression(Stmt):
+    __slots__ = ("expression",)
+
     def __init__(self, expression: Expr):
         self.expression = expression
 
@@ -78,6 +86,8 @@ class Expression(Stmt):
 
 
 class Function(Stmt):
+    __slots__ = ("name", "params", "body", "type")
+
     def __init__(self, name: Token,params, body, type: CType):
         self.name = name
         self.params = params
@@ -89,6 +99,8 @@ class Function(Stmt):
 
 
 class If(Stmt):
+    __slots__ = ("condition", "then_branch", "else_branch")
+
     def __init__(self, condition: Expr, then_branch: Stmt, else_branch: Optional[Stmt]):
         self.condition = condition
         self.then_branch = then_branch
@@ -99,6 +111,8 @@ class If(Stmt):
 
 
 class Print(Stmt):
+    __slots__ = ("expression",)
+
     def __init__(self, expression: Expr):
         self.expression = expression
 
@@ -107,6 +121,8 @@ class Print(Stmt):
 
 
 class Return(Stmt):
+    __slots__ = ("keyword", "value")
+
     def __init__(self, keyword: Token, value: Optional[Expr]):
         self.keyword = keyword
         self.value = value
@@ -116,17 +132,24 @@ class Return(Stmt):
 
 
 class Var(Stmt):
+    __slots__ = ("name", "type", "initializer", "needs_check")
+
     def __init__(self, name: Token, type: CType, initializer: Optional[Expr]):
         self.name = name
         self.type = type
         self.initializer = initializer
+        # Cleared by the TypeChecker when the initializer always passes the type check.
+        self.needs_check = True
 
     def accept(self, visitor: StmtVisitor[ReturnTypeStmt]) -> ReturnTypeStmt:
         return visitor.visit_var_stmt(self)
 
 
 class While(Stmt):
-    def __init__(self, condition: Expr, body: Stmt):
+    __slots__ = ("keyword", "condition", "body")
+
+    def __init__(self, keyword: Token, condition: Expr, body: Stmt):
+        self.keyword = keyword
         self.condition = condition
         self.body = body
 
@@ -5,9 +5,9 @@ from Ast.Nodes.statement import Stmt
 class PythonPrinter:
     indentation_level = 0
 
-    def print_nodes(self, statements):
+    def print_nodes(self, statements, output=None):
         for statement in statements:
-            print(self.get_node(statement))
+            print(self.get_node(statement), file=output)
 
     def get_node(self, node):
         if isinstance(node, Expr):
@@ -0,0 +1,54 @@
+# Usage: python -m Benchmarks.call_benchmark [n] [engines]
+import contextlib
+import io
+import sys
+import time
+
+from Runtime.Language_.language import Language
+
+SOURCE = """
+int fib(int n) {{
+    if (n < 2) {{
+        return n;
+    }}
+    return fib(n - 1) + fib(n - 2);
+}}
+WriteLine(fib({n}));
+"""
+
+
+def measure(source, engine, runs=3):
+    best = None
+    output = None
+    for _ in range(runs):
+        buffer = io.StringIO()
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(buffer):
+            Language.run(source, engine=engine)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+        output = buffer.getvalue().splitlines()[0]
+    return best, output
+
+
+def main(args):
+    n = int(args[0]) if args else 25
+    engines = args[1].split(",") if len(args) > 1 else ["tree", "vm", "closures", "python"]
+    source = SOURCE.format(n=n)
+    calls = call_count(n)
+    print(f"fib({n}): {calls} calls")
+    for engine in engines:
+        elapsed, output = measure(source, engine)
+        print(f"{engine:<9} {elapsed:.3f}s  {calls / elapsed / 1000:.0f}k calls/s  result {output}")
+
+
+def call_count(n):
+    # The naive fib(n) makes 2 * F(n + 1) - 1 calls.
+    a, b = 0, 1
+    for _ in range(n + 1):
+        a, b = b, a + b
+    return 2 * a - 1
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,71 @@
+# Usage: python -m Benchmarks.memory_benchmark [statements]
+import gc
+import sys
+import tracemalloc
+
+from Runtime.Language_.error_handler import ErrorHandler
+from SyntaxAnalizer.parser import Parser
+from SyntaxAnalizer.regex_scanner import RegexScanner
+
+STATEMENTS = [
+    "int value{index} = {index} * 2 + 1;",
+    "value{index} += compute(value{index}, {index}.5);",
+    "if (value{index} >= 10 && flag) {{ WriteLine(\"big\"); }} else {{ WriteLine(value{index}); }}",
+    "while (value{index} < 100) {{ value{index} *= 2; }}",
+    "items[{index}] = -value{index} / 3;",
+]
+
+
+def generate(count):
+    return "\n".join(STATEMENTS[index % len(STATEMENTS)].format(index=index) for index in range(count))
+
+
+def fields(node):
+    if hasattr(node, "__dict__"):
+        return list(vars(node))
+    return [field for klass in type(node).__mro__ for field in getattr(klass, "__slots__", ())]
+
+
+def count_objects(statements):
+    nodes = 0
+    tokens = set()
+    stack = list(statements)
+    while stack:
+        node = stack.pop()
+        nodes += 1
+        for field in fields(node):
+            value = getattr(node, field)
+            values = value if isinstance(value, list) else [value]
+            for item in values:
+                if type(item).__module__.startswith("Ast.Nodes"):
+                    stack.append(item)
+                elif type(item).__name__ == "Token":
+                    tokens.add(id(item))
+    return nodes, len(tokens)
+
+
+def measure(source):
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    tokens = RegexScanner(source).scan_tokens()
+    after_tokens = tracemalloc.get_traced_memory()[0]
+    statements = list(Parser(tokens, ErrorHandler()).parse_stream())
+    after_parse = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return tokens, statements, after_tokens - before, after_parse - after_tokens
+
+
+def main(args):
+    count = int(args[0]) if args else 100_000
+    source = generate(count)
+    tokens, statements, token_bytes, node_bytes = measure(source)
+    nodes, _ = count_objects(statements)
+
+    print(f"statements: {len(statements)}, tokens: {len(tokens)}, nodes: {nodes}")
+    print(f"token list: {token_bytes / 1e6:.1f} MB, {token_bytes / len(tokens):.0f} bytes per token")
+    print(f"AST:        {node_bytes / 1e6:.1f} MB, {node_bytes / nodes:.0f} bytes per node")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,73 @@
+# Usage: python -m Benchmarks.scanner_benchmark [megabytes]
+import sys
+import time
+
+from SyntaxAnalizer.scanner import Scanner
+from SyntaxAnalizer.regex_scanner import RegexScanner
+
+CHUNK = """
+// generated block {index}
+int value{index} = {index};
+float ratio{index} = {index}.25;
+string name{index} = "item {index}";
+int[] items{index} = {{ 1, 2, 3, {index} }};
+int compute{index}(int a, int b) {{
+    if (a >= b && b != 0 || false) {{
+        return a * b - {index} / 2;
+    }}
+    value{index} += a;
+    return items{index}[1];
+}}
+class Shape{index}: Base {{
+    float area() {{
+        return ratio{index} * 2.5;
+    }}
+}}
+while (value{index} <= 100) {{
+    value{index} *= 2;
+    WriteLine(compute{index}(value{index}, 3));
+}}
+"""
+
+
+def generate(megabytes):
+    chunks = []
+    size = 0
+    index = 0
+    while size < megabytes * 1024 * 1024:
+        chunk = CHUNK.format(index=index)
+        chunks.append(chunk)
+        size += len(chunk)
+        index += 1
+    return "".join(chunks)
+
+
+def measure(scanner_class, source, runs=3):
+    best = None
+    tokens = None
+    for _ in range(runs):
+        start = time.perf_counter()
+        tokens = scanner_class(source).scan_tokens()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, tokens
+
+
+def main(args):
+    megabytes = float(args[0]) if args else 4
+    source = generate(megabytes)
+    print(f"source: {len(source) / (1024 * 1024):.1f} MB, {source.count(chr(10))} lines")
+
+    loop_time, loop_tokens = measure(Scanner, source)
+    regex_time, regex_tokens = measure(RegexScanner, source)
+    same = [(t.type, t.lexeme, t.literal, t.line) for t in loop_tokens] == \
+           [(t.type, t.lexeme, t.literal, t.line) for t in regex_tokens]
+
+    print(f"tokens: {len(regex_tokens)}, identical: {same}")
+    print(f"Scanner:      {loop_time:.3f}s  {len(source) / loop_time / (1024 * 1024):.2f} MB/s")
+    print(f"RegexScanner: {regex_time:.3f}s  {len(source) / regex_time / (1024 * 1024):.2f} MB/s")
+    print(f"speedup: {loop_time / regex_time:.1f}x")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -20,7 +20,6 @@ class CustomAny:
 
         type1 = get_type(self)
         type2 = get_type(other)
-        print(type1,type2)
         return type1 == type2
 
     def __eq__(self, other):
@@ -0,0 +1,57 @@
+from Runtime.Bytecode.op_code import OpCode, OPERAND_COUNT
+
+
+class Chunk:
+    def __init__(self):
+        self.code = []
+        self.constants = []
+        self.constant_indexes = {}
+
+    def emit(self, op_code, *operands):
+        position = len(self.code)
+        self.code.append(op_code.value)
+        self.code.extend(operands)
+        return position
+
+    def add_constant(self, value):
+        if value is None or isinstance(value, (bool, int, float, str)):
+            key = (type(value), value)
+        else:
+            key = id(value)
+        index = self.constant_indexes.get(key)
+        if index is None:
+            index = len(self.constants)
+            self.constants.append(value)
+            self.constant_indexes[key] = index
+        return index
+
+    def patch(self, position, value):
+        self.code[position] = value
+
+    def disassemble(self, name="<script>"):
+        lines = [f"== {name} =="]
+        ip = 0
+        while ip < len(self.code):
+            op_code = OpCode(self.code[ip])
+            operands = self.code[ip + 1:ip + 1 + OPERAND_COUNT[op_code]]
+            lines.append(f"{ip:04d} {op_code.name:<22} {' '.join(str(operand) for operand in operands)}")
+            ip += 1 + len(operands)
+        return "\n".join(lines)
+
+
+class FunctionProto:
+    def __init__(self, declaration, chunk):
+        self.declaration = declaration
+        self.chunk = chunk
+
+    def __str__(self):
+        return f"<proto {self.declaration.name.lexeme}>"
+
+
+class ClassProto:
+    def __init__(self, declaration, methods):
+        self.declaration = declaration
+        self.methods = methods
+
+    def __str__(self):
+        return f"<proto class {self.declaration.name.lexeme}>"
@@ -0,0 +1,242 @@
+import operator
+
+from Token.token_type import TokenType
+from Ast.Nodes.expression import Get
+from Runtime.Language_.assign_type import AssignType
+from Runtime.Bytecode.op_code import OpCode
+from Runtime.Bytecode.chunk import Chunk, FunctionProto, ClassProto
+
+BINARY_OP_CODES = {
+    TokenType.PLUS: OpCode.ADD,
+    TokenType.MINUS: OpCode.SUBTRACT,
+    TokenType.STAR: OpCode.MULTIPLY,
+    TokenType.SLASH: OpCode.DIVIDE,
+    TokenType.GREATER: OpCode.GREATER,
+    TokenType.GREATER_EQUAL: OpCode.GREATER_EQUAL,
+    TokenType.LESS: OpCode.LESS,
+    TokenType.LESS_EQUAL: OpCode.LESS_EQUAL,
+}
+
+# Operator applied by the VM's fast path for compound assignment to int variables.
+ASSIGN_OPERATORS = {
+    AssignType.PLUS_ASSIGN: operator.add,
+    AssignType.MINUS_ASSIGN: operator.sub,
+    AssignType.STAR_ASSIGN: operator.mul,
+    AssignType.SLASH_ASSIGN: operator.truediv,
+}
+
+
+class Compiler:
+    def __init__(self, interpreter):
+        self.interpreter = interpreter
+        self.chunk = None
+
+    def compile(self, statements):
+        self.chunk = Chunk()
+        for statement in statements:
+            self.compile_stmt(statement)
+        self.emit_return()
+        return self.chunk
+
+    def compile_function(self, declaration):
+        enclosing_chunk = self.chunk
+        self.chunk = Chunk()
+        for statement in declaration.body:
+            self.compile_stmt(statement)
+        self.emit_return()
+        proto = FunctionProto(declaration, self.chunk)
+        self.chunk = enclosing_chunk
+        return proto
+
+    def compile_stmt(self, stmt):
+        stmt.accept(visitor=self)
+
+    def compile_expr(self, expr):
+        expr.accept(visitor=self)
+
+    def emit(self, op_code, *operands):
+        return self.chunk.emit(op_code, *operands)
+
+    def constant(self, value):
+        return self.chunk.add_constant(value)
+
+    def emit_constant(self, value):
+        self.emit(OpCode.CONSTANT, self.constant(value))
+
+    def emit_return(self):
+        self.emit_constant(None)
+        self.emit(OpCode.RETURN)
+
+    def emit_jump(self, op_code):
+        return self.emit(op_code, -1) + 1
+
+    def patch_jump(self, operand_position):
+        self.chunk.patch(operand_position, len(self.chunk.code))
+
+    def emit_get_variable(self, expr, name):
+        if expr.depth is not None:
+            self.emit(OpCode.GET_LOCAL, expr.depth, expr.slot, self.constant(name))
+        else:
+            self.emit(OpCode.GET_GLOBAL, self.constant(name))
+
+    # ----------------------------
+    # ExprVisitor
+    # ----------------------------
+
+    def visit_list_expr(self, expr):
+        for value in expr.values:
+            self.compile_expr(value)
+        self.emit(OpCode.BUILD_LIST, len(expr.values))
+
+    def visit_subscript_expr(self, expr):
+        self.compile_expr(expr.name)
+        self.compile_expr(expr.index)
+        if expr.value is not None:
+            self.compile_expr(expr.value)
+            self.emit(OpCode.SET_INDEX, self.constant(expr.paren), self.constant(expr.type))
+        else:
+            self.emit(OpCode.GET_INDEX, self.constant(expr.paren))
+
+    def visit_assign_expr(self, expr):
+        self.compile_expr(expr.value)
+        if expr.depth is not None:
+            self.emit(OpCode.ASSIGN_LOCAL, expr.depth, expr.slot, self.constant(expr.name), self.constant(expr.type),
+                      self.constant(ASSIGN_OPERATORS.get(expr.type)), int(expr.needs_check))
+        else:
+            self.emit(OpCode.ASSIGN_GLOBAL, self.constant(expr.name), self.constant(expr.type))
+
+    def visit_binary_expr(self, expr):
+        self.compile_expr(expr.left)
+        self.compile_expr(expr.right)
+        operator_type = expr.operator.type
+        if operator_type == TokenType.EQUAL_EQUAL:
+            self.emit(OpCode.EQUAL)
+        elif operator_type == TokenType.BANG_EQUAL:
+            self.emit(OpCode.NOT_EQUAL)
+        elif operator_type in BINARY_OP_CODES:
+            self.emit(BINARY_OP_CODES[operator_type], self.constant(expr.operator))
+        else:
+            self.emit(OpCode.POP)
+            self.emit(OpCode.POP)
+            self.emit_constant(None)
+
+    def visit_call_expr(self, expr):
+        if expr.callee.__class__ is Get:
+            # GET_METHOD leaves the receiver and the unbound method on the stack for INVOKE.
+            self.compile_expr(expr.callee.object)
+            self.emit(OpCode.GET_METHOD, self.constant(expr.callee))
+            for argument in expr.arguments:
+                self.compile_expr(argument)
+            self.emit(OpCode.INVOKE, len(expr.arguments), self.constant(expr.paren))
+            return
+        self.compile_expr(expr.callee)
+        for argument in expr.arguments:
+            self.compile_expr(argument)
+        self.emit(OpCode.CALL, len(expr.arguments), self.constant(expr.paren))
+
+    def visit_get_expr(self, expr):
+        self.compile_expr(expr.object)
+        self.emit(OpCode.GET_PROPERTY, self.constant(expr))
+
+    def visit_grouping_expr(self, expr):
+        self.compile_expr(expr.expression)
+
+    def visit_literal_expr(self, expr):
+        self.emit_constant(expr.value)
+
+    def visit_logical_expr(self, expr):
+        self.compile_expr(expr.left)
+        if expr.operator.type == TokenType.OR:
+            end_jump = self.emit_jump(OpCode.JUMP_IF_TRUE_OR_POP)
+        else:
+            end_jump = self.emit_jump(OpCode.JUMP_IF_FALSE_OR_POP)
+        self.compile_expr(expr.right)
+        self.patch_jump(end_jump)
+
+    def visit_set_expr(self, expr):
+        self.compile_expr(expr.object)
+        self.compile_expr(expr.value)
+        self.emit(OpCode.SET_PROPERTY, self.constant(expr.name), self.constant(expr.type))
+
+    def visit_super_expr(self, expr):
+        self.emit(OpCode.GET_SUPER, expr.depth, self.constant(expr.method))
+
+    def visit_this_expr(self, expr):
+        self.emit_get_variable(expr, expr.keyword)
+
+    def visit_unary_expr(self, expr):
+        self.compile_expr(expr.right)
+        if expr.operator.type == TokenType.BANG:
+            self.emit(OpCode.NOT)
+        elif expr.operator.type == TokenType.MINUS:
+            self.emit(OpCode.NEGATE, self.constant(expr.operator))
+        else:
+            self.emit(OpCode.POP)
+            self.emit_constant(None)
+
+    def visit_variable_expr(self, expr):
+        self.emit_get_variable(expr, expr.name)
+
+    # ----------------------------
+    # StmtVisitor
+    # ----------------------------
+
+    def visit_var_stmt(self, stmt):
+        if stmt.initializer is not None:
+            self.compile_expr(stmt.initializer)
+        else:
+            self.emit_constant(None)
+        self.emit(OpCode.DEFINE, self.constant(stmt.name), self.constant(stmt.type), int(stmt.needs_check))
+
+    def visit_while_stmt(self, stmt):
+        loop_start = len(self.chunk.code)
+        self.compile_expr(stmt.condition)
+        # Charges a step each time the condition lets the body run, as the other engines do.
+        exit_jump = self.emit(OpCode.ENTER_LOOP, -1, self.constant(stmt.keyword)) + 1
+        self.compile_stmt(stmt.body)
+        self.emit(OpCode.LOOP, loop_start)
+        self.patch_jump(exit_jump)
+
+    def visit_block_stmt(self, stmt):
+        self.emit(OpCode.BEGIN_SCOPE)
+        for statement in stmt.statements:
+            self.compile_stmt(statement)
+        self.emit(OpCode.END_SCOPE)
+
+    def visit_class_stmt(self, stmt):
+        if stmt.superclass is not None:
+            self.compile_expr(stmt.superclass)
+        else:
+            self.emit_constant(None)
+        methods = [self.compile_function(method) for method in stmt.methods]
+        self.emit(OpCode.CLASS, self.constant(ClassProto(stmt, methods)))
+
+    def visit_expression_stmt(self, stmt):
+        self.compile_expr(stmt.expression)
+        self.emit(OpCode.POP)
+
+    def visit_function_stmt(self, stmt):
+        self.emit(OpCode.FUNCTION, self.constant(self.compile_function(stmt)))
+
+    def visit_if_stmt(self, stmt):
+        self.compile_expr(stmt.condition)
+        else_jump = self.emit_jump(OpCode.JUMP_IF_FALSE)
+        self.compile_stmt(stmt.then_branch)
+        if stmt.else_branch is not None:
+            end_jump = self.emit_jump(OpCode.JUMP)
+            self.patch_jump(else_jump)
+            self.compile_stmt(stmt.else_branch)
+            self.patch_jump(end_jump)
+        else:
+            self.patch_jump(else_jump)
+
+    def visit_print_stmt(self, stmt):
+        self.compile_expr(stmt.expression)
+        self.emit(OpCode.PRINT)
+
+    def visit_return_stmt(self, stmt):
+        if stmt.value is not None:
+            self.compile_expr(stmt.value)
+        else:
+            self.emit_constant(None)
+        self.emit(OpCode.RETURN)
@@ -0,0 +1,100 @@
+from enum import IntEnum
+
+
+class OpCode(IntEnum):
+    # Stack.
+    CONSTANT = 0
+    POP = 1
+
+    # Variables.
+    GET_LOCAL = 2
+    GET_GLOBAL = 3
+    ASSIGN_LOCAL = 4
+    ASSIGN_GLOBAL = 5
+    DEFINE = 6
+
+    # Operators.
+    ADD = 7
+    SUBTRACT = 8
+    MULTIPLY = 9
+    DIVIDE = 10
+    GREATER = 11
+    GREATER_EQUAL = 12
+    LESS = 13
+    LESS_EQUAL = 14
+    EQUAL = 15
+    NOT_EQUAL = 16
+    NOT = 17
+    NEGATE = 18
+
+    # Control flow.
+    JUMP = 19
+    JUMP_IF_FALSE = 20
+    JUMP_IF_TRUE_OR_POP = 21
+    JUMP_IF_FALSE_OR_POP = 22
+    LOOP = 38
+    ENTER_LOOP = 39
+    PRINT = 23
+    RETURN = 24
+    BEGIN_SCOPE = 25
+    END_SCOPE = 26
+
+    # Calls and objects.
+    CALL = 27
+    FUNCTION = 28
+    CLASS = 29
+    GET_PROPERTY = 30
+    SET_PROPERTY = 31
+    GET_SUPER = 32
+    GET_METHOD = 36
+    INVOKE = 37
+
+    # Lists.
+    BUILD_LIST = 33
+    GET_INDEX = 34
+    SET_INDEX = 35
+
+
+# Number of operand slots that follow each opcode in Chunk.code.
+OPERAND_COUNT = {
+    OpCode.CONSTANT: 1,
+    OpCode.POP: 0,
+    OpCode.GET_LOCAL: 3,
+    OpCode.GET_GLOBAL: 1,
+    OpCode.ASSIGN_LOCAL: 6,
+    OpCode.ASSIGN_GLOBAL: 2,
+    OpCode.DEFINE: 3,
+    OpCode.ADD: 1,
+    OpCode.SUBTRACT: 1,
+    OpCode.MULTIPLY: 1,
+    OpCode.DIVIDE: 1,
+    OpCode.GREATER: 1,
+    OpCode.GREATER_EQUAL: 1,
+    OpCode.LESS: 1,
+    OpCode.LESS_EQUAL: 1,
+    OpCode.EQUAL: 0,
+    OpCode.NOT_EQUAL: 0,
+    OpCode.NOT: 0,
+    OpCode.NEGATE: 1,
+    OpCode.JUMP: 1,
+    OpCode.JUMP_IF_FALSE: 1,
+    OpCode.JUMP_IF_TRUE_OR_POP: 1,
+    OpCode.JUMP_IF_FALSE_OR_POP: 1,
+    OpCode.LOOP: 1,
+    OpCode.ENTER_LOOP: 2,
+    OpCode.PRINT: 0,
+    OpCode.RETURN: 0,
+    OpCode.BEGIN_SCOPE: 0,
+    OpCode.END_SCOPE: 0,
+    OpCode.CALL: 2,
+    OpCode.FUNCTION: 1,
+    OpCode.CLASS: 1,
+    OpCode.GET_PROPERTY: 1,
+    OpCode.SET_PROPERTY: 2,
+    OpCode.GET_SUPER: 2,
+    OpCode.GET_METHOD: 1,
+    OpCode.INVOKE: 2,
+    OpCode.BUILD_LIST: 1,
+    OpCode.GET_INDEX: 1,
+    OpCode.SET_INDEX: 2,
+}
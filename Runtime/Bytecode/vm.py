@@ -0,0 +1,540 @@
+from Token.token_type import TokenType
+from Runtime.Bytecode.op_code import OpCode
+from Runtime.Language_.c_type import CType
+from Runtime.Language_.language_class import LanguageClass
+from Runtime.Language_.language_function import LanguageFunction
+from Runtime.Language_.language_instance import LanguageInstance
+from Runtime.Language_.language_list import LanguageList
+from Runtime.environment import Environment
+from Runtime.runtime_error import RuntimeError, AbortError, StackOverflowError
+
+CONSTANT = OpCode.CONSTANT.value
+POP = OpCode.POP.value
+GET_LOCAL = OpCode.GET_LOCAL.value
+GET_GLOBAL = OpCode.GET_GLOBAL.value
+ASSIGN_LOCAL = OpCode.ASSIGN_LOCAL.value
+ASSIGN_GLOBAL = OpCode.ASSIGN_GLOBAL.value
+DEFINE = OpCode.DEFINE.value
+ADD = OpCode.ADD.value
+SUBTRACT = OpCode.SUBTRACT.value
+MULTIPLY = OpCode.MULTIPLY.value
+DIVIDE = OpCode.DIVIDE.value
+GREATER = OpCode.GREATER.value
+GREATER_EQUAL = OpCode.GREATER_EQUAL.value
+LESS = OpCode.LESS.value
+LESS_EQUAL = OpCode.LESS_EQUAL.value
+EQUAL = OpCode.EQUAL.value
+NOT_EQUAL = OpCode.NOT_EQUAL.value
+NOT = OpCode.NOT.value
+NEGATE = OpCode.NEGATE.value
+JUMP = OpCode.JUMP.value
+JUMP_IF_FALSE = OpCode.JUMP_IF_FALSE.value
+JUMP_IF_TRUE_OR_POP = OpCode.JUMP_IF_TRUE_OR_POP.value
+JUMP_IF_FALSE_OR_POP = OpCode.JUMP_IF_FALSE_OR_POP.value
+LOOP = OpCode.LOOP.value
+ENTER_LOOP = OpCode.ENTER_LOOP.value
+PRINT = OpCode.PRINT.value
+RETURN = OpCode.RETURN.value
+BEGIN_SCOPE = OpCode.BEGIN_SCOPE.value
+END_SCOPE = OpCode.END_SCOPE.value
+CALL = OpCode.CALL.value
+FUNCTION = OpCode.FUNCTION.value
+CLASS = OpCode.CLASS.value
+GET_PROPERTY = OpCode.GET_PROPERTY.value
+SET_PROPERTY = OpCode.SET_PROPERTY.value
+GET_SUPER = OpCode.GET_SUPER.value
+BUILD_LIST = OpCode.BUILD_LIST.value
+GET_INDEX = OpCode.GET_INDEX.value
+SET_INDEX = OpCode.SET_INDEX.value
+GET_METHOD = OpCode.GET_METHOD.value
+INVOKE = OpCode.INVOKE.value
+
+INT = CType.INT
+
+
+def are_numbers(left, right):
+    return (isinstance(left, int) and isinstance(right, int)) or (isinstance(left, float) and isinstance(right, float))
+
+
+# Python frames a nested VM.run takes when a VM function is called from outside the VM loop.
+FRAMES_PER_CALL = 8
+
+
+class VmFunction(LanguageFunction):
+    def __init__(self, declaration, closure, is_initializer, chunk):
+        super().__init__(declaration, closure, is_initializer)
+        self.chunk = chunk
+
+    def bind(self, instance):
+        return VmFunction(declaration=self.declaration, closure=instance.receiver(self.closure),
+                          is_initializer=self.is_initializer, chunk=self.chunk)
+
+    def run(self, interpreter, closure, arguments):
+        return VM(interpreter).call_function(self, closure, arguments)
+
+
+class VM:
+    def __init__(self, interpreter):
+        self.interpreter = interpreter
+
+    def interpret(self, chunk, is_printable=True):
+        self.interpreter.is_printable = is_printable
+        self.interpreter.globals_version += 1
+        try:
+            with self.interpreter.call_stack(FRAMES_PER_CALL):
+                self.run(chunk.code, chunk.constants, self.interpreter.environment)
+        except RuntimeError as error:
+            self.interpreter.error_handler.runtime_error(error)
+
+    def call_function(self, function, closure, arguments):
+        interpreter = self.interpreter
+        if interpreter.call_depth >= interpreter.max_call_depth:
+            raise StackOverflowError(function.declaration.name, "Stack overflow.")
+        interpreter.steps_left -= 1
+        if interpreter.steps_left < 0:
+            interpreter.refill_steps(function.declaration.name)
+        environment = Environment(enclosing=closure)
+        for param, argument in zip(function.declaration.params, arguments):
+            environment.define(param.name.lexeme, type_=None, value=argument)
+        interpreter.call_depth += 1
+        try:
+            value = self.run(function.chunk.code, function.chunk.constants, environment)
+        except AbortError:
+            raise
+        except RecursionError:
+            raise StackOverflowError(function.declaration.name, "Stack overflow.")
+        except Exception:
+            return None
+        finally:
+            interpreter.call_depth -= 1
+        if function.is_initializer:
+            return closure.get_at(distance=0, slot=0)
+        return value
+
+    def run(self, code, constants, environment):
+        interpreter = self.interpreter
+        globals_ = interpreter.globals
+        stack = []
+        # Each frame saves the caller state together with the callee it was pushed for:
+        # (code, constants, return ip, environment, stack height, callee, receiver)
+        frames = []
+        # Calls between VM functions only push frames, so the frame count is the call depth here.
+        max_frames = interpreter.max_call_depth - interpreter.call_depth
+        ip = 0
+
+        while True:
+            try:
+                while True:
+                    op = code[ip]
+
+                    if op == GET_LOCAL:
+                        env = environment
+                        depth = code[ip + 1]
+                        while depth:
+                            env = env.enclosing
+                            depth -= 1
+                        value = env.values[code[ip + 2]]
+                        if value is None:
+                            raise RuntimeError(constants[code[ip + 3]], "Variable not initialized.")
+                        stack.append(value)
+                        ip += 4
+
+                    elif op == CONSTANT:
+                        stack.append(constants[code[ip + 1]])
+                        ip += 2
+
+                    elif op == JUMP_IF_FALSE:
+                        value = stack.pop()
+                        if value is None or value is False:
+                            ip = code[ip + 1]
+                        else:
+                            ip += 2
+
+                    elif op == ENTER_LOOP:
+                        value = stack.pop()
+                        if value is None or value is False:
+                            ip = code[ip + 1]
+                        else:
+                            interpreter.steps_left -= 1
+                            if interpreter.steps_left < 0:
+                                interpreter.refill_steps(constants[code[ip + 2]])
+                            ip += 3
+
+                    elif op == ASSIGN_LOCAL:
+                        env = environment
+                        depth = code[ip + 1]
+                        while depth:
+                            env = env.enclosing
+                            depth -= 1
+                        slot = code[ip + 2]
+                        name = constants[code[ip + 3]]
+                        assign_operator = constants[code[ip + 5]]
+                        value = stack[-1]
+                        var_type = env.types[slot]
+                        previous_value = env.values[slot]
+                        if assign_operator is None:
+                            new_value = None if previous_value is None or value is None else value
+                        elif previous_value.__class__ is value.__class__ is int:
+                            new_value = assign_operator(previous_value, value)
+                        else:
+                            new_value = interpreter.handle_assigning(constants[code[ip + 4]], name, previous_value,
+                                                                     value)
+                        if code[ip + 6] and not (var_type is INT and value.__class__ is int):
+                            interpreter.check_type(name, var_type, value)
+                        env.values[slot] = new_value
+                        stack[-1] = new_value
+                        ip += 7
+
+                    elif op == LESS:
+                        right = stack.pop()
+                        left = stack[-1]
+                        if not (left.__class__ is right.__class__ is int or are_numbers(left, right)):
+                            raise RuntimeError(constants[code[ip + 1]], "Operands must be numbers.")
+                        stack[-1] = left < right
+                        ip += 2
+
+                    elif op == ADD:
+                        right = stack.pop()
+                        left = stack[-1]
+                        if not (left.__class__ is right.__class__ is int or are_numbers(left, right)):
+                            raise RuntimeError(constants[code[ip + 1]], "Operands must be numbers.")
+                        stack[-1] = left + right
+                        ip += 2
+
+                    elif op == JUMP:
+                        ip = code[ip + 1]
+
+                    elif op == LOOP:
+                        ip = code[ip + 1]
+
+                    elif op == POP:
+                        stack.pop()
+                        ip += 1
+
+                    elif op == SUBTRACT:
+                        right = stack.pop()
+                        left = stack[-1]
+                        if not (left.__class__ is right.__class__ is int or are_numbers(left, right)):
+                            raise RuntimeError(constants[code[ip + 1]], "Operands must be numbers.")
+                        stack[-1] = left - right
+                        ip += 2
+
+                    elif op == MULTIPLY:
+                        right = stack.pop()
+                        left = stack[-1]
+                        if not (left.__class__ is right.__class__ is int or are_numbers(left, right)):
+                            raise RuntimeError(constants[code[ip + 1]], "Operands must be numbers.")
+                        stack[-1] = left * right
+                        ip += 2
+
+                    elif op == DIVIDE:
+                        right = stack.pop()
+                        left = stack[-1]
+                        if not (left.__class__ is right.__class__ is int or are_numbers(left, right)):
+                            raise RuntimeError(constants[code[ip + 1]], "Operands must be numbers.")
+                        stack[-1] = left / right
+                        ip += 2
+
+                    elif op == GREATER:
+                        right = stack.pop()
+                        left = stack[-1]
+                        if not (left.__class__ is right.__class__ is int or are_numbers(left, right)):
+                            raise RuntimeError(constants[code[ip + 1]], "Operands must be numbers.")
+                        stack[-1] = left > right
+                        ip += 2
+
+                    elif op == GREATER_EQUAL:
+                        right = stack.pop()
+                        left = stack[-1]
+                        if not (left.__class__ is right.__class__ is int or are_numbers(left, right)):
+                            raise RuntimeError(constants[code[ip + 1]], "Operands must be numbers.")
+                        stack[-1] = left >= right
+                        ip += 2
+
+                    elif op == LESS_EQUAL:
+                        right = stack.pop()
+                        left = stack[-1]
+                        if not (left.__class__ is right.__class__ is int or are_numbers(left, right)):
+                            raise RuntimeError(constants[code[ip + 1]], "Operands must be numbers.")
+                        stack[-1] = left <= right
+                        ip += 2
+
+                    elif op == EQUAL:
+                        right = stack.pop()
+                        stack[-1] = interpreter.is_equal(stack[-1], right)
+                        ip += 1
+
+                    elif op == NOT_EQUAL:
+                        right = stack.pop()
+                        stack[-1] = not interpreter.is_equal(stack[-1], right)
+                        ip += 1
+
+                    elif op == NOT:
+                        value = stack[-1]
+                        stack[-1] = value is None or value is False
+                        ip += 1
+
+                    elif op == NEGATE:
+                        interpreter.check_number_operand(constants[code[ip + 1]], stack[-1])
+                        stack[-1] = -stack[-1]
+                        ip += 2
+
+                    elif op == JUMP_IF_TRUE_OR_POP:
+                        value = stack[-1]
+                        if value is None or value is False:
+                            stack.pop()
+                            ip += 2
+                        else:
+                            ip = code[ip + 1]
+
+                    elif op == JUMP_IF_FALSE_OR_POP:
+                        value = stack[-1]
+                        if value is None or value is False:
+                            ip = code[ip + 1]
+                        else:
+                            stack.pop()
+                            ip += 2
+
+                    elif op == GET_GLOBAL:
+                        name = constants[code[ip + 1]]
+                        value = globals_.get(name)
+                        if value is None:
+                            raise RuntimeError(name, "Variable not initialized.")
+                        stack.append(value)
+                        ip += 2
+
+                    elif op == ASSIGN_GLOBAL:
+                        name = constants[code[ip + 1]]
+                        value = stack[-1]
+                        var_type = globals_.get_type(name)
+                        new_value = interpreter.handle_assigning(constants[code[ip + 2]], name, globals_.get(name), value)
+                        interpreter.check_type(name, var_type, value)
+                        globals_.assign(name, var_type, new_value)
+                        stack[-1] = new_value
+                        ip += 3
+
+                    elif op == DEFINE:
+                        name = constants[code[ip + 1]]
+                        var_type = constants[code[ip + 2]]
+                        value = stack.pop()
+                        if code[ip + 3]:
+                            interpreter.check_type(name, var_type, value)
+                        environment.define(name.lexeme, var_type, value)
+                        ip += 4
+
+                    elif op == CALL:
+                        arg_count = code[ip + 1]
+                        paren = constants[code[ip + 2]]
+                        callee_index = len(stack) - arg_count - 1
+                        callee = stack[callee_index]
+
+                        if callee.__class__ is VmFunction:
+                            params = callee.declaration.params
+                            if arg_count != len(params):
+                                raise RuntimeError(paren, f"Expected {len(params)} arguments but got {arg_count}.")
+                            new_environment = Environment(enclosing=callee.closure)
+                            for i in range(arg_count):
+                                new_environment.define(params[i].name.lexeme, None, stack[callee_index + 1 + i])
+                            if len(frames) >= max_frames:
+                                raise StackOverflowError(paren, "Stack overflow.")
+                            interpreter.steps_left -= 1
+                            if interpreter.steps_left < 0:
+                                interpreter.refill_steps(paren)
+                            del stack[callee_index:]
+                            frames.append((code, constants, ip + 3, environment, callee_index, callee, None))
+                            code = callee.chunk.code
+                            constants = callee.chunk.constants
+                            environment = new_environment
+                            ip = 0
+                            continue
+
+                        arguments = stack[callee_index + 1:]
+                        interpreter.check_call(callee, arguments, paren)
+                        if isinstance(callee, LanguageClass):
+                            instance = LanguageInstance(cls=callee)
+                            initializer = callee.find_method("init")
+                            if initializer.__class__ is VmFunction:
+                                bound = initializer.bind(instance)
+                                new_environment = Environment(enclosing=bound.closure)
+                                for i, param in enumerate(bound.declaration.params):
+                                    new_environment.define(param.name.lexeme, None, arguments[i])
+                                if len(frames) >= max_frames:
+                                    raise StackOverflowError(paren, "Stack overflow.")
+                                interpreter.steps_left -= 1
+                                if interpreter.steps_left < 0:
+                                    interpreter.refill_steps(paren)
+                                del stack[callee_index:]
+                                frames.append((code, constants, ip + 3, environment, callee_index, bound, instance))
+                                code = bound.chunk.code
+                                constants = bound.chunk.constants
+                                environment = new_environment
+                                ip = 0
+                                continue
+                            if initializer is not None:
+                                initializer.bind(instance=instance).call(interpreter, arguments)
+                            result = instance
+                        else:
+                            result = callee.call(interpreter, arguments)
+                        del stack[callee_index:]
+                        stack.append(result)
+                        ip += 3
+
+                    elif op == RETURN:
+                        value = stack.pop()
+                        if not frames:
+                            return value
+                        code, constants, ip, environment, stack_height, function, receiver = frames.pop()
+                        if receiver is not None:
+                            value = receiver
+                        elif function.is_initializer:
+                            value = function.closure.get_at(distance=0, slot=0)
+                        del stack[stack_height:]
+                        stack.append(value)
+
+                    elif op == BEGIN_SCOPE:
+                        environment = Environment(enclosing=environment)
+                        ip += 1
+
+                    elif op == END_SCOPE:
+                        environment = environment.enclosing
+                        ip += 1
+
+                    elif op == PRINT:
+                        value = stack.pop()
+                        if interpreter.is_printable:
+                            interpreter.write_line(interpreter.stringify(value))
+                        ip += 1
+
+                    elif op == GET_PROPERTY:
+                        stack[-1] = interpreter.get_property(stack[-1], constants[code[ip + 1]])
+                        ip += 2
+
+                    elif op == GET_METHOD:
+                        obj = stack[-1]
+                        site = constants[code[ip + 1]]
+                        method = interpreter.lookup_method(obj, site)
+                        if method is None:
+                            # A field or a non-instance: INVOKE sees no receiver and makes a plain call.
+                            stack[-1] = None
+                            stack.append(interpreter.get_property(obj, site))
+                        else:
+                            stack.append(method)
+                        ip += 2
+
+                    elif op == INVOKE:
+                        arg_count = code[ip + 1]
+                        paren = constants[code[ip + 2]]
+                        receiver_index = len(stack) - arg_count - 2
+                        receiver = stack[receiver_index]
+                        callee = stack[receiver_index + 1]
+
+                        if callee.__class__ is VmFunction and receiver is not None:
+                            params = callee.declaration.params
+                            if arg_count != len(params):
+                                raise RuntimeError(paren, f"Expected {len(params)} arguments but got {arg_count}.")
+                            new_environment = Environment(enclosing=receiver.receiver(callee.closure))
+                            for i in range(arg_count):
+                                new_environment.define(params[i].name.lexeme, None, stack[receiver_index + 2 + i])
+                            if len(frames) >= max_frames:
+                                raise StackOverflowError(paren, "Stack overflow.")
+                            interpreter.steps_left -= 1
+                            if interpreter.steps_left < 0:
+                                interpreter.refill_steps(paren)
+                            del stack[receiver_index:]
+                            frames.append((code, constants, ip + 3, environment, receiver_index, callee,
+                                           receiver if callee.is_initializer else None))
+                            code = callee.chunk.code
+                            constants = callee.chunk.constants
+                            environment = new_environment
+                            ip = 0
+                            continue
+
+                        arguments = stack[receiver_index + 2:]
+                        if receiver is None:
+                            interpreter.check_call(callee, arguments, paren)
+                            result = callee.call(interpreter, arguments)
+                        else:
+                            result = interpreter.invoke(receiver, callee, arguments, paren)
+                        del stack[receiver_index:]
+                        stack.append(result)
+                        ip += 3
+
+                    elif op == SET_PROPERTY:
+                        value = stack.pop()
+                        obj = stack[-1]
+                        name = constants[code[ip + 1]]
+                        if not isinstance(obj, LanguageInstance):
+                            raise RuntimeError(name, "Only instances have fields.")
+                        stack[-1] = interpreter.set_property(obj, name, value, constants[code[ip + 2]])
+                        ip += 3
+
+                    elif op == GET_SUPER:
+                        stack.append(interpreter.get_super(environment, code[ip + 1], constants[code[ip + 2]]))
+                        ip += 3
+
+                    elif op == BUILD_LIST:
+                        count = code[ip + 1]
+                        lst = LanguageList()
+                        if count:
+                            for value in stack[-count:]:
+                                lst.append(value)
+                            del stack[-count:]
+                        stack.append(lst)
+                        ip += 2
+
+                    elif op == GET_INDEX:
+                        paren = constants[code[ip + 1]]
+                        index = stack.pop()
+                        name = stack[-1]
+                        index = interpreter.check_subscript(name, index, paren)
+                        stack[-1] = interpreter.get_subscript(name, index, paren)
+                        ip += 2
+
+                    elif op == SET_INDEX:
+                        paren = constants[code[ip + 1]]
+                        value = stack.pop()
+                        index = stack.pop()
+                        name = stack[-1]
+                        index = interpreter.check_subscript(name, index, paren)
+                        stack[-1] = interpreter.set_subscript(name, index, value, constants[code[ip + 2]], paren)
+                        ip += 3
+
+                    elif op == FUNCTION:
+                        proto = constants[code[ip + 1]]
+                        declaration = proto.declaration
+                        function = VmFunction(declaration, environment, False, proto.chunk)
+                        environment.define(declaration.name.lexeme, declaration.type, function)
+                        ip += 2
+
+                    elif op == CLASS:
+                        proto = constants[code[ip + 1]]
+                        declaration = proto.declaration
+                        superclass = stack.pop()
+                        class_environment = environment
+                        key = environment.define(declaration.name.lexeme, TokenType.NONE, None)
+                        if declaration.superclass is not None:
+                            if not isinstance(superclass, LanguageClass):
+                                raise RuntimeError(declaration.superclass.name, "Superclass must be a class.")
+                            environment = Environment(enclosing=environment)
+                            environment.define("super", TokenType.NONE, superclass)
+
+                        methods = {}
+                        for method in proto.methods:
+                            name = method.declaration.name.lexeme
+                            methods[name] = VmFunction(method.declaration, environment, name == "init", method.chunk)
+                        klass = LanguageClass(declaration.name.lexeme, superclass, methods)
+                        class_environment.set(key, TokenType.NONE, klass)
+                        if declaration.superclass is not None:
+                            environment = environment.enclosing
+                        ip += 2
+
+                    else:
+                        raise ValueError(f"Unknown op code {op}.")
+
+            except Exception as error:
+                # A failing function body evaluates to nil in its caller, like LanguageFunction.call.
+                if not frames or isinstance(error, AbortError):
+                    raise
+                code, constants, ip, environment, stack_height, function, receiver = frames.pop()
+                del stack[stack_height:]
+                stack.append(receiver)
@@ -0,0 +1,103 @@
+# Usage: python -m Runtime.Language_.batch_runner <directory or .cs files...> [--engine tree] [--workers N]
+import argparse
+import os
+import sys
+import traceback
+from concurrent.futures import ProcessPoolExecutor
+
+from Runtime.Language_.session import Session
+from Runtime.compile_cache import CompileCache
+from Runtime.output_sink import CaptureSink
+
+EXIT_OK = 0
+EXIT_COMPILE_ERROR = 65
+EXIT_RUNTIME_ERROR = 70
+EXIT_CRASH = 1
+
+# Set in each worker process by init_worker.
+compile_cache = None
+
+
+class ScriptResult:
+    def __init__(self, path, exit_code, stdout, error=None):
+        self.path = path
+        self.exit_code = exit_code
+        self.stdout = stdout
+        self.error = error
+
+    def __repr__(self):
+        return f"ScriptResult({self.path!r}, exit_code={self.exit_code})"
+
+
+def collect_scripts(paths):
+    scripts = []
+    for path in paths:
+        if not os.path.isdir(path):
+            scripts.append(path)
+            continue
+        for root, directories, files in os.walk(path):
+            directories.sort()
+            scripts.extend(os.path.join(root, name) for name in sorted(files) if name.endswith(".cs"))
+    return scripts
+
+
+def init_worker(cache_directory):
+    global compile_cache
+    if cache_directory is not None:
+        compile_cache = CompileCache(cache_directory)
+
+
+def run_script(path, engine):
+    # Worker processes are reused, so every script gets a session of its own.
+    stdout = CaptureSink()
+    session = Session(output=stdout, compile_cache=compile_cache)
+    error = None
+    try:
+        with open(path, "r") as file:
+            source = file.read()
+        session.run(source, engine=engine, use_cache=compile_cache is not None)
+    except Exception:
+        error = traceback.format_exc()
+
+    if error is not None:
+        exit_code = EXIT_CRASH
+    elif session.had_error:
+        exit_code = EXIT_COMPILE_ERROR
+    elif session.had_runtime_error:
+        exit_code = EXIT_RUNTIME_ERROR
+    else:
+        exit_code = EXIT_OK
+    return ScriptResult(path, exit_code, stdout.getvalue(), error)
+
+
+def run_batch(paths, engine="tree", max_workers=None, cache_directory=None):
+    scripts = collect_scripts(paths)
+    if not scripts:
+        return []
+    workers = max_workers or os.cpu_count() or 1
+    # Large batches are handed out in chunks, so thousands of small scripts don't pay one round trip each.
+    chunksize = max(1, len(scripts) // (workers * 4))
+    with ProcessPoolExecutor(max_workers=workers, initializer=init_worker, initargs=(cache_directory,)) as executor:
+        return list(executor.map(run_script, scripts, [engine] * len(scripts), chunksize=chunksize))
+
+
+def main(args):
+    parser = argparse.ArgumentParser(prog="batch_runner")
+    parser.add_argument("paths", nargs="+")
+    parser.add_argument("--engine", default="tree", choices=["tree", "vm", "closures", "python"])
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--cache", default=None)
+    options = parser.parse_args(args)
+
+    results = run_batch(options.paths, options.engine, options.workers, options.cache)
+    failed = [result for result in results if result.exit_code != EXIT_OK]
+    for result in failed:
+        print(f"{result.path}: exit {result.exit_code}")
+        if result.error is not None:
+            print(result.error, end="")
+    print(f"{len(results)} scripts, {len(failed)} failed")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
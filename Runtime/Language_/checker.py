@@ -0,0 +1,81 @@
+# Usage: python -m Runtime.Language_.checker <directory or .cs files...> [--parse-only] [--workers N] [--json]
+#
+# Scans, parses and resolves every script without running it. Prints one line per diagnostic, as
+# path:line: message, or one JSON object per diagnostic with --json. Exits with 1 if any script has errors.
+import argparse
+import json
+import os
+import sys
+import traceback
+from concurrent.futures import ProcessPoolExecutor
+
+from Runtime.Language_.batch_runner import collect_scripts
+from Runtime.Language_.session import Session
+from Runtime.Language_.error_handler import DiagnosticCollector
+
+
+class CheckResult:
+    def __init__(self, path, diagnostics, error=None):
+        self.path = path
+        self.diagnostics = diagnostics
+        self.error = error
+
+    @property
+    def failed(self):
+        return bool(self.diagnostics) or self.error is not None
+
+    def __repr__(self):
+        return f"CheckResult({self.path!r}, diagnostics={len(self.diagnostics)})"
+
+
+def check_script(path, resolve=True):
+    session = Session(error_handler=DiagnosticCollector())
+    try:
+        with open(path, "r") as file:
+            source = file.read()
+        return CheckResult(path, session.check(source, resolve))
+    except Exception:
+        return CheckResult(path, list(session.error_handler.diagnostics), traceback.format_exc())
+
+
+def check_batch(paths, resolve=True, max_workers=None):
+    scripts = collect_scripts(paths)
+    if not scripts:
+        return []
+    workers = max_workers or os.cpu_count() or 1
+    if workers == 1:
+        return [check_script(script, resolve) for script in scripts]
+    chunksize = max(1, len(scripts) // (workers * 4))
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(check_script, scripts, [resolve] * len(scripts), chunksize=chunksize))
+
+
+def main(args):
+    parser = argparse.ArgumentParser(prog="checker")
+    parser.add_argument("paths", nargs="+")
+    parser.add_argument("--parse-only", action="store_true", help="skip the resolver")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--json", action="store_true")
+    options = parser.parse_args(args)
+
+    results = check_batch(options.paths, not options.parse_only, options.workers)
+    failed = [result for result in results if result.failed]
+    for result in failed:
+        for diagnostic in result.diagnostics:
+            if options.json:
+                print(json.dumps({"path": result.path, **diagnostic.to_json()}))
+            else:
+                print(f"{result.path}:{diagnostic.line}: Error{diagnostic.where}: {diagnostic.message}")
+        if result.error is not None:
+            if options.json:
+                print(json.dumps({"path": result.path, "crash": result.error}))
+            else:
+                print(f"{result.path}: crashed")
+                print(result.error, end="")
+    if not options.json:
+        print(f"{len(results)} scripts, {len(failed)} with errors")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,243 @@
+import bisect
+
+from Token.token_type import TokenType
+from Ast.Nodes.statement import Class, Function, Var
+from SyntaxAnalizer.parser import Parser
+from Runtime.resolver import Resolver
+from Runtime.Language_.error_handler import Diagnostic, DiagnosticCollector
+from Runtime.Language_.session import Session
+
+DECLARATIONS = (Var, Function, Class)
+
+
+# Records every name looked up in the top-level scope, or not found at all: those are the lookups
+# whose result depends on what the declarations before this one define.
+class DocumentResolver(Resolver):
+    def __init__(self, interpreter):
+        super().__init__(interpreter)
+        self.free_names = set()
+
+    def resolve_local(self, expr, name):
+        # A reused node may still carry the slot of a declaration that has since been removed.
+        self.interpreter.resolve(expr=expr, depth=None, slot=None)
+        super().resolve_local(expr, name)
+        if expr.depth is None or expr.depth == len(self.scopes) - 1:
+            self.free_names.add(name.lexeme)
+
+
+# One or more top-level declarations and the whole lines they cover. Declarations sharing a line
+# share a segment, so the source is always re-scanned in whole lines. A dirty segment holds everything
+# from the first declaration with an error to the end of the document.
+class Segment:
+    __slots__ = ("start_line", "end_line", "tokens", "statements", "declared", "clean", "parse_errors",
+                 "resolve_errors", "names", "visible", "shift")
+
+    def __init__(self, start_line, end_line, tokens, statements, clean=True, parse_errors=()):
+        self.start_line = start_line
+        self.end_line = end_line
+        self.tokens = tokens
+        self.statements = statements
+        self.declared = [statement.name.lexeme for statement in statements if isinstance(statement, DECLARATIONS)]
+        self.clean = clean
+        self.parse_errors = list(parse_errors)
+        self.resolve_errors = []
+        # Free and declared names, and which of them the earlier segments defined when this one was resolved.
+        self.names = None
+        self.visible = None
+        # Lines the segment has moved since its tokens were last renumbered.
+        self.shift = 0
+
+    def extend(self, tokens, statement):
+        self.end_line = tokens[-1].line
+        self.tokens.extend(tokens)
+        self.statements.append(statement)
+        if isinstance(statement, DECLARATIONS):
+            self.declared.append(statement.name.lexeme)
+
+    def renumber(self):
+        shift = self.shift
+        if not shift:
+            return
+        for token in self.tokens:
+            token.line += shift
+            token._hash = None
+        self.parse_errors = [Diagnostic(error.line + shift, error.where, error.message) for error in self.parse_errors]
+        self.resolve_errors = [Diagnostic(error.line + shift, error.where, error.message)
+                               for error in self.resolve_errors]
+        self.shift = 0
+
+
+class ReparseStats:
+    def __init__(self):
+        self.scanned_lines = 0
+        self.scanned_tokens = 0
+        self.parsed_statements = 0
+        self.reused_statements = 0
+        self.resolved_statements = 0
+
+    def __repr__(self):
+        return (f"ReparseStats(scanned_lines={self.scanned_lines}, scanned_tokens={self.scanned_tokens}, "
+                f"parsed_statements={self.parsed_statements}, reused_statements={self.reused_statements}, "
+                f"resolved_statements={self.resolved_statements})")
+
+
+def first_line(token):
+    # A string token carries the line it ends on.
+    if token.type == TokenType.STRING:
+        return token.line - token.lexeme.count("\n")
+    return token.line
+
+
+# A source file being edited. Each edit re-scans and re-parses only the lines of the top-level
+# declarations it touches, plus the one before, which an added 'else' would extend. The rest keep
+# their tokens and Stmt subtrees. Resolution then revisits only the new declarations and those whose
+# top-level names now resolve differently. An edit that leaves an error re-parses to the end of the
+# document, since an unterminated string or a missing brace can change everything after it.
+class Document:
+    def __init__(self, source="", session=None):
+        self.session = session if session is not None else Session()
+        self.lines = source.split("\n")
+        self.segments = []
+        self.stats = ReparseStats()
+        self.reparse(0, 0, 1, len(self.lines))
+        self.resolve()
+
+    @property
+    def text(self):
+        return "\n".join(self.lines)
+
+    @property
+    def statements(self):
+        statements = []
+        for segment in self.segments:
+            segment.renumber()
+            statements.extend(segment.statements)
+        return statements
+
+    @property
+    def had_error(self):
+        return any(segment.parse_errors or segment.resolve_errors for segment in self.segments)
+
+    def diagnostics(self):
+        # Sorted by line. Within a line, parse errors come before resolve errors.
+        diagnostics = []
+        for segment in self.segments:
+            for error in segment.parse_errors + segment.resolve_errors:
+                diagnostics.append(Diagnostic(error.line + segment.shift, error.where, error.message))
+        diagnostics.sort(key=lambda diagnostic: diagnostic.line)
+        return diagnostics
+
+    # Lines are numbered from 1 and columns from 0, as in error messages; the end position is exclusive.
+    def apply_edit(self, start_line, start_column, end_line, end_column, text):
+        lines = self.lines
+        replacement = (lines[start_line - 1][:start_column] + text + lines[end_line - 1][end_column:]).split("\n")
+        lines[start_line - 1:end_line] = replacement
+        delta = len(replacement) - (end_line - start_line + 1)
+
+        segments = self.segments
+        first = bisect.bisect_left(segments, start_line, key=lambda segment: segment.end_line)
+        last = bisect.bisect_right(segments, end_line, key=lambda segment: segment.start_line)
+        if first > 0:
+            first -= 1
+        if last < len(segments) and not segments[last].clean:
+            last = len(segments)
+        region_start, region_end = start_line, end_line
+        if first < last:
+            region_start = min(region_start, segments[first].start_line)
+            region_end = max(region_end, segments[last - 1].end_line)
+        for segment in segments[last:]:
+            segment.start_line += delta
+            segment.end_line += delta
+            segment.shift += delta
+
+        # The region that reaches the last segment also takes the blank lines after it, where the end of
+        # input sits, as in a full parse.
+        region_end = len(lines) if last == len(segments) else min(region_end + delta, len(lines))
+        self.stats = ReparseStats()
+        self.reparse(first, last, region_start, region_end)
+        self.resolve()
+        return self.stats
+
+    def replace(self, source):
+        end_line = len(self.lines)
+        return self.apply_edit(1, 0, end_line, len(self.lines[-1]), source)
+
+    def reparse(self, first, last, start_line, end_line):
+        lines = self.lines
+        while True:
+            collector = DiagnosticCollector()
+            scanner = self.session.scanner_class("\n".join(lines[start_line - 1:end_line]), line=start_line,
+                                                 error_handler=collector)
+            tokens = scanner.scan_tokens()
+            scan_failed = collector.hadError
+            parser = Parser(tokens, collector)
+            declarations = []
+            first_error = None
+            while not parser.is_at_end():
+                begin = parser.current
+                errors_before = len(collector.diagnostics)
+                statement = parser.declaration()
+                if first_error is None and len(collector.diagnostics) > errors_before:
+                    first_error = len(declarations)
+                declarations.append((statement, begin, parser.current))
+            if (scan_failed or first_error is not None) and last < len(self.segments):
+                # Whatever follows may read differently now, so it is parsed again as well.
+                last = len(self.segments)
+                end_line = len(lines)
+                continue
+            break
+
+        self.stats.scanned_lines += end_line - start_line + 1
+        self.stats.scanned_tokens += len(tokens) - 1
+        self.stats.parsed_statements += sum(1 for statement, _, _ in declarations if statement is not None)
+
+        if scan_failed:
+            statements = [statement for statement, _, _ in declarations if statement is not None]
+            segments = [Segment(start_line, len(lines), tokens[:-1], statements, clean=False,
+                                parse_errors=collector.diagnostics)]
+        else:
+            if first_error is None:
+                first_error = len(declarations)
+            segments = []
+            for statement, begin, end in declarations[:first_error]:
+                start = first_line(tokens[begin])
+                if segments and start <= segments[-1].end_line:
+                    segments[-1].extend(tokens[begin:end], statement)
+                else:
+                    segments.append(Segment(start, tokens[end - 1].line, tokens[begin:end], [statement]))
+            if first_error < len(declarations):
+                begin = declarations[first_error][1]
+                start = first_line(tokens[begin])
+                statements = [statement for statement, _, _ in declarations[first_error:] if statement is not None]
+                if segments and start <= segments[-1].end_line:
+                    previous = segments.pop()
+                    start = previous.start_line
+                    begin -= len(previous.tokens)
+                    statements = previous.statements + statements
+                segments.append(Segment(start, len(lines), tokens[begin:-1], statements, clean=False,
+                                        parse_errors=collector.diagnostics))
+        self.segments[first:last] = segments
+
+    def resolve(self):
+        resolver = DocumentResolver(self.session.interpreter)
+        scope = resolver.scopes[0]
+        stats = self.stats
+        for segment in self.segments:
+            if segment.names is not None and \
+                    segment.visible == frozenset(name for name in segment.names if name in scope):
+                for name in segment.declared:
+                    scope[name] = True
+                    resolver.add_slot(name)
+                continue
+
+            segment.renumber()
+            defined = set(scope)
+            collector = DiagnosticCollector()
+            resolver.error_handler = collector
+            resolver.free_names = set()
+            resolver.resolve(segment.statements)
+            segment.resolve_errors = collector.diagnostics
+            segment.names = resolver.free_names.union(segment.declared)
+            segment.visible = frozenset(name for name in segment.names if name in defined)
+            stats.resolved_statements += len(segment.statements)
+        stats.reused_statements = sum(len(segment.statements) for segment in self.segments) - stats.parsed_statements
@@ -1,20 +1,51 @@
 from Token.token_type import TokenType
+from Runtime.output_sink import OutputSink, FLUSH_LINE
+
+
+class Diagnostic:
+    __slots__ = ("line", "where", "message")
+
+    def __init__(self, line, where, message):
+        self.line = line
+        self.where = where
+        self.message = message
+
+    def __str__(self):
+        return f"[line {self.line}] Error{self.where}: {self.message}"
+
+    def __repr__(self):
+        return f"Diagnostic({self.line}, {self.where!r}, {self.message!r})"
+
+    def to_json(self):
+        return {"line": self.line, "where": self.where.strip(), "message": self.message}
 
 
 class ErrorHandler:
-    def __init__(self):
+    def __init__(self, output=None):
+        # Shares the session's sink, so messages stay in order with WriteLine output.
+        self.output = output if output is not None else OutputSink(flush_policy=FLUSH_LINE)
         self.hadError = False
         self.hadRuntimeError = False
+        self.last_runtime_error = None
+        # Every compile error since the last reset_errors, in the order reported.
+        self.diagnostics = []
+
+    def reset_errors(self):
+        self.hadError = False
+        self.diagnostics.clear()
 
     def runtime_error(self, error):
-        print(f"[line {error.token.line}]: {error.message}")
+        self.output.write_line(f"[line {error.token.line}]: {error.message}")
         self.hadRuntimeError = True
+        self.last_runtime_error = error
 
     def error(self, line, message):
         self.report(line, "", message)
 
     def report(self, line, where, message):
-        print(f"[line {line}] Error{where}: {message}")
+        diagnostic = Diagnostic(line, where, message)
+        self.diagnostics.append(diagnostic)
+        self.output.write_line(str(diagnostic))
         self.hadError = True
 
     def error_token(self, token, message):
@@ -22,3 +53,10 @@ class ErrorHandler:
             self.report(token.line, " at end", message)
         else:
             self.report(token.line, f" at '{token.lexeme}'", message)
+
+
+# Records diagnostics without printing them.
+class DiagnosticCollector(ErrorHandler):
+    def report(self, line, where, message):
+        self.diagnostics.append(Diagnostic(line, where, message))
+        self.hadError = True
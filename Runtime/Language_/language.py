@@ -1,25 +1,34 @@
-from Token.token_type import TokenType
-from SyntaxAnalizer.scanner import Scanner
 from Ast.ast_printer import AstPrinter
-from Ast.rpn_printer import RpnPrinter
-from Ast.python_printer import PythonPrinter
-from Runtime.interpreter import Interpreter
-from SyntaxAnalizer.parser import Parser
-from Runtime.resolver import Resolver
-from Runtime.Language_.error_handler import ErrorHandler
+from Runtime.Language_.session import Session
+from Runtime.Language_.repl import Repl
+from Runtime.compile_cache import CompileCache
 
 
+# The process-wide default session behind the static API. Embedders that run several scripts at once
+# create a Session each instead.
 class Language:
-    error_handler = ErrorHandler()
-    interpreter = Interpreter(error_handler)
+    session = Session()
+    error_handler = session.error_handler
+    interpreter = session.interpreter
     ast = AstPrinter()
-    hadError = False
-    hadRuntimeError = False
 
     @staticmethod
-    def set_scanner_error_handler(handler):
-        global scanner_error
-        scanner_error = handler
+    def reset():
+        # Drops every global, class and error flag left behind by earlier scripts.
+        Language.use_session(Session(compile_cache=Language.session.compile_cache))
+
+    @staticmethod
+    def use_session(session):
+        Language.session = session
+        Language.error_handler = session.error_handler
+        Language.interpreter = session.interpreter
+
+    @staticmethod
+    def enable_compile_cache(directory, max_bytes=None):
+        if max_bytes is None:
+            Language.session.compile_cache = CompileCache(directory)
+        else:
+            Language.session.compile_cache = CompileCache(directory, max_bytes)
 
     @staticmethod
     def main(args):
@@ -32,71 +41,38 @@ class Language:
             Language.run_prompt()
 
     @staticmethod
-    def run_file(path):
+    def run_file(path, engine="tree"):
         with open(path, "r") as file:
             source = file.read()
             try:
-                Language.run(source)
+                Language.run(source, engine=engine, use_cache=True)
             except:
                 pass
-            if Language.hadError:
+            if Language.session.had_error:
                 exit(65)
-            if Language.hadRuntimeError:
+            if Language.session.had_runtime_error:
                 exit(70)
 
     @staticmethod
-    def run_prompt():
-        while True:
-            try:
-                line = input("> ")
-                Language.run(line)
-                Language.hadError = False
-            except EOFError:
-                break
+    def run_prompt(engine="tree"):
+        Repl(Language.session, engine).run()
 
     @staticmethod
-    def run(source):
-        scanner = Scanner(source)
-        tokens = scanner.scan_tokens()
-        # [print(i.type) for i in tokens]
-        parser = Parser(tokens, Language.error_handler)
-        statements = parser.parse()
-
-        if Language.hadError:
-            return
-
-        resolver = Resolver(Language.interpreter)
-        resolver.resolve(statements)
-
-        if Language.hadError:
-            return
-
-        try:
-            Language.interpreter.interpret(statements)
-            # Uncomment to see RPN representation of the code tree
-            # print(Language.ast.print_nodes(statements))
-            # print(RpnPrinter().print_nodes(statements))
-            print(PythonPrinter().print_nodes(statements))
-        except RuntimeError as e:
-            Language.runtime_error(e)
+    def compile(source, use_cache=False):
+        return Language.session.compile(source, use_cache)
 
     @staticmethod
-    def error(line, message):
-        Language.report(line, "", message)
+    def check(source, resolve=True):
+        return Language.session.check(source, resolve)
 
     @staticmethod
-    def report(line, where, message):
-        print(f"[line {line}] Error{where}: {message}")
-        Language.hadError = True
+    def run(source, engine="tree", use_cache=False):
+        Language.session.run(source, engine, use_cache)
 
     @staticmethod
-    def error_token(token, message):
-        if token.type == TokenType.EOF:
-            Language.report(token.line, " at end", message)
-        else:
-            Language.report(token.line, f" at '{token.lexeme}'", message)
+    def run_stream(file, engine="tree"):
+        Language.session.run_stream(file, engine)
 
     @staticmethod
-    def runtime_error(error):
-        print(f"[line {error.token.line}]: {error.message}")
-        Language.hadRuntimeError = True
+    def execute(statements, engine):
+        Language.session.execute(statements, engine)
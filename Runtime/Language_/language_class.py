@@ -5,16 +5,12 @@ class LanguageClass(LanguageCallable):
         self.name = name
         self.superclass = superclass
         self.methods = methods
+        # Inherited methods are copied in once, so a lookup never walks the superclass chain.
+        self.method_table = dict(superclass.method_table) if superclass else {}
+        self.method_table.update(methods)
 
     def find_method(self, name):
-        method = self.methods.get(name)
-        if method:
-            return method
-
-        if self.superclass:
-            return self.superclass.find_method(name)
-
-        return None
+        return self.method_table.get(name)
 
     def __str__(self):
         return f"<class {self.name}>"
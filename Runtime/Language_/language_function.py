@@ -1,7 +1,7 @@
 from typing import Any, List
 from Runtime.Language_.language_callable import LanguageCallable
-from Runtime.return_ import ReturnException
 from Runtime.environment import Environment
+from Runtime.runtime_error import AbortError, StackOverflowError
 
 
 class LanguageFunction(LanguageCallable):
@@ -11,9 +11,8 @@ class LanguageFunction(LanguageCallable):
         self.is_initializer = is_initializer
 
     def bind(self, instance):
-        environment = Environment(enclosing=self.closure)
-        environment.define("this", type_=None, value=instance)
-        return LanguageFunction(declaration=self.declaration, closure=environment, is_initializer=self.is_initializer)
+        return LanguageFunction(declaration=self.declaration, closure=instance.receiver(self.closure),
+                                is_initializer=self.is_initializer)
 
     def __str__(self):
         return f"<fn {self.declaration.name.lexeme}>"
@@ -22,19 +21,35 @@ class LanguageFunction(LanguageCallable):
         return len(self.declaration.params)
 
     def call(self, interpreter, arguments: List[Any]):
-        environment = Environment(enclosing=self.closure)
+        return self.run(interpreter, self.closure, arguments)
+
+    def invoke(self, interpreter, instance, arguments: List[Any]):
+        return self.run(interpreter, instance.receiver(self.closure), arguments)
+
+    def run(self, interpreter, closure, arguments):
+        if interpreter.call_depth >= interpreter.max_call_depth:
+            raise StackOverflowError(self.declaration.name, "Stack overflow.")
+        interpreter.steps_left -= 1
+        if interpreter.steps_left < 0:
+            interpreter.refill_steps(self.declaration.name)
+        environment = Environment(enclosing=closure)
         for i in range(len(self.declaration.params)):
             environment.define(self.declaration.params[i].name.lexeme, type_=None, value=arguments[i])
 
+        interpreter.call_depth += 1
         try:
-            interpreter.execute_block(statements=self.declaration.body, environment=environment)
-        except ReturnException as returnValue:
-            if self.is_initializer:
-                return self.closure.get_at(distance=0, name="this")
-            return returnValue.value
+            completion = interpreter.execute_block(statements=self.declaration.body, environment=environment)
+        except AbortError:
+            raise
+        except RecursionError:
+            raise StackOverflowError(self.declaration.name, "Stack overflow.")
         except Exception:
             return None
+        finally:
+            interpreter.call_depth -= 1
 
         if self.is_initializer:
-            return self.closure.get_at(distance=0, name="this")
+            return closure.get_at(distance=0, slot=0)
+        if completion is not None:
+            return completion[0]
         return None
@@ -2,16 +2,27 @@ from typing import Any
 
 from Token.token import Token
 from Runtime.runtime_error import RuntimeError
+from Runtime.environment import Environment
 class LanguageInstance:
     def __init__(self, cls):
         self.cls = cls
         self.fields = {}
+        self.receivers = {}
+
+    def receiver(self, closure):
+        # The scope holding `this` is never assigned to, so one per method closure serves every call.
+        environment = self.receivers.get(closure)
+        if environment is None:
+            environment = Environment(enclosing=closure)
+            environment.define("this", type_=None, value=self)
+            self.receivers[closure] = environment
+        return environment
 
     def get(self, name: Token):
         if name.lexeme in self.fields:
             return self.fields[name.lexeme]
 
-        method = self.cls.find_method(name.lexeme)
+        method = self.cls.method_table.get(name.lexeme)
         if method is not None:
             return method.bind(instance=self)
 
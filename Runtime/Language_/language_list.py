@@ -1,20 +1,70 @@
+from array import array
 from typing import Any
 
+from Runtime.Language_.c_type import CType
+from Extensions.custom_any import CustomAny
+
+INT64_MIN = -2 ** 63
+INT64_MAX = 2 ** 63 - 1
+
+# Numeric and bool arrays are packed into array.array; string and char arrays keep a plain list
+# but are tagged all the same, so their declared type is known without a rescan.
+ARRAY_TYPECODES = {
+    CType.INT_ARRAY: "q",
+    CType.DOUBLE_ARRAY: "d",
+    CType.FLOAT_ARRAY: "d",
+    CType.BOOL_ARRAY: "b",
+}
+
+
+def fits(ctype: CType, value: Any) -> bool:
+    if ctype == CType.INT_ARRAY:
+        return type(value) is int and INT64_MIN <= value <= INT64_MAX
+    if ctype in (CType.DOUBLE_ARRAY, CType.FLOAT_ARRAY):
+        return type(value) is float
+    if ctype == CType.BOOL_ARRAY:
+        return type(value) is bool
+    if ctype == CType.STRING_ARRAY:
+        return type(value) is str
+    if ctype == CType.CHAR_ARRAY:
+        return type(value) is str and len(value) == 1
+    return False
+
+
+def can_replace(element: Any, value: Any) -> bool:
+    # Whether value may be written over element: the same kind of value, and never nil over nil.
+    return CustomAny.can_be_casted_to_same_type(value, element) and not (value is None and element is None)
+
 
 class LanguageList:
     def __init__(self):
         self.values = []
+        # The array CType every element is known to satisfy, or None for an untyped list.
+        self.element_type = None
+
+    def __iter__(self):
+        if self.element_type == CType.BOOL_ARRAY:
+            return map(bool, self.values)
+        return iter(self.values)
 
     def append(self, value: Any):
+        if self.element_type is not None and not fits(self.element_type, value):
+            self.untype()
         self.values.append(value)
 
     def get_ele_at(self, index: int) -> Any:
-        return self.values[index] if 0 <= index < len(self.values) else None
+        if not 0 <= index < len(self.values):
+            return None
+        if self.element_type == CType.BOOL_ARRAY:
+            return bool(self.values[index])
+        return self.values[index]
 
     def length(self) -> int:
         return len(self.values)
 
     def set_at_index(self, index: int, value: Any) -> bool:
+        if self.element_type is not None and not fits(self.element_type, value):
+            self.untype()
         if index == self.length():
             self.values.insert(index, value)
         elif 0 <= index < self.length():
@@ -22,3 +72,41 @@ class LanguageList:
         else:
             return False
         return True
+
+    def fill(self, value: Any):
+        if self.element_type is not None and not fits(self.element_type, value):
+            self.untype()
+        if self.values:
+            single = self.values[:1]
+            single[0] = value
+            self.values = single * len(self.values)
+
+    def sort(self):
+        if isinstance(self.values, list):
+            self.values.sort()
+        else:
+            self.values = array(self.values.typecode, sorted(self.values))
+
+    def retype(self, ctype: CType):
+        # Called once a declaration has accepted the list; later checks against ctype are O(1).
+        if self.element_type is not None or not all(fits(ctype, value) for value in self.values):
+            return
+        typecode = ARRAY_TYPECODES.get(ctype)
+        if typecode is not None:
+            self.values = array(typecode, self.values)
+        self.element_type = ctype
+
+    def untype(self):
+        # A write the typed storage cannot hold falls back to a plain list, as before.
+        self.values = list(self)
+        self.element_type = None
+
+
+def packed(ctype: CType, values) -> LanguageList:
+    lst = LanguageList()
+    try:
+        lst.values = array(ARRAY_TYPECODES[ctype], values)
+        lst.element_type = ctype
+    except OverflowError:
+        lst.values = list(values)
+    return lst
@@ -0,0 +1,122 @@
+import operator
+from itertools import islice
+
+from Runtime.Language_.c_type import CType
+from Runtime.Language_.language_callable import LanguageCallable
+from Runtime.Language_.language_list import LanguageList, packed, can_replace
+from Runtime.runtime_error import RuntimeError
+
+NUMERIC_ARRAYS = (CType.INT_ARRAY, CType.DOUBLE_ARRAY, CType.FLOAT_ARRAY)
+
+
+def numeric_type(lst):
+    # An untyped list of plain ints or floats is packed on first use, so every later call is batched.
+    if lst.element_type is None:
+        lst.retype(CType.INT_ARRAY)
+    if lst.element_type is None:
+        lst.retype(CType.DOUBLE_ARRAY)
+    return lst.element_type if lst.element_type in NUMERIC_ARRAYS else None
+
+
+def same_kind(left_type, right_type):
+    return (left_type == CType.INT_ARRAY) == (right_type == CType.INT_ARRAY)
+
+
+def check_array(paren, value):
+    if not isinstance(value, LanguageList) or numeric_type(value) is None:
+        raise RuntimeError(paren, "Argument must be a numeric array.")
+
+
+def check_pair(paren, left, right):
+    check_array(paren, left)
+    check_array(paren, right)
+    if not same_kind(left.element_type, right.element_type):
+        raise RuntimeError(paren, "Arrays must hold the same numeric type.")
+    if left.length() != right.length():
+        raise RuntimeError(paren, "Arrays must have the same length.")
+
+
+def check_operand(paren, left, right):
+    if isinstance(right, LanguageList):
+        check_pair(paren, left, right)
+        return
+    check_array(paren, left)
+    kind = int if left.element_type == CType.INT_ARRAY else float
+    if type(right) is not kind:
+        raise RuntimeError(paren, "Operands must be numbers.")
+
+
+def check_not_empty(paren, value):
+    check_array(paren, value)
+    if value.length() == 0:
+        raise RuntimeError(paren, "Array is empty.")
+
+
+def check_list(paren, value, *_):
+    if not isinstance(value, LanguageList):
+        raise RuntimeError(paren, "Argument must be an array.")
+
+
+def check_fill(paren, lst, value):
+    check_list(paren, lst)
+    # Fill writes every element, so value must pass the check an indexed write makes for each of them.
+    # Elements of a typed list are all of one kind, so the first stands for the rest.
+    elements = islice(lst, 1) if lst.element_type is not None else lst
+    if not all(can_replace(element, value) for element in elements):
+        raise RuntimeError(paren, "Unexpected assignment value type.")
+
+
+def zero(lst):
+    return 0 if lst.element_type == CType.INT_ARRAY else 0.0
+
+
+def element_wise(operation):
+    def apply(left, right):
+        if isinstance(right, LanguageList):
+            values = list(map(operation, left.values, right.values))
+        else:
+            values = [operation(value, right) for value in left.values]
+        return packed(left.element_type, values)
+    return apply
+
+
+def fill(lst, value):
+    lst.fill(value)
+
+
+def sort(lst):
+    lst.sort()
+
+
+# Built-ins over whole arrays. Arguments are validated by Interpreter.check_call, where the call
+# site token is known; the call itself runs a single C-level pass over the packed storage.
+class NativeFunction(LanguageCallable):
+    def __init__(self, name, arity, check, function):
+        self.name = name
+        self.param_count = arity
+        self.check = check
+        self.function = function
+
+    def arity(self):
+        return self.param_count
+
+    def check_arguments(self, arguments, paren):
+        self.check(paren, *arguments)
+
+    def call(self, interpreter, arguments):
+        return self.function(*arguments)
+
+    def __str__(self):
+        return "<native fn>"
+
+
+NATIVE_FUNCTIONS = [
+    NativeFunction("Add", 2, check_operand, element_wise(operator.add)),
+    NativeFunction("Multiply", 2, check_operand, element_wise(operator.mul)),
+    NativeFunction("Sum", 1, check_array, lambda lst: sum(lst.values, zero(lst))),
+    NativeFunction("Min", 1, check_not_empty, lambda lst: min(lst.values)),
+    NativeFunction("Max", 1, check_not_empty, lambda lst: max(lst.values)),
+    NativeFunction("Dot", 2, check_pair, lambda left, right: sum(map(operator.mul, left.values, right.values), zero(left))),
+    NativeFunction("Sort", 1, check_array, sort),
+    NativeFunction("Fill", 2, check_fill, fill),
+]
@@ -0,0 +1,80 @@
+from Token.token_type import TokenType
+from SyntaxAnalizer.parser import Parser
+from Runtime.resolver import Resolver
+from Runtime.runtime_error import RuntimeError
+from Runtime.output_sink import OutputSink, CaptureSink, FLUSH_LINE
+from Runtime.Language_.error_handler import ErrorHandler
+from Runtime.Language_.session import Session
+
+OPENING_TOKENS = (TokenType.LEFT_BRACE, TokenType.LEFT_PAREN, TokenType.LEFT_BRACKET)
+CLOSING_TOKENS = (TokenType.RIGHT_BRACE, TokenType.RIGHT_PAREN, TokenType.RIGHT_BRACKET)
+
+
+# An interactive session. One Resolver lives as long as the REPL, so its top-level scope and the
+# interpreter's global slots carry over from one input to the next; earlier functions and classes are
+# already compiled values in the globals. Each input is scanned, parsed, resolved and executed on its
+# own, so its cost depends on the input alone, not on how long the session has been running.
+class Repl:
+    def __init__(self, session=None, engine="tree"):
+        self.session = session if session is not None else Session(output=OutputSink(flush_policy=FLUSH_LINE))
+        self.engine = engine
+        self.resolver = Resolver(self.session.interpreter, redeclare_globals=True)
+        self.pending = []
+        # Line number of the next input line, so errors point into the whole session.
+        self.line = 1
+
+    def run(self, read=input):
+        while True:
+            try:
+                text = read("... " if self.pending else "> ")
+            except EOFError:
+                break
+            self.feed(text)
+
+    def feed(self, text):
+        # Returns False while the input so far has an open bracket or string, True once it has been run.
+        # An empty line runs whatever is pending, so a stray bracket never traps the prompt.
+        self.pending.append(text)
+        source = "\n".join(self.pending)
+        if text.strip() and self.is_open(source):
+            return False
+        start_line = self.line
+        self.line += len(self.pending)
+        self.pending = []
+        self.submit(source, start_line)
+        return True
+
+    def is_open(self, source):
+        # Errors found here are reported again, with the right line numbers, once the input is submitted.
+        output = CaptureSink()
+        tokens = self.session.scanner_class(source, error_handler=ErrorHandler(output)).scan_tokens()
+        if "Unterminated string." in output.getvalue():
+            return True
+        depth = 0
+        for token in tokens:
+            if token.type in OPENING_TOKENS:
+                depth += 1
+            elif token.type in CLOSING_TOKENS:
+                depth -= 1
+        return depth > 0
+
+    def submit(self, source, line=1):
+        session = self.session
+        error_handler = session.error_handler
+        error_handler.reset_errors()
+        error_handler.hadRuntimeError = False
+        try:
+            scanner = session.scanner_class(source, line=line, error_handler=error_handler)
+            statements = Parser(scanner.scan_tokens(), error_handler).parse()
+            if error_handler.hadError:
+                return
+            self.resolver.resolve(statements)
+            self.resolver.global_references.clear()
+            if error_handler.hadError:
+                return
+            try:
+                session.execute(statements, self.engine)
+            except RuntimeError as e:
+                error_handler.runtime_error(e)
+        finally:
+            session.output.flush()
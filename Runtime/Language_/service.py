@@ -0,0 +1,210 @@
+# Usage: python -m Runtime.Language_.service [--host 127.0.0.1] [--port 8765] [--workers N]
+#
+# Protocol: one JSON request per line, {"source": ..., "engine": ..., "time_limit": ..., "max_steps": ...}.
+# The reply is one {"line": ...} object per WriteLine line, then a single {"status": ...} object.
+import argparse
+import asyncio
+import json
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from Runtime.Language_.session import Session
+from Runtime.output_sink import OutputSink, FLUSH_LINE
+from Runtime.runtime_error import LimitError
+
+ENGINES = ("tree", "vm", "closures", "python")
+
+DEFAULT_TIME_LIMIT = 10.0
+DEFAULT_MAX_STEPS = 10_000_000
+
+STATUS_OK = "ok"
+STATUS_COMPILE_ERROR = "compile_error"
+STATUS_RUNTIME_ERROR = "runtime_error"
+STATUS_LIMIT_EXCEEDED = "limit_exceeded"
+
+
+class ExecutionResult:
+    def __init__(self, status, error, steps, elapsed, output=None):
+        self.status = status
+        self.error = error
+        self.steps = steps
+        self.elapsed = elapsed
+        self.output = output
+
+    def to_json(self):
+        return {"status": self.status, "error": self.error, "steps": self.steps, "elapsed": self.elapsed}
+
+
+# The stream behind the session's output sink. It runs on the worker thread and hands complete lines
+# to the event loop.
+class LineWriter:
+    def __init__(self, loop, queue):
+        self.loop = loop
+        self.queue = queue
+        self.pending = ""
+
+    def write(self, text):
+        if "\n" in text:
+            lines = (self.pending + text).split("\n")
+            self.pending = lines.pop()
+            self.loop.call_soon_threadsafe(self.queue.put_nowait, lines)
+        else:
+            self.pending += text
+        return len(text)
+
+    def flush(self):
+        pass
+
+    def close(self):
+        if self.pending:
+            self.loop.call_soon_threadsafe(self.queue.put_nowait, [self.pending])
+            self.pending = ""
+        self.loop.call_soon_threadsafe(self.queue.put_nowait, None)
+
+
+def execute(session, writer, source, engine, time_limit, max_steps):
+    interpreter = session.interpreter
+    interpreter.set_limits(max_steps=max_steps, time_limit=time_limit)
+    start = time.perf_counter()
+    try:
+        session.run(source, engine=engine)
+    finally:
+        writer.close()
+    elapsed = time.perf_counter() - start
+
+    error = session.error_handler.last_runtime_error
+    if session.had_error:
+        status = STATUS_COMPILE_ERROR
+    elif isinstance(error, LimitError):
+        status = STATUS_LIMIT_EXCEEDED
+    elif session.had_runtime_error:
+        status = STATUS_RUNTIME_ERROR
+    else:
+        status = STATUS_OK
+    message = error.message if error is not None else None
+    return ExecutionResult(status, message, interpreter.steps_taken - max(interpreter.steps_left, 0), elapsed)
+
+
+# A script running on a worker thread. Iterating it yields WriteLine output as it is produced;
+# result() waits for the script to finish. Cancelling either interrupts the script, not the worker.
+class Execution:
+    def __init__(self, session, future, queue):
+        self.session = session
+        self.future = future
+        self.queue = queue
+
+    async def __aiter__(self):
+        try:
+            while True:
+                lines = await self.queue.get()
+                if lines is None:
+                    return
+                for line in lines:
+                    yield line
+        except asyncio.CancelledError:
+            self.cancel()
+            raise
+
+    async def result(self):
+        try:
+            return await asyncio.shield(self.future)
+        except asyncio.CancelledError:
+            self.cancel()
+            raise
+
+    def cancel(self):
+        self.session.interpreter.interrupt()
+
+
+# Runs scripts on a thread pool, each in a session of its own, with a wall-clock and a step budget.
+# Loops and calls check both, so a runaway script stops without taking its worker thread down.
+class ScriptService:
+    def __init__(self, max_workers=None, engine="tree", time_limit=DEFAULT_TIME_LIMIT,
+                 max_steps=DEFAULT_MAX_STEPS):
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="script")
+        self.engine = engine
+        self.time_limit = time_limit
+        self.max_steps = max_steps
+
+    def submit(self, source, engine=None, time_limit=None, max_steps=None):
+        engine = engine or self.engine
+        if engine not in ENGINES:
+            raise ValueError(f"Unknown engine '{engine}'.")
+        loop = asyncio.get_running_loop()
+        queue = asyncio.Queue()
+        writer = LineWriter(loop, queue)
+        session = Session(output=OutputSink(writer, flush_policy=FLUSH_LINE))
+        future = loop.run_in_executor(
+            self.executor, execute, session, writer, source, engine,
+            self.time_limit if time_limit is None else time_limit,
+            self.max_steps if max_steps is None else max_steps)
+        return Execution(session, future, queue)
+
+    async def run(self, source, engine=None, time_limit=None, max_steps=None):
+        execution = self.submit(source, engine, time_limit, max_steps)
+        output = [line async for line in execution]
+        result = await execution.result()
+        result.output = output
+        return result
+
+    def shutdown(self):
+        self.executor.shutdown(wait=True)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        self.shutdown()
+
+
+async def handle_client(service, reader, writer):
+    execution = None
+    try:
+        while line := await reader.readline():
+            try:
+                request = json.loads(line)
+                execution = service.submit(request["source"], request.get("engine"),
+                                           request.get("time_limit"), request.get("max_steps"))
+            except (ValueError, KeyError, TypeError) as error:
+                writer.write(json.dumps({"status": "bad_request", "error": str(error)}).encode() + b"\n")
+                await writer.drain()
+                continue
+            async for output_line in execution:
+                writer.write(json.dumps({"line": output_line}).encode() + b"\n")
+                await writer.drain()
+            result = await execution.result()
+            execution = None
+            writer.write(json.dumps(result.to_json()).encode() + b"\n")
+            await writer.drain()
+    except ConnectionError:
+        pass
+    finally:
+        # A client that goes away mid-script leaves nobody to read its output.
+        if execution is not None:
+            execution.cancel()
+        writer.close()
+
+
+async def serve(host, port, max_workers):
+    service = ScriptService(max_workers=max_workers)
+    server = await asyncio.start_server(lambda reader, writer: handle_client(service, reader, writer), host, port)
+    print(f"Serving on {host}:{port}")
+    async with service, server:
+        await server.serve_forever()
+
+
+def main(args):
+    parser = argparse.ArgumentParser(prog="service")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--workers", type=int, default=None)
+    options = parser.parse_args(args)
+    try:
+        asyncio.run(serve(options.host, options.port, options.workers))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,153 @@
+from SyntaxAnalizer.regex_scanner import RegexScanner
+from SyntaxAnalizer.parser import Parser
+from SyntaxAnalizer.token_stream import TokenStream, scan_stream
+from Ast.ast_printer import AstPrinter
+from Ast.rpn_printer import RpnPrinter
+from Ast.python_printer import PythonPrinter
+from Runtime.interpreter import Interpreter, DEFAULT_MAX_CALL_DEPTH
+from Runtime.resolver import Resolver
+from Runtime.runtime_error import RuntimeError
+from Runtime.Bytecode.compiler import Compiler
+from Runtime.Bytecode.vm import VM
+from Runtime.closure_compiler import ClosureCompiler
+from Runtime.Transpiler.python_generator import PythonGenerator
+from Runtime.Language_.error_handler import ErrorHandler
+from Runtime.optimizer import Optimizer
+from Runtime.type_checker import TypeChecker
+from Runtime.output_sink import OutputSink
+
+
+# Everything one script run touches: the interpreter and its globals, the error flags and the output
+# sink. Sessions share no state, so any number of them can run side by side in one process, each
+# on its own thread. A single session still runs one script at a time.
+class Session:
+    def __init__(self, output=None, max_call_depth=DEFAULT_MAX_CALL_DEPTH, scanner_class=RegexScanner,
+                 optimize=True, compile_cache=None, show_python=False, error_handler=None):
+        # Either an OutputSink or a stream, which gets a block-buffered sink of its own.
+        self.output = output if isinstance(output, OutputSink) else OutputSink(output)
+        self.error_handler = error_handler if error_handler is not None else ErrorHandler(self.output)
+        self.interpreter = Interpreter(self.error_handler, max_call_depth, self.output)
+        # Scanner produces the same tokens character by character; RegexScanner is faster on large sources.
+        self.scanner_class = scanner_class
+        # Constant folding runs on a copy of the resolved AST right before execution, followed by the
+        # TypeChecker, which drops the runtime type checks it can prove redundant.
+        self.optimize = optimize
+        self.compile_cache = compile_cache
+        # Prints the Python translation of every program after running it.
+        self.show_python = show_python
+
+    @property
+    def had_error(self):
+        return self.error_handler.hadError
+
+    @property
+    def had_runtime_error(self):
+        return self.error_handler.hadRuntimeError
+
+    def compile(self, source, use_cache=False):
+        try:
+            return self.compile_source(source, use_cache)
+        finally:
+            self.output.flush()
+
+    def compile_source(self, source, use_cache):
+        self.error_handler.reset_errors()
+        cache = self.compile_cache if use_cache else None
+        if cache is not None:
+            statements = cache.load(source, self.interpreter)
+            if statements is not None:
+                return statements
+
+        scanner = self.scanner_class(source, error_handler=self.error_handler)
+        tokens = scanner.scan_tokens()
+        parser = Parser(tokens, self.error_handler)
+        statements = parser.parse()
+
+        if self.error_handler.hadError:
+            return None
+
+        resolver = Resolver(self.interpreter)
+        resolver.resolve(statements)
+
+        if self.error_handler.hadError:
+            return None
+
+        if cache is not None:
+            cache.store(source, statements, resolver)
+        return statements
+
+    def check(self, source, resolve=True):
+        # Scans, parses and resolves without running anything, and returns the diagnostics.
+        self.error_handler.reset_errors()
+        try:
+            scanner = self.scanner_class(source, error_handler=self.error_handler)
+            statements = Parser(scanner.scan_tokens(), self.error_handler).parse()
+            if resolve and not self.error_handler.hadError:
+                Resolver(self.interpreter).resolve(statements)
+        finally:
+            self.output.flush()
+        return list(self.error_handler.diagnostics)
+
+    def run(self, source, engine="tree", use_cache=False):
+        self.error_handler.hadRuntimeError = False
+        try:
+            statements = self.compile(source, use_cache)
+            if statements is None:
+                return
+
+            try:
+                self.execute(statements, engine)
+                # Uncomment to see RPN representation of the code tree
+                # print(AstPrinter().print_nodes(statements))
+                # print(RpnPrinter().print_nodes(statements))
+                if self.show_python:
+                    PythonPrinter().print_nodes(statements, self.output)
+            except RuntimeError as e:
+                self.error_handler.runtime_error(e)
+        finally:
+            self.output.flush()
+
+    def run_stream(self, file, engine="tree"):
+        # Scans, parses, resolves and executes one top-level declaration at a time, so memory stays flat.
+        # The first compile error stops the run, though the declarations before it have already run.
+        tokens = scan_stream(file, self.scanner_class, error_handler=self.error_handler)
+        parser = Parser(TokenStream(tokens), self.error_handler)
+        resolver = Resolver(self.interpreter)
+        self.error_handler.reset_errors()
+        self.error_handler.hadRuntimeError = False
+        try:
+            for statement in parser.parse_stream():
+                if self.error_handler.hadError:
+                    return
+                resolver.resolve([statement])
+                if self.error_handler.hadError:
+                    return
+                try:
+                    self.execute([statement], engine)
+                except RuntimeError as e:
+                    self.error_handler.runtime_error(e)
+                    return
+                if self.error_handler.hadRuntimeError:
+                    return
+                resolver.global_references.clear()
+        finally:
+            self.output.flush()
+
+    def execute(self, statements, engine):
+        interpreter = self.interpreter
+        if self.optimize:
+            statements = Optimizer(interpreter).optimize(statements)
+            TypeChecker(interpreter).check(statements)
+        try:
+            if engine == "vm":
+                VM(interpreter).interpret(Compiler(interpreter).compile(statements))
+            elif engine == "closures":
+                compiler = ClosureCompiler(interpreter)
+                compiler.interpret(compiler.compile(statements))
+            elif engine == "python":
+                generator = PythonGenerator(interpreter)
+                generator.interpret(generator.compile(statements))
+            else:
+                interpreter.interpret(statements)
+        finally:
+            self.output.flush()
@@ -0,0 +1,438 @@
+from Token.token_type import TokenType
+from Ast.Nodes.expression import Get
+from Ast.Nodes.statement import Class, Function, Var
+from Runtime.Language_.assign_type import AssignType
+from Runtime.Language_.c_type import CType
+from Runtime.environment import UNDEFINED
+from Runtime.Transpiler.python_runtime import PythonRuntime, global_name
+from Runtime.runtime_error import RuntimeError
+from Runtime.specialization import guard_class
+
+BINARY_OPERATORS = {
+    TokenType.PLUS: "+",
+    TokenType.MINUS: "-",
+    TokenType.STAR: "*",
+    TokenType.SLASH: "/",
+    TokenType.GREATER: ">",
+    TokenType.GREATER_EQUAL: ">=",
+    TokenType.LESS: "<",
+    TokenType.LESS_EQUAL: "<=",
+}
+
+# Exact value classes that always pass Interpreter.check_type, so the generated code can skip the call.
+TRUSTED_CLASSES = {
+    CType.INT: "int",
+    CType.FLOAT: "float",
+    CType.DOUBLE: "float",
+    CType.STRING: "str",
+    CType.BOOL: "bool",
+}
+
+ASSIGN_OPERATORS = {
+    AssignType.PLUS_ASSIGN: "+",
+    AssignType.MINUS_ASSIGN: "-",
+    AssignType.STAR_ASSIGN: "*",
+    AssignType.SLASH_ASSIGN: "/",
+}
+
+INDENT = "    "
+
+# Python frames a single C# call can take in generated code. A constructor call is the longest:
+# rt_call, LanguageClass.call and PythonFunction.call, then the generated init itself. Generated
+# functions count calls against max_call_depth themselves; this only sizes the recursion limit.
+FRAMES_PER_CALL = 4
+
+
+def sanitize(lexeme):
+    if lexeme.isidentifier():
+        return lexeme
+    return lexeme.encode().hex()
+
+
+def constant(value):
+    if value is None:
+        return "None"
+    return f"{type(value).__name__}.{value.name}"
+
+
+class Scope:
+    def __init__(self, owner, is_global=False):
+        # owner is the FunctionContext of the Python function the scope's variables live in, None for the module.
+        self.owner = owner
+        self.is_global = is_global
+        self.names = []
+        self.types = []
+
+
+class FunctionContext:
+    def __init__(self):
+        self.globals = set()
+        self.nonlocals = set()
+
+
+# Generates a Python module from a resolved program. Every C# block scope is flattened into the
+# enclosing Python function, so each local gets a unique name; top-level names become module globals.
+class PythonGenerator:
+    def __init__(self, interpreter):
+        self.interpreter = interpreter
+        self.runtime = PythonRuntime(interpreter)
+        self.namespace = self.runtime.namespace()
+        self.module = self.namespace["rt_modules"]
+        self.namespace["rt_modules"] += 1
+        self.tokens = []
+        self.token_indexes = {}
+        self.declarations = []
+        self.global_types = {}
+        self.lines = []
+        self.indent = 0
+        self.scopes = [Scope(None, is_global=True)]
+        self.function = None
+        self.counter = self.namespace["rt_counter"]
+
+    def generate(self, statements):
+        for statement in statements:
+            if isinstance(statement, (Var, Function)):
+                self.global_types[statement.name.lexeme] = statement.type
+            elif isinstance(statement, Class):
+                self.global_types[statement.name.lexeme] = TokenType.NONE
+        for statement in statements:
+            self.generate_stmt(statement)
+        self.namespace["rt_counter"] = self.counter
+        return "\n".join(self.lines) + "\n"
+
+    def compile(self, statements):
+        return compile(self.generate(statements), "<csharp>", "exec")
+
+    def interpret(self, code, is_printable=True):
+        self.interpreter.is_printable = is_printable
+        namespace = self.namespace
+        namespace[f"T{self.module}"] = self.tokens
+        namespace[f"D{self.module}"] = self.declarations
+        self.runtime.load_globals(namespace)
+        try:
+            with self.interpreter.call_stack(FRAMES_PER_CALL):
+                exec(code, namespace)
+        except RuntimeError as error:
+            self.interpreter.error_handler.runtime_error(error)
+        finally:
+            self.runtime.store_globals(namespace, self.global_types)
+
+    def generate_stmt(self, stmt):
+        stmt.accept(visitor=self)
+
+    def generate_expr(self, expr):
+        return expr.accept(visitor=self)
+
+    def emit(self, line):
+        self.lines.append(INDENT * self.indent + line)
+
+    def emit_body(self, stmt):
+        self.indent += 1
+        start = len(self.lines)
+        self.generate_stmt(stmt)
+        if len(self.lines) == start:
+            self.emit("pass")
+        self.indent -= 1
+
+    def emit_step(self, token):
+        self.emit("rt_interpreter.steps_left -= 1")
+        self.emit(f"if rt_interpreter.steps_left < 0: rt_interpreter.refill_steps({self.token(token)})")
+
+    def fresh(self, prefix, lexeme=""):
+        self.counter += 1
+        return f"{prefix}{self.counter}_{sanitize(lexeme)}" if lexeme else f"{prefix}{self.counter}"
+
+    def token(self, token):
+        index = self.token_indexes.get(id(token))
+        if index is None:
+            index = len(self.tokens)
+            self.tokens.append(token)
+            self.token_indexes[id(token)] = index
+        return f"T{self.module}[{index}]"
+
+    def declaration(self, declaration):
+        self.declarations.append(declaration)
+        return f"D{self.module}[{len(self.declarations) - 1}]"
+
+    def declare(self, lexeme, type_):
+        scope = self.scopes[-1]
+        if scope.is_global:
+            return global_name(lexeme)
+        name = self.fresh("l", lexeme)
+        scope.names.append(name)
+        scope.types.append(type_)
+        return name
+
+    def global_type(self, lexeme):
+        if lexeme in self.global_types:
+            return self.global_types[lexeme]
+        slot = self.interpreter.globals.slots.get(lexeme)
+        if slot is not None:
+            return self.interpreter.globals.types[slot]
+        return UNDEFINED
+
+    def resolve(self, expr, name):
+        if expr.depth is not None:
+            scope = self.scopes[-1 - expr.depth]
+            if not scope.is_global:
+                return scope.names[expr.slot], scope.types[expr.slot], scope.owner
+        return global_name(name.lexeme), self.global_type(name.lexeme), None
+
+    def mark_assigned(self, name, owner):
+        if self.function is None or owner is self.function:
+            return
+        if owner is None:
+            self.function.globals.add(name)
+        else:
+            self.function.nonlocals.add(name)
+
+    def generate_function(self, declaration, name, receiver_scope=None):
+        enclosing_function, enclosing_lines, enclosing_indent = self.function, self.lines, self.indent
+        self.function = FunctionContext()
+        self.lines = []
+        self.indent = 0
+
+        params = []
+        if receiver_scope is not None:
+            receiver_scope.owner = self.function
+            params.append(receiver_scope.names[0])
+        self.scopes.append(Scope(self.function))
+        for param in declaration.params:
+            params.append(self.declare(param.name.lexeme, None))
+        for statement in declaration.body:
+            self.generate_stmt(statement)
+        self.scopes.pop()
+
+        context, body = self.function, self.lines
+        self.function, self.lines, self.indent = enclosing_function, enclosing_lines, enclosing_indent
+
+        self.emit(f"def {name}({', '.join(params)}):")
+        self.indent += 1
+        if context.globals:
+            self.emit(f"global {', '.join(sorted(context.globals))}")
+        if context.nonlocals:
+            self.emit(f"nonlocal {', '.join(sorted(context.nonlocals))}")
+        # A failing C# function returns nil to its caller, exactly like LanguageFunction.call.
+        token = self.token(declaration.name)
+        self.emit("if rt_interpreter.call_depth >= rt_interpreter.max_call_depth:")
+        self.emit(INDENT + f"raise StackOverflowError({token}, 'Stack overflow.')")
+        self.emit_step(declaration.name)
+        self.emit("rt_interpreter.call_depth += 1")
+        self.emit("try:")
+        prefix = INDENT * (self.indent + 1)
+        self.lines.extend(prefix + line for line in body or ["pass"])
+        self.emit("except AbortError:")
+        self.emit(INDENT + "raise")
+        self.emit("except RecursionError:")
+        self.emit(INDENT + f"raise StackOverflowError({token}, 'Stack overflow.')")
+        self.emit("except Exception:")
+        self.emit(INDENT + "return None")
+        self.emit("finally:")
+        self.emit(INDENT + "rt_interpreter.call_depth -= 1")
+        self.emit("return None")
+        self.indent -= 1
+
+    def truthy(self, value):
+        temp = self.fresh("t")
+        return f"({temp} := {value}) is not None and {temp} is not False"
+
+    def checked(self, name, ctype, value):
+        trusted_class = TRUSTED_CLASSES.get(ctype)
+        if ctype in (CType.VOID, CType.NONE):
+            return value
+        if trusted_class is None:
+            return f"rt_checked({self.token(name)}, {constant(ctype)}, {value})"
+        temp = self.fresh("t")
+        return (f"({temp} if ({temp} := {value}).__class__ is {trusted_class} "
+                f"else rt_checked({self.token(name)}, {constant(ctype)}, {temp}))")
+
+    # ----------------------------
+    # ExprVisitor
+    # ----------------------------
+
+    def visit_list_expr(self, expr):
+        return f"rt_list([{', '.join(self.generate_expr(value) for value in expr.values)}])"
+
+    def visit_subscript_expr(self, expr):
+        name = self.generate_expr(expr.name)
+        index = self.generate_expr(expr.index)
+        if expr.value is not None:
+            value = self.generate_expr(expr.value)
+            return f"rt_set_index({name}, {index}, {value}, {constant(expr.type)}, {self.token(expr.paren)})"
+        return f"rt_get_index({name}, {index}, {self.token(expr.paren)})"
+
+    def visit_assign_expr(self, expr):
+        value = self.generate_expr(expr.value)
+        name, var_type, owner = self.resolve(expr, expr.name)
+        if var_type is UNDEFINED:
+            return f"({value}, rt_undefined({self.token(expr.name)}))[1]"
+        if owner is None:
+            self.namespace["rt_assigned_globals"].add(expr.name.lexeme)
+        self.mark_assigned(name, owner)
+        temp = self.fresh("t")
+        if not expr.needs_check:
+            if expr.type == AssignType.ASSIGN:
+                return f"({name} := None if ({temp} := {value}) is None or {name} is None else {temp})"
+            fallback = f"rt_combine({self.token(expr.name)}, {constant(expr.type)}, {temp}, {name})"
+        else:
+            fallback = (f"rt_assign({self.token(expr.name)}, {constant(var_type)}, {constant(expr.type)}, "
+                        f"{temp}, {name})")
+        if var_type == CType.INT and expr.type == AssignType.ASSIGN:
+            return f"({name} := {temp} if ({temp} := {value}).__class__ is int and {name} is not None else {fallback})"
+        operand_class = guard_class(expr.specialization).__name__
+        if expr.type in ASSIGN_OPERATORS and TRUSTED_CLASSES.get(var_type) == operand_class:
+            return (f"({name} := {name} {ASSIGN_OPERATORS[expr.type]} {temp} "
+                    f"if ({temp} := {value}).__class__ is {name}.__class__ is {operand_class} else {fallback})")
+        if not expr.needs_check:
+            return f"({name} := rt_combine({self.token(expr.name)}, {constant(expr.type)}, {value}, {name}))"
+        return (f"({name} := rt_assign({self.token(expr.name)}, {constant(var_type)}, {constant(expr.type)}, "
+                f"{value}, {name}))")
+
+    def visit_binary_expr(self, expr):
+        left = self.generate_expr(expr.left)
+        right = self.generate_expr(expr.right)
+        operator_type = expr.operator.type
+        if operator_type == TokenType.EQUAL_EQUAL:
+            return f"({left} == {right})"
+        elif operator_type == TokenType.BANG_EQUAL:
+            return f"({left} != {right})"
+        elif operator_type in BINARY_OPERATORS:
+            left_temp, right_temp = self.fresh("t"), self.fresh("t")
+            return (f"({left_temp} {BINARY_OPERATORS[operator_type]} {right_temp} "
+                    f"if ({left_temp} := {left}).__class__ is ({right_temp} := {right}).__class__ is "
+                    f"{guard_class(expr.specialization).__name__} "
+                    f"else rt_arithmetic({self.token(expr.operator)}, {left_temp}, {right_temp}))")
+        return f"({left}, {right}, None)[2]"
+
+    def visit_call_expr(self, expr):
+        arguments = "".join(f", {self.generate_expr(argument)}" for argument in expr.arguments)
+        if expr.callee.__class__ is Get:
+            # The method is looked up before the arguments run, as with a bound callee.
+            target = f"rt_method({self.generate_expr(expr.callee.object)}, {self.declaration(expr.callee)})"
+            return f"rt_invoke({target}, {self.token(expr.paren)}{arguments})"
+        return f"rt_call({self.generate_expr(expr.callee)}, {self.token(expr.paren)}{arguments})"
+
+    def visit_get_expr(self, expr):
+        return f"rt_get({self.generate_expr(expr.object)}, {self.declaration(expr)})"
+
+    def visit_grouping_expr(self, expr):
+        return self.generate_expr(expr.expression)
+
+    def visit_literal_expr(self, expr):
+        return repr(expr.value)
+
+    def visit_logical_expr(self, expr):
+        left = self.generate_expr(expr.left)
+        right = self.generate_expr(expr.right)
+        temp = self.fresh("t")
+        truthy = f"({temp} := {left}) is not None and {temp} is not False"
+        if expr.operator.type == TokenType.OR:
+            return f"({temp} if {truthy} else {right})"
+        return f"({right} if {truthy} else {temp})"
+
+    def visit_set_expr(self, expr):
+        obj = self.generate_expr(expr.object)
+        value = self.generate_expr(expr.value)
+        return f"rt_set({obj}, {self.token(expr.name)}, {value}, {constant(expr.type)})"
+
+    def visit_super_expr(self, expr):
+        distance = expr.depth
+        superclass = self.scopes[-1 - distance].names[0]
+        instance = self.scopes[-distance].names[0]
+        return f"rt_super({superclass}, {instance}, {self.token(expr.method)})"
+
+    def visit_this_expr(self, expr):
+        return self.resolve(expr, expr.keyword)[0]
+
+    def visit_unary_expr(self, expr):
+        right = self.generate_expr(expr.right)
+        temp = self.fresh("t")
+        if expr.operator.type == TokenType.BANG:
+            return f"(({temp} := {right}) is None or {temp} is False)"
+        elif expr.operator.type == TokenType.MINUS:
+            return f"(-{temp} if ({temp} := {right}).__class__ is int else rt_negate({self.token(expr.operator)}, {temp}))"
+        return f"({right}, None)[1]"
+
+    def visit_variable_expr(self, expr):
+        name, var_type, owner = self.resolve(expr, expr.name)
+        if var_type is UNDEFINED:
+            return f"rt_undefined({self.token(expr.name)})"
+        return f"({name} if {name} is not None else rt_uninitialized({self.token(expr.name)}))"
+
+    # ----------------------------
+    # StmtVisitor
+    # ----------------------------
+
+    def visit_var_stmt(self, stmt):
+        value = "None"
+        if stmt.initializer is not None:
+            value = self.generate_expr(stmt.initializer)
+            if stmt.needs_check:
+                value = self.checked(stmt.name, stmt.type, value)
+        self.emit(f"{self.declare(stmt.name.lexeme, stmt.type)} = {value}")
+
+    def visit_while_stmt(self, stmt):
+        self.emit(f"while {self.truthy(self.generate_expr(stmt.condition))}:")
+        self.indent += 1
+        self.emit_step(stmt.keyword)
+        self.generate_stmt(stmt.body)
+        self.indent -= 1
+
+    def visit_block_stmt(self, stmt):
+        self.scopes.append(Scope(self.function))
+        for statement in stmt.statements:
+            self.generate_stmt(statement)
+        self.scopes.pop()
+
+    def visit_class_stmt(self, stmt):
+        name = self.declare(stmt.name.lexeme, TokenType.NONE)
+        self.emit(f"{name} = None")
+
+        superclass = "None"
+        if stmt.superclass is not None:
+            superclass = self.fresh("s")
+            self.emit(f"{superclass} = rt_superclass({self.generate_expr(stmt.superclass)}, "
+                      f"{self.token(stmt.superclass.name)})")
+            self.scopes.append(Scope(self.function))
+            self.scopes[-1].names.append(superclass)
+            self.scopes[-1].types.append(TokenType.NONE)
+
+        receiver_scope = Scope(None)
+        receiver_scope.names.append(self.fresh("l", "this"))
+        receiver_scope.types.append(None)
+        self.scopes.append(receiver_scope)
+        methods = []
+        for method in stmt.methods:
+            function = self.fresh("f", method.name.lexeme)
+            self.generate_function(method, function, receiver_scope=receiver_scope)
+            methods.append(f"{method.name.lexeme!r}: rt_function({self.declaration(method)}, {function}, True)")
+        self.scopes.pop()
+
+        if stmt.superclass is not None:
+            self.scopes.pop()
+        self.emit(f"{name} = rt_class({stmt.name.lexeme!r}, {superclass}, {{{', '.join(methods)}}})")
+
+    def visit_expression_stmt(self, stmt):
+        self.emit(self.generate_expr(stmt.expression))
+
+    def visit_function_stmt(self, stmt):
+        name = self.declare(stmt.name.lexeme, stmt.type)
+        function = self.fresh("f", stmt.name.lexeme)
+        self.generate_function(stmt, function)
+        self.emit(f"{name} = rt_function({self.declaration(stmt)}, {function})")
+
+    def visit_if_stmt(self, stmt):
+        self.emit(f"if {self.truthy(self.generate_expr(stmt.condition))}:")
+        self.emit_body(stmt.then_branch)
+        if stmt.else_branch is not None:
+            self.emit("else:")
+            self.emit_body(stmt.else_branch)
+
+    def visit_print_stmt(self, stmt):
+        self.emit(f"rt_print({self.generate_expr(stmt.expression)})")
+
+    def visit_return_stmt(self, stmt):
+        if stmt.value is not None:
+            self.emit(f"return {self.generate_expr(stmt.value)}")
+        else:
+            self.emit("return None")
@@ -0,0 +1,228 @@
+import weakref
+
+from Token.token_type import TokenType
+from Runtime.Language_.assign_type import AssignType
+from Runtime.Language_.c_type import CType
+from Runtime.Language_.language_class import LanguageClass
+from Runtime.Language_.language_function import LanguageFunction
+from Runtime.Language_.language_instance import LanguageInstance
+from Runtime.Language_.language_list import LanguageList
+from Runtime.environment import UNDEFINED
+from Runtime.runtime_error import RuntimeError, AbortError, StackOverflowError
+
+
+NAMESPACES = weakref.WeakKeyDictionary()
+
+
+class PythonFunction(LanguageFunction):
+    def __init__(self, declaration, function, is_method, is_initializer, instance=None):
+        super().__init__(declaration, None, is_initializer)
+        self.function = function
+        self.is_method = is_method
+        self.instance = instance
+        self.param_count = len(declaration.params)
+
+    def bind(self, instance):
+        return PythonFunction(self.declaration, self.function, self.is_method, self.is_initializer, instance)
+
+    def invoke(self, interpreter, instance, arguments):
+        value = self.function(instance, *arguments)
+        if self.is_initializer:
+            return instance
+        return value
+
+    def call(self, interpreter, arguments):
+        if self.is_method:
+            value = self.function(self.instance, *arguments)
+        else:
+            value = self.function(*arguments)
+        if self.is_initializer:
+            return self.instance
+        return value
+
+
+# Helpers the generated module calls wherever a C# rule is too involved to inline.
+class PythonRuntime:
+    def __init__(self, interpreter):
+        self.interpreter = interpreter
+
+    def namespace(self):
+        # Modules generated for the same interpreter share one namespace, so functions defined by an earlier
+        # run see the globals of later ones.
+        namespace = NAMESPACES.get(self.interpreter)
+        if namespace is None:
+            namespace = {
+                "__name__": "__csharp__",
+                "rt_modules": 0,
+                "rt_counter": 0,
+                # Interpreter.globals_version the namespace was last loaded at, and every global name
+                # any generated module assigns, which is all a run can change besides its declarations.
+                "rt_globals_version": None,
+                "rt_assigned_globals": set(),
+                "CType": CType,
+                "TokenType": TokenType,
+                "AbortError": AbortError,
+                "StackOverflowError": StackOverflowError,
+                "rt_interpreter": self.interpreter,
+                "AssignType": AssignType,
+                "rt_print": self.print,
+                "rt_call": self.call,
+                "rt_method": self.method,
+                "rt_invoke": self.invoke,
+                "rt_function": self.function,
+                "rt_class": self.class_,
+                "rt_superclass": self.superclass,
+                "rt_super": self.super,
+                "rt_get": self.interpreter.get_property,
+                "rt_set": self.set,
+                "rt_list": self.list,
+                "rt_get_index": self.get_index,
+                "rt_set_index": self.set_index,
+                "rt_checked": self.checked,
+                "rt_assign": self.assign,
+                "rt_combine": self.combine,
+                "rt_arithmetic": self.arithmetic,
+                "rt_negate": self.negate,
+                "rt_undefined": self.undefined,
+                "rt_uninitialized": self.uninitialized,
+            }
+            NAMESPACES[self.interpreter] = namespace
+        return namespace
+
+    def load_globals(self, namespace):
+        # Only needed once another engine may have changed the globals since the last Python run.
+        if namespace["rt_globals_version"] == self.interpreter.globals_version:
+            return
+        globals_ = self.interpreter.globals
+        for name, slot in globals_.slots.items():
+            if globals_.types[slot] is not UNDEFINED:
+                namespace[global_name(name)] = globals_.values[slot]
+        namespace["rt_globals_version"] = self.interpreter.globals_version
+
+    def store_globals(self, namespace, declared_types):
+        globals_ = self.interpreter.globals
+        for name in namespace["rt_assigned_globals"].union(declared_types):
+            if global_name(name) not in namespace:
+                continue
+            type_ = declared_types.get(name)
+            if type_ is None:
+                type_ = globals_.types[globals_.slots[name]]
+            globals_.define(name, type_, namespace[global_name(name)])
+
+    def print(self, value):
+        if self.interpreter.is_printable:
+            self.interpreter.write_line(self.interpreter.stringify(value))
+
+    def call(self, callee, paren, *arguments):
+        if callee.__class__ is PythonFunction and not callee.is_method:
+            if len(arguments) != callee.param_count:
+                raise RuntimeError(paren, f"Expected {callee.param_count} arguments but got {len(arguments)}.")
+            return callee.function(*arguments)
+        arguments = list(arguments)
+        self.interpreter.check_call(callee, arguments, paren)
+        return callee.call(self.interpreter, arguments)
+
+    def method(self, obj, site):
+        method = self.interpreter.lookup_method(obj, site)
+        if method is None:
+            return self.interpreter.get_property(obj, site), None
+        return method, obj
+
+    def invoke(self, target, paren, *arguments):
+        callee, receiver = target
+        if receiver is None:
+            return self.call(callee, paren, *arguments)
+        if callee.__class__ is PythonFunction:
+            if len(arguments) != callee.param_count:
+                raise RuntimeError(paren, f"Expected {callee.param_count} arguments but got {len(arguments)}.")
+            value = callee.function(receiver, *arguments)
+            if callee.is_initializer:
+                return receiver
+            return value
+        return self.interpreter.invoke(receiver, callee, list(arguments), paren)
+
+    def function(self, declaration, function, is_method=False):
+        is_initializer = is_method and declaration.name.lexeme == "init"
+        return PythonFunction(declaration, function, is_method, is_initializer)
+
+    def superclass(self, superclass, name):
+        if not isinstance(superclass, LanguageClass):
+            raise RuntimeError(name, "Superclass must be a class.")
+        return superclass
+
+    def class_(self, name, superclass, methods):
+        return LanguageClass(name, superclass, methods)
+
+    def super(self, superclass, instance, method_name):
+        method = superclass.find_method(method_name.lexeme)
+        if method is None:
+            raise RuntimeError(method_name, f"Undefined property '{method_name.lexeme}'.")
+        return method.bind(instance)
+
+    def set(self, obj, name, value, assign_type):
+        if not isinstance(obj, LanguageInstance):
+            raise RuntimeError(name, "Only instances have fields.")
+        return self.interpreter.set_property(obj, name, value, assign_type)
+
+    def list(self, values):
+        lst = LanguageList()
+        for value in values:
+            lst.append(value)
+        return lst
+
+    def get_index(self, name, index, paren):
+        index = self.interpreter.check_subscript(name, index, paren)
+        return self.interpreter.get_subscript(name, index, paren)
+
+    def set_index(self, name, index, value, assign_type, paren):
+        index = self.interpreter.check_subscript(name, index, paren)
+        return self.interpreter.set_subscript(name, index, value, assign_type, paren)
+
+    def checked(self, name, ctype, value):
+        self.interpreter.check_type(name, ctype, value)
+        return value
+
+    def assign(self, name, ctype, assign_type, value, previous_value):
+        new_value = self.interpreter.handle_assigning(assign_type, name, previous_value, value)
+        self.interpreter.check_type(name, ctype, value)
+        return new_value
+
+    def combine(self, name, assign_type, value, previous_value):
+        return self.interpreter.handle_assigning(assign_type, name, previous_value, value)
+
+    def arithmetic(self, operator, left, right):
+        self.interpreter.check_number_operands(operator, left, right)
+        operator_type = operator.type
+        if operator_type == TokenType.PLUS:
+            return left + right
+        elif operator_type == TokenType.MINUS:
+            return left - right
+        elif operator_type == TokenType.STAR:
+            return left * right
+        elif operator_type == TokenType.SLASH:
+            return left / right
+        elif operator_type == TokenType.GREATER:
+            return left > right
+        elif operator_type == TokenType.GREATER_EQUAL:
+            return left >= right
+        elif operator_type == TokenType.LESS:
+            return left < right
+        elif operator_type == TokenType.LESS_EQUAL:
+            return left <= right
+        return None
+
+    def negate(self, operator, value):
+        self.interpreter.check_number_operand(operator, value)
+        return -value
+
+    def undefined(self, name):
+        return self.interpreter.globals.get(name)
+
+    def uninitialized(self, name):
+        raise RuntimeError(name, "Variable not initialized.")
+
+
+def global_name(lexeme):
+    if lexeme.isidentifier():
+        return f"v_{lexeme}"
+    return f"vx_{lexeme.encode().hex()}"
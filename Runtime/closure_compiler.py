@@ -0,0 +1,532 @@
+import operator
+
+from Token.token_type import TokenType
+from Ast.Nodes.expression import Get, Literal
+from Runtime.Language_.assign_type import AssignType
+from Runtime.Language_.c_type import CType
+from Runtime.Language_.language_class import LanguageClass
+from Runtime.Language_.language_function import LanguageFunction
+from Runtime.Language_.language_instance import LanguageInstance
+from Runtime.Language_.language_list import LanguageList
+from Runtime.environment import Environment
+from Runtime.runtime_error import RuntimeError, AbortError, StackOverflowError
+from Runtime.specialization import guard_class
+
+ARITHMETIC_OPERATORS = {
+    TokenType.PLUS: operator.add,
+    TokenType.MINUS: operator.sub,
+    TokenType.STAR: operator.mul,
+    TokenType.SLASH: operator.truediv,
+    TokenType.GREATER: operator.gt,
+    TokenType.GREATER_EQUAL: operator.ge,
+    TokenType.LESS: operator.lt,
+    TokenType.LESS_EQUAL: operator.le,
+}
+
+ASSIGN_OPERATORS = {
+    AssignType.PLUS_ASSIGN: operator.add,
+    AssignType.MINUS_ASSIGN: operator.sub,
+    AssignType.STAR_ASSIGN: operator.mul,
+    AssignType.SLASH_ASSIGN: operator.truediv,
+}
+
+# Python frames a single language-level call can take in compiled closures.
+FRAMES_PER_CALL = 32
+
+# Exact value classes that always pass Interpreter.check_type for the given declared type.
+TRUSTED_CLASSES = {
+    CType.INT: (int, bool),
+    CType.FLOAT: (float,),
+    CType.DOUBLE: (float,),
+    CType.STRING: (str,),
+    CType.BOOL: (bool,),
+}
+
+
+def are_numbers(left, right):
+    return (isinstance(left, int) and isinstance(right, int)) or (isinstance(left, float) and isinstance(right, float))
+
+
+class ClosureFunction(LanguageFunction):
+    def __init__(self, declaration, closure, is_initializer, body):
+        super().__init__(declaration, closure, is_initializer)
+        self.body = body
+
+    def bind(self, instance):
+        return ClosureFunction(declaration=self.declaration, closure=instance.receiver(self.closure),
+                               is_initializer=self.is_initializer, body=self.body)
+
+    def run(self, interpreter, closure, arguments):
+        if interpreter.call_depth >= interpreter.max_call_depth:
+            raise StackOverflowError(self.declaration.name, "Stack overflow.")
+        interpreter.steps_left -= 1
+        if interpreter.steps_left < 0:
+            interpreter.refill_steps(self.declaration.name)
+        environment = Environment(enclosing=closure)
+        environment.values.extend(arguments)
+        environment.types.extend([None] * len(arguments))
+        interpreter.call_depth += 1
+        try:
+            completion = self.body(environment)
+        except AbortError:
+            raise
+        except RecursionError:
+            raise StackOverflowError(self.declaration.name, "Stack overflow.")
+        except Exception:
+            return None
+        finally:
+            interpreter.call_depth -= 1
+
+        if self.is_initializer:
+            return closure.get_at(distance=0, slot=0)
+        if completion is not None:
+            return completion[0]
+        return None
+
+
+# Expression closures take the current Environment and return a value. Statement closures return
+# None, or a one-element tuple holding the value of an executed return statement.
+class ClosureCompiler:
+    def __init__(self, interpreter):
+        self.interpreter = interpreter
+
+    def compile(self, statements):
+        return self.compile_block(statements)
+
+    def interpret(self, program, is_printable=True):
+        self.interpreter.is_printable = is_printable
+        self.interpreter.globals_version += 1
+        try:
+            with self.interpreter.call_stack(FRAMES_PER_CALL):
+                program(self.interpreter.environment)
+        except RuntimeError as error:
+            self.interpreter.error_handler.runtime_error(error)
+
+    def compile_stmt(self, stmt):
+        return stmt.accept(visitor=self)
+
+    def compile_expr(self, expr):
+        return expr.accept(visitor=self)
+
+    def compile_block(self, statements):
+        compiled = [self.compile_stmt(statement) for statement in statements]
+        if len(compiled) == 1:
+            return compiled[0]
+
+        def block(env):
+            for statement in compiled:
+                completion = statement(env)
+                if completion is not None:
+                    return completion
+            return None
+
+        return block
+
+    def compile_type_check(self, name, ctype):
+        check_type = self.interpreter.check_type
+        if ctype in (CType.VOID, CType.NONE):
+            return None
+        trusted = TRUSTED_CLASSES.get(ctype, ())
+
+        def type_check(value):
+            if value is not None and value.__class__ not in trusted:
+                check_type(name, ctype, value)
+
+        return type_check
+
+    def compile_lookup(self, expr, name):
+        if expr.depth is None:
+            get_global = self.interpreter.globals.get
+            return lambda env: get_global(name)
+
+        depth, slot = expr.depth, expr.slot
+        if depth == 0:
+            return lambda env: env.values[slot]
+        if depth == 1:
+            return lambda env: env.enclosing.values[slot]
+        return lambda env: env.ancestor(depth).values[slot]
+
+    # ----------------------------
+    # ExprVisitor
+    # ----------------------------
+
+    def visit_list_expr(self, expr):
+        values = [self.compile_expr(value) for value in expr.values]
+
+        def list_(env):
+            lst = LanguageList()
+            for value in values:
+                lst.append(value(env))
+            return lst
+
+        return list_
+
+    def visit_subscript_expr(self, expr):
+        interpreter = self.interpreter
+        name = self.compile_expr(expr.name)
+        index = self.compile_expr(expr.index)
+        paren = expr.paren
+
+        if expr.value is None:
+            def get_subscript(env):
+                lst = name(env)
+                return interpreter.get_subscript(lst, interpreter.check_subscript(lst, index(env), paren), paren)
+
+            return get_subscript
+
+        value = self.compile_expr(expr.value)
+        assign_type = expr.type
+
+        def set_subscript(env):
+            lst = name(env)
+            checked_index = interpreter.check_subscript(lst, index(env), paren)
+            return interpreter.set_subscript(lst, checked_index, value(env), assign_type, paren)
+
+        return set_subscript
+
+    def visit_assign_expr(self, expr):
+        interpreter = self.interpreter
+        value = self.compile_expr(expr.value)
+        name = expr.name
+        assign_type = expr.type
+        assign_operator = ASSIGN_OPERATORS.get(assign_type)
+        check_type = interpreter.check_type
+        needs_check = expr.needs_check
+        operand_class = guard_class(expr.specialization)
+
+        def combine(var_type, previous_value, new_value):
+            if assign_operator is None:
+                result = None if previous_value is None or new_value is None else new_value
+            elif previous_value.__class__ is new_value.__class__ is operand_class:
+                result = assign_operator(previous_value, new_value)
+            else:
+                result = interpreter.handle_assigning(assign_type, name, previous_value, new_value)
+            if needs_check and not (var_type is CType.INT and new_value.__class__ is int):
+                check_type(name, var_type, new_value)
+            return result
+
+        if expr.depth is None:
+            globals_ = interpreter.globals
+
+            def assign_global(env):
+                new_value = value(env)
+                var_type = globals_.get_type(name)
+                result = combine(var_type, globals_.get(name), new_value)
+                globals_.assign(name, var_type, result)
+                return result
+
+            return assign_global
+
+        depth, slot = expr.depth, expr.slot
+
+        def assign_local(env):
+            new_value = value(env)
+            environment = env
+            for _ in range(depth):
+                environment = environment.enclosing
+            result = combine(environment.types[slot], environment.values[slot], new_value)
+            environment.values[slot] = result
+            return result
+
+        return assign_local
+
+    def visit_binary_expr(self, expr):
+        left = self.compile_expr(expr.left)
+        right = self.compile_expr(expr.right)
+        operator_token = expr.operator
+        operator_type = operator_token.type
+
+        if operator_type in (TokenType.EQUAL_EQUAL, TokenType.BANG_EQUAL):
+            is_equal = self.interpreter.is_equal
+            if operator_type == TokenType.EQUAL_EQUAL:
+                return lambda env: is_equal(left(env), right(env))
+            return lambda env: not is_equal(left(env), right(env))
+
+        if operator_type not in ARITHMETIC_OPERATORS:
+            def unknown(env):
+                left(env)
+                right(env)
+                return None
+
+            return unknown
+
+        apply = ARITHMETIC_OPERATORS[operator_type]
+        constant = expr.right.value if isinstance(expr.right, Literal) else None
+
+        if constant.__class__ is int:
+            def arithmetic_with_int(env):
+                left_value = left(env)
+                if left_value.__class__ is int or are_numbers(left_value, constant):
+                    return apply(left_value, constant)
+                raise RuntimeError(operator_token, "Operands must be numbers.")
+
+            return arithmetic_with_int
+
+        operand_class = guard_class(expr.specialization)
+
+        def arithmetic(env):
+            left_value = left(env)
+            right_value = right(env)
+            if left_value.__class__ is right_value.__class__ is operand_class or are_numbers(left_value, right_value):
+                return apply(left_value, right_value)
+            raise RuntimeError(operator_token, "Operands must be numbers.")
+
+        return arithmetic
+
+    def visit_call_expr(self, expr):
+        interpreter = self.interpreter
+        arguments = [self.compile_expr(argument) for argument in expr.arguments]
+        paren = expr.paren
+        check_call = interpreter.check_call
+
+        if expr.callee.__class__ is Get:
+            obj = self.compile_expr(expr.callee.object)
+            site = expr.callee
+            lookup_method = interpreter.lookup_method
+            get_property = interpreter.get_property
+            invoke = interpreter.invoke
+
+            def invoke_method(env):
+                instance = obj(env)
+                method = lookup_method(instance, site)
+                if method is not None:
+                    return invoke(instance, method, [argument(env) for argument in arguments], paren)
+                function = get_property(instance, site)
+                values = [argument(env) for argument in arguments]
+                check_call(function, values, paren)
+                return function.call(interpreter, values)
+
+            return invoke_method
+
+        callee = self.compile_expr(expr.callee)
+
+        def call(env):
+            function = callee(env)
+            values = [argument(env) for argument in arguments]
+            check_call(function, values, paren)
+            return function.call(interpreter, values)
+
+        return call
+
+    def visit_get_expr(self, expr):
+        obj = self.compile_expr(expr.object)
+        get_property = self.interpreter.get_property
+        return lambda env: get_property(obj(env), expr)
+
+    def visit_grouping_expr(self, expr):
+        return self.compile_expr(expr.expression)
+
+    def visit_literal_expr(self, expr):
+        value = expr.value
+        return lambda env: value
+
+    def visit_logical_expr(self, expr):
+        left = self.compile_expr(expr.left)
+        right = self.compile_expr(expr.right)
+
+        if expr.operator.type == TokenType.OR:
+            def or_(env):
+                value = left(env)
+                if value is None or value is False:
+                    return right(env)
+                return value
+
+            return or_
+
+        def and_(env):
+            value = left(env)
+            if value is None or value is False:
+                return value
+            return right(env)
+
+        return and_
+
+    def visit_set_expr(self, expr):
+        interpreter = self.interpreter
+        obj = self.compile_expr(expr.object)
+        value = self.compile_expr(expr.value)
+        name = expr.name
+        assign_type = expr.type
+
+        def set_(env):
+            instance = obj(env)
+            if not isinstance(instance, LanguageInstance):
+                raise RuntimeError(name, "Only instances have fields.")
+            return interpreter.set_property(instance, name, value(env), assign_type)
+
+        return set_
+
+    def visit_super_expr(self, expr):
+        get_super = self.interpreter.get_super
+        depth = expr.depth
+        method = expr.method
+        return lambda env: get_super(env, depth, method)
+
+    def visit_this_expr(self, expr):
+        return self.compile_lookup(expr, expr.keyword)
+
+    def visit_unary_expr(self, expr):
+        right = self.compile_expr(expr.right)
+        operator_token = expr.operator
+
+        if operator_token.type == TokenType.BANG:
+            def not_(env):
+                value = right(env)
+                return value is None or value is False
+
+            return not_
+
+        if operator_token.type == TokenType.MINUS:
+            check_number_operand = self.interpreter.check_number_operand
+
+            def negate(env):
+                value = right(env)
+                check_number_operand(operator_token, value)
+                return -value
+
+            return negate
+
+        def unknown(env):
+            right(env)
+            return None
+
+        return unknown
+
+    def visit_variable_expr(self, expr):
+        lookup = self.compile_lookup(expr, expr.name)
+        name = expr.name
+
+        def variable(env):
+            value = lookup(env)
+            if value is None:
+                raise RuntimeError(name, "Variable not initialized.")
+            return value
+
+        return variable
+
+    # ----------------------------
+    # StmtVisitor
+    # ----------------------------
+
+    def visit_var_stmt(self, stmt):
+        name = stmt.name.lexeme
+        var_type = stmt.type
+        type_check = self.compile_type_check(stmt.name, var_type) if stmt.needs_check else None
+
+        if stmt.initializer is None:
+            def declare(env):
+                env.define(name, var_type, None)
+
+            return declare
+
+        initializer = self.compile_expr(stmt.initializer)
+
+        def define(env):
+            value = initializer(env)
+            if type_check is not None:
+                type_check(value)
+            env.define(name, var_type, value)
+
+        return define
+
+    def visit_while_stmt(self, stmt):
+        interpreter = self.interpreter
+        keyword = stmt.keyword
+        condition = self.compile_expr(stmt.condition)
+        body = self.compile_stmt(stmt.body)
+
+        def while_(env):
+            while True:
+                value = condition(env)
+                if value is None or value is False:
+                    return None
+                interpreter.steps_left -= 1
+                if interpreter.steps_left < 0:
+                    interpreter.refill_steps(keyword)
+                completion = body(env)
+                if completion is not None:
+                    return completion
+
+        return while_
+
+    def visit_block_stmt(self, stmt):
+        block = self.compile_block(stmt.statements)
+        return lambda env: block(Environment(enclosing=env))
+
+    def visit_class_stmt(self, stmt):
+        name = stmt.name.lexeme
+        superclass_name = stmt.superclass.name if stmt.superclass is not None else None
+        superclass_value = self.compile_expr(stmt.superclass) if stmt.superclass is not None else None
+        methods = [(method, self.compile_function(method)) for method in stmt.methods]
+
+        def class_(env):
+            key = env.define(name, TokenType.NONE, None)
+            superclass = None
+            method_environment = env
+            if superclass_value is not None:
+                superclass = superclass_value(env)
+                if not isinstance(superclass, LanguageClass):
+                    raise RuntimeError(superclass_name, "Superclass must be a class.")
+                method_environment = Environment(enclosing=env)
+                method_environment.define("super", TokenType.NONE, superclass)
+
+            functions = {}
+            for method, body in methods:
+                is_initializer = method.name.lexeme == "init"
+                functions[method.name.lexeme] = ClosureFunction(method, method_environment, is_initializer, body)
+            env.set(key, TokenType.NONE, LanguageClass(name, superclass, functions))
+
+        return class_
+
+    def visit_expression_stmt(self, stmt):
+        expression = self.compile_expr(stmt.expression)
+
+        def expression_(env):
+            expression(env)
+
+        return expression_
+
+    def compile_function(self, declaration):
+        return self.compile_block(declaration.body)
+
+    def visit_function_stmt(self, stmt):
+        body = self.compile_function(stmt)
+        name = stmt.name.lexeme
+        function_type = stmt.type
+
+        def function(env):
+            env.define(name, function_type, ClosureFunction(stmt, env, False, body))
+
+        return function
+
+    def visit_if_stmt(self, stmt):
+        condition = self.compile_expr(stmt.condition)
+        then_branch = self.compile_stmt(stmt.then_branch)
+        else_branch = self.compile_stmt(stmt.else_branch) if stmt.else_branch is not None else None
+
+        def if_(env):
+            value = condition(env)
+            if value is None or value is False:
+                if else_branch is not None:
+                    return else_branch(env)
+                return None
+            return then_branch(env)
+
+        return if_
+
+    def visit_print_stmt(self, stmt):
+        interpreter = self.interpreter
+        expression = self.compile_expr(stmt.expression)
+
+        def print_(env):
+            value = expression(env)
+            if interpreter.is_printable:
+                interpreter.write_line(interpreter.stringify(value))
+
+        return print_
+
+    def visit_return_stmt(self, stmt):
+        if stmt.value is None:
+            return lambda env: (None,)
+        value = self.compile_expr(stmt.value)
+        return lambda env: (value(env),)
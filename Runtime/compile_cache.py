@@ -0,0 +1,89 @@
+import hashlib
+import os
+import pickle
+import sys
+import tempfile
+
+# Bump whenever the AST classes or the resolution format change, so stale entries are never loaded.
+FORMAT_VERSION = "7"
+
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+
+class CompileCache:
+    def __init__(self, directory, max_bytes=DEFAULT_MAX_BYTES):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        os.makedirs(directory, exist_ok=True)
+
+    def key(self, source):
+        digest = hashlib.sha256()
+        digest.update(f"{FORMAT_VERSION}:{sys.version}".encode())
+        digest.update(b"\0")
+        digest.update(source.encode())
+        return digest.hexdigest()
+
+    def path(self, key):
+        return os.path.join(self.directory, f"{key}.pickle")
+
+    def load(self, source, interpreter):
+        path = self.path(self.key(source))
+        try:
+            with open(path, "rb") as file:
+                statements, global_references = pickle.load(file)
+            os.utime(path)
+        except FileNotFoundError:
+            return None
+        except Exception:
+            self.remove(path)
+            return None
+
+        # Resolution data travels on the nodes, but global slots belong to the running interpreter.
+        for expr, name in global_references:
+            interpreter.resolve(expr=expr, depth=expr.depth, slot=interpreter.globals.reserve(name))
+        return statements
+
+    def store(self, source, statements, resolver):
+        try:
+            data = pickle.dumps((statements, resolver.global_references), protocol=pickle.HIGHEST_PROTOCOL)
+        except (pickle.PicklingError, RecursionError):
+            return
+        # Write under a temporary name first, so concurrent runs never read a partial entry.
+        handle, temporary_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        with os.fdopen(handle, "wb") as file:
+            file.write(data)
+        os.replace(temporary_path, self.path(self.key(source)))
+        self.evict()
+
+    def evict(self):
+        entries = []
+        total_size = 0
+        for name in os.listdir(self.directory):
+            if not name.endswith(".pickle"):
+                continue
+            path = os.path.join(self.directory, name)
+            try:
+                stat = os.stat(path)
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+            total_size += stat.st_size
+
+        # Least recently used entries go first; load() refreshes the mtime on every hit.
+        entries.sort()
+        for _, size, path in entries:
+            if total_size <= self.max_bytes:
+                break
+            self.remove(path)
+            total_size -= size
+
+    def clear(self):
+        for name in os.listdir(self.directory):
+            if name.endswith(".pickle"):
+                self.remove(os.path.join(self.directory, name))
+
+    def remove(self, path):
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
@@ -1,36 +1,21 @@
-class Variable:
-    def __init__(self, type_, item):
-        self.type = type_
-        self.item = item
+from Runtime.runtime_error import RuntimeError
 
 
 class Environment:
     def __init__(self, enclosing=None):
         self.enclosing = enclosing
-        self.values = {}
-
-    def get(self, name):
-        if name.lexeme in self.values:
-            return Variable(*self.values[name.lexeme])
-
-        if self.enclosing:
-            return self.enclosing.get(name)
-
-        raise RuntimeError(name, f"Undefined variable '{name.lexeme}'.")
-
-    def assign(self, name, type_, value):
-        if name.lexeme in self.values:
-            self.values[name.lexeme] = (type_, value)
-            return
-
-        if self.enclosing:
-            self.enclosing.assign(name, type_, value)
-            return
-
-        raise RuntimeError(name, f"Undefined variable '{name.lexeme}'.")
+        self.values = []
+        self.types = []
 
     def define(self, name, type_, value):
-        self.values[name] = (type_, value)
+        # Slots are handed out in declaration order, which is the order the Resolver numbers them in.
+        self.values.append(value)
+        self.types.append(type_)
+        return len(self.values) - 1
+
+    def set(self, slot, type_, value):
+        self.values[slot] = value
+        self.types[slot] = type_
 
     def ancestor(self, distance):
         environment = self
@@ -38,8 +23,53 @@ class Environment:
             environment = environment.enclosing
         return environment
 
-    def get_at(self, distance, name):
-        return Variable(*self.ancestor(distance).values[name])
+    def get_at(self, distance, slot):
+        return self.ancestor(distance).values[slot]
+
+    def get_type_at(self, distance, slot):
+        return self.ancestor(distance).types[slot]
+
+    def assign_at(self, distance, slot, value):
+        self.ancestor(distance).values[slot] = value
+
 
-    def assign_at(self, distance, name, type_, value):
-        self.ancestor(distance).values[name.lexeme] = (type_, value)
+# Marks a global slot the Resolver has reserved but whose declaration has not run yet.
+UNDEFINED = object()
+
+
+class GlobalEnvironment(Environment):
+    def __init__(self):
+        super().__init__()
+        self.slots = {}
+
+    def reserve(self, name):
+        slot = self.slots.get(name)
+        if slot is None:
+            slot = len(self.values)
+            self.slots[name] = slot
+            self.values.append(None)
+            self.types.append(UNDEFINED)
+        return slot
+
+    def slot_of(self, name):
+        slot = self.slots.get(name.lexeme)
+        if slot is None or self.types[slot] is UNDEFINED:
+            raise RuntimeError(name, f"Undefined variable '{name.lexeme}'.")
+        return slot
+
+    def get(self, name):
+        return self.values[self.slot_of(name)]
+
+    def get_type(self, name):
+        return self.types[self.slot_of(name)]
+
+    def assign(self, name, type_, value):
+        slot = self.slot_of(name)
+        self.values[slot] = value
+        self.types[slot] = type_
+
+    def define(self, name, type_, value):
+        slot = self.reserve(name)
+        self.values[slot] = value
+        self.types[slot] = type_
+        return slot
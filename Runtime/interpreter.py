@@ -1,24 +1,48 @@
+import operator
+import sys
+import threading
+import time
+from contextlib import contextmanager
 from datetime import datetime, timezone
 
 from Token.token_type import TokenType
 from Ast.Nodes.statement import *
-from Runtime.Language_.language_list import LanguageList
+from Runtime.Language_.language_list import LanguageList, can_replace
 from Runtime.Language_.language_instance import LanguageInstance
 from Runtime.Language_.language_function import LanguageCallable, LanguageFunction
 from Runtime.Language_.language_class import LanguageClass
+from Runtime.Language_.native_function import NativeFunction, NATIVE_FUNCTIONS
 from Runtime.Language_.assign_type import AssignType
 
 from Extensions.numeric import Numeric
 from Extensions.string import String
-from Extensions.custom_any import CustomAny
-from Runtime.return_ import ReturnException
 
-from Runtime.runtime_error import RuntimeError
-from Runtime.environment import Environment
+from Runtime.runtime_error import RuntimeError, LimitError
+from Runtime.specialization import BINARY_SPECIALIZATIONS, ASSIGN_SPECIALIZATIONS, GENERIC, respecialize
+from Runtime.environment import Environment, GlobalEnvironment
+from Runtime.output_sink import OutputSink
 
 from Runtime.Language_.error_handler import ErrorHandler
 
 
+DEFAULT_MAX_CALL_DEPTH = 10_000
+
+# Python frames a single language-level call can take in the tree walker.
+FRAMES_PER_CALL = 48
+
+# The operation behind each compound assignment. Only += also works on strings.
+COMPOUND_OPERATIONS = {
+    AssignType.PLUS_ASSIGN: operator.add,
+    AssignType.MINUS_ASSIGN: operator.sub,
+    AssignType.STAR_ASSIGN: operator.mul,
+    AssignType.SLASH_ASSIGN: operator.truediv,
+}
+
+# Every loop iteration and every call is one step. Steps are handed out in chunks, so the step limit,
+# the deadline and interrupt() are only looked at once per chunk.
+STEP_CHUNK = 1024
+
+
 def can_convert_to_int(value):
     if isinstance(value, int):
         return True
@@ -40,20 +64,105 @@ class Clock:
         return "<native fn>"
 
 
+# Every engine counts calls against max_call_depth itself, so the recursion limit is only a backstop.
+# It is process-wide, so it is lifted only when the host's limit can't hold the deepest call stack a
+# running session allows, keeping half of it for the frames below the script. Concurrent sessions share
+# one raised limit, restored only once the last of them has finished.
+class RecursionLimit:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.base = None
+        self.extras = []
+
+    def limit(self):
+        extra = max(self.extras, default=0)
+        return self.base if extra <= self.base // 2 else self.base + extra
+
+    def push(self, extra):
+        with self.lock:
+            if not self.extras:
+                self.base = sys.getrecursionlimit()
+            self.extras.append(extra)
+            sys.setrecursionlimit(self.limit())
+
+    def pop(self, extra):
+        with self.lock:
+            self.extras.remove(extra)
+            sys.setrecursionlimit(self.limit())
+
+
+RECURSION_LIMIT = RecursionLimit()
+
+
 class Interpreter:
-    def __init__(self, error_handler):
-        self.globals = Environment()
+    def __init__(self, error_handler, max_call_depth=DEFAULT_MAX_CALL_DEPTH, output=None):
+        self.globals = GlobalEnvironment()
         self.is_printable = True
         self.environment = self.globals
-        self.locals = {}
         self.globals.define("clock", CType.NONE, Clock())
+        for native in NATIVE_FUNCTIONS:
+            self.globals.define(native.name, CType.NONE, native)
         self.error_handler = error_handler
+        self.max_call_depth = max_call_depth
+        self.call_depth = 0
+        # Bumped by every engine that keeps globals in self.globals, so the Python engine knows when
+        # its namespace copy is stale.
+        self.globals_version = 0
+        # The compound assignment types each top-level name has been updated with in checked code,
+        # including code from earlier runs that a later declaration of the name can't see.
+        self.compound_assigned_names = {}
+        self.output = output if output is not None else OutputSink()
+        # Bound once, since every WriteLine in every engine goes through it.
+        self.write_line = self.output.write_line
+        self.max_steps = None
+        self.deadline = None
+        self.interrupted = False
+        self.steps_taken = 0
+        self.steps_left = STEP_CHUNK
+
+    @contextmanager
+    def call_stack(self, frames_per_call):
+        # Language calls nest Python frames, so the Python recursion limit must leave room for
+        # max_call_depth calls; otherwise the host, not max_call_depth, decides how deep a script may recurse.
+        extra = self.max_call_depth * frames_per_call
+        RECURSION_LIMIT.push(extra)
+        try:
+            yield
+        finally:
+            RECURSION_LIMIT.pop(extra)
+
+    def set_limits(self, max_steps=None, time_limit=None):
+        self.max_steps = max_steps
+        self.deadline = None if time_limit is None else time.monotonic() + time_limit
+        self.interrupted = False
+        self.steps_taken = 0
+        self.steps_left = 0
+
+    def interrupt(self):
+        # Safe to call from any thread; the running script stops within one chunk of steps.
+        self.interrupted = True
+
+    def refill_steps(self, token):
+        # Called once steps_left has dropped below zero; the step being taken counts against the new chunk.
+        if self.interrupted:
+            raise LimitError(token, "Interrupted.")
+        if self.deadline is not None and time.monotonic() >= self.deadline:
+            raise LimitError(token, "Time limit exceeded.")
+        chunk = STEP_CHUNK
+        if self.max_steps is not None:
+            chunk = min(chunk, self.max_steps - self.steps_taken)
+            if chunk <= 0:
+                raise LimitError(token, "Step limit exceeded.")
+        self.steps_taken += chunk
+        self.steps_left = chunk - 1
 
     def interpret(self, statements, is_printable=True):
         self.is_printable = is_printable
+        self.globals_version += 1
         try:
-            for statement in statements:
-                self.execute(statement)
+            with self.call_stack(FRAMES_PER_CALL):
+                for statement in statements:
+                    self.execute(statement)
         except RuntimeError as error:
             self.error_handler.runtime_error(error)
 
@@ -63,19 +172,22 @@ class Interpreter:
     def execute(self, stmt):
         return stmt.accept(visitor=self)
 
-    def resolve(self, expr, depth):
-        self.locals[expr] = depth
+    def resolve(self, expr, depth, slot):
+        expr.depth = depth
+        expr.slot = slot
 
+    # Statements return None, or a one-element tuple holding the value of an executed return statement,
+    # which every enclosing block and loop passes straight up to the function call.
     def execute_block(self, statements, environment):
         previous = self.environment
+        self.environment = environment
         try:
-            self.environment = environment
             for statement in statements:
-                self.execute(statement)
-        except Exception as error:
+                completion = self.execute(statement)
+                if completion is not None:
+                    return completion
+        finally:
             self.environment = previous
-            raise error
-        self.environment = previous
 
     def handle_assigning(self, assign_type, token, previous_value, new_value):
         if new_value is None or previous_value is None:
@@ -84,36 +196,20 @@ class Interpreter:
         if assign_type == AssignType.ASSIGN:
             return new_value
 
-        if assign_type == AssignType.PLUS_ASSIGN:
-            result_value = Numeric.perform_operation(lambda x, y: x + y, previous_value, new_value)
-            if result_value is None:
-                result_value = String.perform_operation(lambda x, y: x + y, previous_value, new_value)
-            if result_value is not None:
-                return result_value
-            raise self.throw_wrong_type(token)
-
-        if assign_type == AssignType.MINUS_ASSIGN:
-            result_value = Numeric.perform_operation(lambda x, y: x - y, previous_value, new_value)
-            if result_value is not None:
-                return result_value
-            raise self.throw_wrong_type(token)
-
-        if assign_type == AssignType.SLASH_ASSIGN:
-            result_value = Numeric.perform_operation(lambda x, y: x / y, previous_value, new_value)
-            if result_value is not None:
-                return result_value
-            raise self.throw_wrong_type(token)
-
-        if assign_type == AssignType.STAR_ASSIGN:
-            result_value = Numeric.perform_operation(lambda x, y: x * y, previous_value, new_value)
-            if result_value is not None:
-                return result_value
-            raise self.throw_wrong_type(token)
+        operation = COMPOUND_OPERATIONS[assign_type]
+        result_value = Numeric.perform_operation(operation, previous_value, new_value)
+        if result_value is None and assign_type == AssignType.PLUS_ASSIGN:
+            result_value = String.perform_operation(operation, previous_value, new_value)
+        if result_value is not None:
+            return result_value
+        raise self.throw_wrong_type(token)
 
     def check_type(self, token, ctype, value):
         # print(f"token--{token},ctype--{ctype},value--{value}","\n")
         if value is None:
             return
+        if isinstance(value, LanguageList) and value.element_type == ctype:
+            return
         if ctype == CType.INT:
             if not can_convert_to_int(value):
                 raise self.throw_wrong_type(token)
@@ -130,33 +226,103 @@ class Interpreter:
             if not isinstance(value, bool):
                 raise self.throw_wrong_type(token)
         elif ctype == CType.STRING_ARRAY:
-            if not (isinstance(value, LanguageList) and all(isinstance(v, str) for v in value.values)):
+            if not (isinstance(value, LanguageList) and all(isinstance(v, str) for v in value)):
                 raise self.throw_wrong_type(token)
         elif ctype == CType.INT_ARRAY:
-            if not (isinstance(value, LanguageList) and all(can_convert_to_int(v) for v in value.values)):
+            if not (isinstance(value, LanguageList) and all(can_convert_to_int(v) for v in value)):
                 raise self.throw_wrong_type(token)
         elif ctype in (CType.DOUBLE_ARRAY, CType.FLOAT_ARRAY):
-            if not (isinstance(value, LanguageList) and all(isinstance(v, float) for v in value.values)):
+            if not (isinstance(value, LanguageList) and all(isinstance(v, float) for v in value)):
                 raise self.throw_wrong_type(token)
         elif ctype == CType.CHAR_ARRAY:
-            if not (isinstance(value, LanguageList) and all(isinstance(v, str) and len(v) == 1 for v in value.values)):
+            if not (isinstance(value, LanguageList) and all(isinstance(v, str) and len(v) == 1 for v in value)):
                 raise self.throw_wrong_type(token)
         elif ctype == CType.BOOL_ARRAY:
-            if not (isinstance(value, LanguageList) and all(isinstance(v, bool) for v in value.values)):
+            if not (isinstance(value, LanguageList) and all(isinstance(v, bool) for v in value)):
                 raise self.throw_wrong_type(token)
         elif ctype in (CType.VOID, CType.NONE):
             pass
         else:
             raise self.throw_wrong_type(token)
+        if isinstance(value, LanguageList):
+            value.retype(ctype)
 
     def throw_wrong_type(self, token):
         # self.error_handler.error_token(token=token, message="Value does not match variable's type")
         return RuntimeError(token=token, message="Value does not match variable's type")
 
+    def check_call(self, callee, arguments, paren):
+        if not isinstance(callee, LanguageCallable):
+            raise RuntimeError(paren, "Can only call functions and classes.")
+        if len(arguments) != callee.arity():
+            raise RuntimeError(paren, f"Expected {callee.arity()} arguments but got {len(arguments)}.")
+        if isinstance(callee, NativeFunction):
+            callee.check_arguments(arguments, paren)
+
+    def check_subscript(self, name, index, paren):
+        if not isinstance(name, LanguageList):
+            raise RuntimeError(paren, "Only lists can be subscripted.")
+
+        if not can_convert_to_int(index):
+            raise RuntimeError(paren, "Index should be of type int.")
+        return int(index)
+
+    def get_subscript(self, name, index, paren):
+        if index < 0 or index >= name.length():
+            raise RuntimeError(paren, "Index out of range.")
+        return name.get_ele_at(index)
+
+    def set_subscript(self, name, index, value, assign_type, paren):
+        previous_value = name.get_ele_at(index)
+        if not can_replace(previous_value, value):
+            raise RuntimeError(paren, "Unexpected assignment value type.")
+        new_value = self.handle_assigning(assign_type, paren, previous_value, value)
+        if name.set_at_index(index, new_value):
+            return new_value
+        raise RuntimeError(paren, "Index out of range.")
+
+    def lookup_method(self, obj, expr):
+        # None when obj is not an instance or the name is one of its fields; get_property covers both.
+        name = expr.name
+        if not isinstance(obj, LanguageInstance) or name.lexeme in obj.fields:
+            return None
+        # Monomorphic inline cache: while a site keeps seeing one class, the method table is skipped.
+        cache = expr.cache
+        if cache is None or cache[0] is not obj.cls:
+            cache = expr.cache = (obj.cls, obj.cls.find_method(name.lexeme))
+        if cache[1] is None:
+            raise RuntimeError(name, f"Undefined property '{name.lexeme}'.")
+        return cache[1]
+
+    def get_property(self, obj, expr):
+        method = self.lookup_method(obj, expr)
+        if method is not None:
+            return method.bind(instance=obj)
+        if not isinstance(obj, LanguageInstance):
+            raise RuntimeError(expr.name, "Only instances have properties.")
+        return obj.fields[expr.name.lexeme]
+
+    def invoke(self, obj, method, arguments, paren):
+        self.check_call(method, arguments, paren)
+        return method.invoke(self, obj, arguments)
+
+    def set_property(self, obj, name, value, assign_type):
+        previous_value = obj.get(name)
+        new_value = self.handle_assigning(assign_type, name, previous_value, value)
+        obj.set(name, new_value)
+        return value
+
+    def get_super(self, environment, distance, method_name):
+        superclass = environment.get_at(distance, 0)
+        instance = environment.get_at(distance - 1, 0)
+        method = superclass.find_method(method_name.lexeme)
+        if method is None:
+            raise RuntimeError(method_name, f"Undefined property '{method_name.lexeme}'.")
+        return method.bind(instance)
+
     def look_up_variable(self, name, expr):
-        if expr in self.locals:
-            distance = self.locals[expr]
-            return self.environment.get_at(distance, name.lexeme)
+        if expr.depth is not None:
+            return self.environment.get_at(expr.depth, expr.slot)
         return self.globals.get(name)
 
     def check_number_operand(self, operator, operand):
@@ -203,9 +369,9 @@ class Interpreter:
             return str(obj)
         if isinstance(obj, LanguageList):
             result = "["
-            for index, value in enumerate(obj.values):
+            for index, value in enumerate(obj):
                 result += self.stringify(value)
-                if index < len(obj.values) - 1:
+                if index < obj.length() - 1:
                     result += ", "
             result += "]"
             return result
@@ -223,47 +389,45 @@ class Interpreter:
 
     def visit_subscript_expr(self, expr):
         name = self.evaluate(expr.name)
-        index = self.evaluate(expr.index)
-        if not isinstance(name, LanguageList):
-            raise RuntimeError(expr.paren, "Only lists can be subscripted.")
-
-        if not can_convert_to_int(index):
-            raise RuntimeError(expr.paren, "Index should be of type int.")
-
-        index = int(index)
+        index = self.check_subscript(name, self.evaluate(expr.index), expr.paren)
         if expr.value is not None:
-            value = self.evaluate(expr.value)
-            previous_value = name.get_ele_at(index)
-            if not CustomAny.can_be_casted_to_same_type(value, previous_value) or (
-                    value is None and previous_value is None):
-                raise RuntimeError(expr.paren, "Unexpected assignment value type.")
-            new_value = self.handle_assigning(expr.type, expr.paren, previous_value, value)
-            if name.set_at_index(index, new_value):
-                return new_value
-            raise RuntimeError(expr.paren, "Index out of range.")
-        else:
-            if index < 0 or index >= name.length():
-                raise RuntimeError(expr.paren, "Index out of range.")
-            return name.get_ele_at(index)
+            return self.set_subscript(name, index, self.evaluate(expr.value), expr.type, expr.paren)
+        return self.get_subscript(name, index, expr.paren)
 
     def visit_assign_expr(self, expr):
         value = self.evaluate(expr.value)
-        variable = self.look_up_variable(expr.name, expr)
-        var_type = variable.type
-        previous_value = variable.item
-        new_value = self.handle_assigning(expr.type, expr.name, previous_value, value)
-        self.check_type(expr.name, var_type, value)
-        if expr in self.locals:
-            distance = self.locals[expr]
-            self.environment.assign_at(distance, expr.name, var_type, new_value)
+        if expr.depth is not None:
+            environment = self.environment.ancestor(expr.depth)
+            slot = expr.slot
+            var_type = environment.types[slot]
+            new_value = self.assign_value(expr, environment.values[slot], value)
+            if expr.needs_check:
+                self.check_type(expr.name, var_type, value)
+            environment.values[slot] = new_value
         else:
+            var_type = self.globals.get_type(expr.name)
+            new_value = self.assign_value(expr, self.globals.get(expr.name), value)
+            self.check_type(expr.name, var_type, value)
             self.globals.assign(expr.name, var_type, new_value)
         return new_value
 
+    def assign_value(self, expr, previous_value, value):
+        specialization = expr.specialization
+        if specialization is not None and previous_value.__class__ is value.__class__ is specialization.operand_class:
+            return specialization.operation(previous_value, value)
+        if expr.type != AssignType.ASSIGN and specialization is not GENERIC:
+            expr.specialization = respecialize(ASSIGN_SPECIALIZATIONS, specialization, expr.type, previous_value, value)
+        return self.handle_assigning(expr.type, expr.name, previous_value, value)
+
     def visit_binary_expr(self, expr):
         left = self.evaluate(expr.left)
         right = self.evaluate(expr.right)
 
+        # Operands of the classes the site was specialized for skip the generic checks below.
+        specialization = expr.specialization
+        if specialization is not None and left.__class__ is right.__class__ is specialization.operand_class:
+            return specialization.operation(left, right)
+
         operator_type = expr.operator.type
         if operator_type == TokenType.BANG_EQUAL:
             return not self.is_equal(left, right)
@@ -271,6 +435,8 @@ class Interpreter:
             return self.is_equal(left, right)
         elif operator_type in (TokenType.GREATER, TokenType.GREATER_EQUAL, TokenType.LESS, TokenType.LESS_EQUAL,
                                TokenType.MINUS, TokenType.PLUS, TokenType.SLASH, TokenType.STAR):
+            if specialization is not GENERIC:
+                expr.specialization = respecialize(BINARY_SPECIALIZATIONS, specialization, operator_type, left, right)
             self.check_number_operands(expr.operator, left, right)
             if operator_type == TokenType.GREATER:
                 return left > right
@@ -293,19 +459,21 @@ class Interpreter:
         return None
 
     def visit_call_expr(self, expr):
-        callee = self.evaluate(expr.callee)
+        if expr.callee.__class__ is Get:
+            # obj.method(...) runs against obj directly, without materializing a bound method first.
+            obj = self.evaluate(expr.callee.object)
+            method = self.lookup_method(obj, expr.callee)
+            if method is not None:
+                return self.invoke(obj, method, [self.evaluate(arg) for arg in expr.arguments], expr.paren)
+            callee = self.get_property(obj, expr.callee)
+        else:
+            callee = self.evaluate(expr.callee)
         arguments = [self.evaluate(arg) for arg in expr.arguments]
-        if not isinstance(callee, LanguageCallable):
-            raise RuntimeError(expr.paren, "Can only call functions and classes.")
-        if len(arguments) != callee.arity():
-            raise RuntimeError(expr.paren, f"Expected {callee.arity()} arguments but got {len(arguments)}.")
+        self.check_call(callee, arguments, expr.paren)
         return callee.call(self, arguments)
 
     def visit_get_expr(self, expr):
-        obj = self.evaluate(expr.object)
-        if isinstance(obj, LanguageInstance):
-            return obj.get(expr.name)
-        raise RuntimeError(expr.name, "Only instances have properties.")
+        return self.get_property(self.evaluate(expr.object), expr)
 
     def visit_grouping_expr(self, expr):
         return self.evaluate(expr.expression)
@@ -327,23 +495,13 @@ class Interpreter:
         obj = self.evaluate(expr.object)
         if not isinstance(obj, LanguageInstance):
             raise RuntimeError(expr.name, "Only instances have fields.")
-        value = self.evaluate(expr.value)
-        previous_value = obj.get(expr.name)
-        new_value = self.handle_assigning(expr.type, expr.name, previous_value, value)
-        obj.set(expr.name, new_value)
-        return value
+        return self.set_property(obj, expr.name, self.evaluate(expr.value), expr.type)
 
     def visit_super_expr(self, expr):
-        distance = self.locals[expr]
-        superclass = self.environment.get_at(distance, "super").item
-        instance = self.environment.get_at(distance - 1, "this").item
-        method = superclass.find_method(expr.method.lexeme)
-        if method is None:
-            raise RuntimeError(expr.method, f"Undefined property '{expr.method.lexeme}'.")
-        return method.bind(instance)
+        return self.get_super(self.environment, expr.depth, expr.method)
 
     def visit_this_expr(self, expr):
-        return self.look_up_variable(expr.keyword, expr).item
+        return self.look_up_variable(expr.keyword, expr)
 
     def visit_unary_expr(self, expr):
         right = self.evaluate(expr.right)
@@ -356,7 +514,7 @@ class Interpreter:
             return None
 
     def visit_variable_expr(self, expr):
-        value = self.look_up_variable(expr.name, expr).item
+        value = self.look_up_variable(expr.name, expr)
         if value is None:
             raise RuntimeError(expr.name, "Variable not initialized.")
         return value
@@ -368,18 +526,25 @@ class Interpreter:
         value = None
         if stmt.initializer is not None:
             value = self.evaluate(stmt.initializer)
-            self.check_type(stmt.name, stmt.type, value)
+            if stmt.needs_check:
+                self.check_type(stmt.name, stmt.type, value)
         self.environment.define(stmt.name.lexeme, stmt.type, value)
 
     def visit_while_stmt(self, stmt):
         while self.is_truthy(self.evaluate(stmt.condition)):
-            self.execute(stmt.body)
+            self.steps_left -= 1
+            if self.steps_left < 0:
+                self.refill_steps(stmt.keyword)
+            completion = self.execute(stmt.body)
+            if completion is not None:
+                return completion
 
     def visit_block_stmt(self, stmt):
-        self.execute_block(stmt.statements, Environment(enclosing=self.environment))
+        return self.execute_block(stmt.statements, Environment(enclosing=self.environment))
 
     def visit_class_stmt(self, stmt):
-        self.environment.define(stmt.name.lexeme, TokenType.NONE, None)
+        environment = self.environment
+        key = environment.define(stmt.name.lexeme, TokenType.NONE, None)
 
         superclass = None
         if stmt.superclass is not None:
@@ -394,7 +559,7 @@ class Interpreter:
             function = LanguageFunction(method, self.environment, is_initializer=(method.name.lexeme == "init"))
             methods[method.name.lexeme] = function
         klass = LanguageClass(stmt.name.lexeme, superclass, methods)
-        self.environment.assign(stmt.name, TokenType.NONE, klass)
+        environment.set(key, TokenType.NONE, klass)
         if stmt.superclass is not None:
             self.environment = self.environment.enclosing
 
@@ -407,17 +572,17 @@ class Interpreter:
 
     def visit_if_stmt(self, stmt):
         if self.is_truthy(self.evaluate(stmt.condition)):
-            self.execute(stmt.then_branch)
+            return self.execute(stmt.then_branch)
         elif stmt.else_branch is not None:
-            self.execute(stmt.else_branch)
+            return self.execute(stmt.else_branch)
 
     def visit_print_stmt(self, stmt):
         value = self.evaluate(stmt.expression)
         if self.is_printable:
-            print(self.stringify(value))
+            self.write_line(self.stringify(value))
 
     def visit_return_stmt(self, stmt):
         value = None
         if stmt.value is not None:
             value = self.evaluate(stmt.value)
-        raise ReturnException(value)
+        return (value,)
@@ -0,0 +1,229 @@
+import operator
+
+from Token.token_type import TokenType
+from Ast.Nodes.statement import *
+
+FOLDABLE_OPERATORS = {
+    TokenType.PLUS: operator.add,
+    TokenType.MINUS: operator.sub,
+    TokenType.STAR: operator.mul,
+    TokenType.SLASH: operator.truediv,
+    TokenType.GREATER: operator.gt,
+    TokenType.GREATER_EQUAL: operator.ge,
+    TokenType.LESS: operator.lt,
+    TokenType.LESS_EQUAL: operator.le,
+}
+
+
+def are_numbers(left, right):
+    return (isinstance(left, int) and isinstance(right, int)) or (isinstance(left, float) and isinstance(right, float))
+
+
+def is_declaration(stmt):
+    return isinstance(stmt, (Var, Function, Class))
+
+
+def resolved_like(node, original):
+    node.depth = original.depth
+    node.slot = original.slot
+    return node
+
+
+# Folds constant expressions and prunes branches whose condition is a literal. Nodes are never
+# mutated: changed subtrees are rebuilt, so the original AST stays valid for printing and caching.
+# Anything that would raise at run time, such as a type error or a division by zero, is left alone.
+class Optimizer:
+    def __init__(self, interpreter):
+        self.interpreter = interpreter
+
+    def optimize(self, statements):
+        optimized = []
+        for statement in statements:
+            statement = self.optimize_stmt(statement)
+            if statement is not None:
+                optimized.append(statement)
+        return optimized
+
+    def optimize_stmt(self, stmt):
+        return stmt.accept(visitor=self)
+
+    def optimize_expr(self, expr):
+        return expr.accept(visitor=self)
+
+    def optimize_branch(self, stmt):
+        optimized = self.optimize_stmt(stmt)
+        return optimized if optimized is not None else Block(statements=[])
+
+    # ----------------------------
+    # ExprVisitor
+    # ----------------------------
+
+    def visit_list_expr(self, expr):
+        values = [self.optimize_expr(value) for value in expr.values]
+        if all(new is old for new, old in zip(values, expr.values)):
+            return expr
+        return List(values=values)
+
+    def visit_subscript_expr(self, expr):
+        name = self.optimize_expr(expr.name)
+        index = self.optimize_expr(expr.index)
+        value = self.optimize_expr(expr.value) if expr.value is not None else None
+        if name is expr.name and index is expr.index and value is expr.value:
+            return expr
+        return Subscript(name=name, index=index, value=value, paren=expr.paren, type=expr.type)
+
+    def visit_assign_expr(self, expr):
+        value = self.optimize_expr(expr.value)
+        if value is expr.value:
+            return expr
+        return resolved_like(Assign(name=expr.name, value=value, type=expr.type), expr)
+
+    def visit_binary_expr(self, expr):
+        left = self.optimize_expr(expr.left)
+        right = self.optimize_expr(expr.right)
+        if isinstance(left, Literal) and isinstance(right, Literal):
+            operator_type = expr.operator.type
+            if operator_type == TokenType.EQUAL_EQUAL:
+                return Literal(value=self.interpreter.is_equal(left.value, right.value))
+            if operator_type == TokenType.BANG_EQUAL:
+                return Literal(value=not self.interpreter.is_equal(left.value, right.value))
+            if operator_type in FOLDABLE_OPERATORS and are_numbers(left.value, right.value):
+                if not (operator_type == TokenType.SLASH and right.value == 0):
+                    return Literal(value=FOLDABLE_OPERATORS[operator_type](left.value, right.value))
+        if left is expr.left and right is expr.right:
+            return expr
+        return Binary(left=left, operator=expr.operator, right=right)
+
+    def visit_call_expr(self, expr):
+        callee = self.optimize_expr(expr.callee)
+        arguments = [self.optimize_expr(argument) for argument in expr.arguments]
+        if callee is expr.callee and all(new is old for new, old in zip(arguments, expr.arguments)):
+            return expr
+        return Call(callee=callee, paren=expr.paren, arguments=arguments)
+
+    def visit_get_expr(self, expr):
+        obj = self.optimize_expr(expr.object)
+        if obj is expr.object:
+            return expr
+        return Get(object=obj, name=expr.name)
+
+    def visit_grouping_expr(self, expr):
+        return self.optimize_expr(expr.expression)
+
+    def visit_literal_expr(self, expr):
+        return expr
+
+    def visit_logical_expr(self, expr):
+        left = self.optimize_expr(expr.left)
+        right = self.optimize_expr(expr.right)
+        if isinstance(left, Literal):
+            is_truthy = self.interpreter.is_truthy(left.value)
+            if expr.operator.type == TokenType.OR:
+                return left if is_truthy else right
+            return right if is_truthy else left
+        if left is expr.left and right is expr.right:
+            return expr
+        return Logical(left=left, operator=expr.operator, right=right)
+
+    def visit_set_expr(self, expr):
+        obj = self.optimize_expr(expr.object)
+        value = self.optimize_expr(expr.value)
+        if obj is expr.object and value is expr.value:
+            return expr
+        return Set(object=obj, name=expr.name, value=value, type=expr.type)
+
+    def visit_super_expr(self, expr):
+        return expr
+
+    def visit_this_expr(self, expr):
+        return expr
+
+    def visit_unary_expr(self, expr):
+        right = self.optimize_expr(expr.right)
+        if isinstance(right, Literal):
+            if expr.operator.type == TokenType.BANG:
+                return Literal(value=not self.interpreter.is_truthy(right.value))
+            if expr.operator.type == TokenType.MINUS and isinstance(right.value, (int, float)):
+                return Literal(value=-right.value)
+        if right is expr.right:
+            return expr
+        return Unary(operator=expr.operator, right=right)
+
+    def visit_variable_expr(self, expr):
+        return expr
+
+    # ----------------------------
+    # StmtVisitor
+    # ----------------------------
+
+    def visit_var_stmt(self, stmt):
+        if stmt.initializer is None:
+            return stmt
+        initializer = self.optimize_expr(stmt.initializer)
+        if initializer is stmt.initializer:
+            return stmt
+        return Var(name=stmt.name, type=stmt.type, initializer=initializer)
+
+    def visit_while_stmt(self, stmt):
+        condition = self.optimize_expr(stmt.condition)
+        # A bare declaration still owns a slot in the enclosing scope, so it is never pruned.
+        if isinstance(condition, Literal) and not self.interpreter.is_truthy(condition.value) \
+                and not is_declaration(stmt.body):
+            return None
+        body = self.optimize_branch(stmt.body)
+        if condition is stmt.condition and body is stmt.body:
+            return stmt
+        return While(keyword=stmt.keyword, condition=condition, body=body)
+
+    def visit_block_stmt(self, stmt):
+        statements = self.optimize(stmt.statements)
+        if len(statements) == len(stmt.statements) and all(new is old for new, old in zip(statements, stmt.statements)):
+            return stmt
+        return Block(statements=statements)
+
+    def visit_class_stmt(self, stmt):
+        methods = [self.optimize_stmt(method) for method in stmt.methods]
+        if all(new is old for new, old in zip(methods, stmt.methods)):
+            return stmt
+        return Class(name=stmt.name, superclass=stmt.superclass, methods=methods)
+
+    def visit_expression_stmt(self, stmt):
+        expression = self.optimize_expr(stmt.expression)
+        if expression is stmt.expression:
+            return stmt
+        return Expression(expression=expression)
+
+    def visit_function_stmt(self, stmt):
+        body = self.optimize(stmt.body)
+        if len(body) == len(stmt.body) and all(new is old for new, old in zip(body, stmt.body)):
+            return stmt
+        return Function(name=stmt.name, params=stmt.params, body=body, type=stmt.type)
+
+    def visit_if_stmt(self, stmt):
+        condition = self.optimize_expr(stmt.condition)
+        if isinstance(condition, Literal):
+            taken, skipped = stmt.then_branch, stmt.else_branch
+            if not self.interpreter.is_truthy(condition.value):
+                taken, skipped = skipped, taken
+            if not is_declaration(skipped) and not is_declaration(taken):
+                return self.optimize_stmt(taken) if taken is not None else None
+
+        then_branch = self.optimize_branch(stmt.then_branch)
+        else_branch = self.optimize_branch(stmt.else_branch) if stmt.else_branch is not None else None
+        if condition is stmt.condition and then_branch is stmt.then_branch and else_branch is stmt.else_branch:
+            return stmt
+        return If(condition=condition, then_branch=then_branch, else_branch=else_branch)
+
+    def visit_print_stmt(self, stmt):
+        expression = self.optimize_expr(stmt.expression)
+        if expression is stmt.expression:
+            return stmt
+        return Print(expression=expression)
+
+    def visit_return_stmt(self, stmt):
+        if stmt.value is None:
+            return stmt
+        value = self.optimize_expr(stmt.value)
+        if value is stmt.value:
+            return stmt
+        return Return(keyword=stmt.keyword, value=value)
@@ -0,0 +1,70 @@
+import math
+import sys
+
+DEFAULT_BUFFER_SIZE = 64 * 1024
+
+# When buffered text reaches the stream: after every write, once buffer_size characters are pending,
+# or only when the run ends.
+FLUSH_LINE = "line"
+FLUSH_BLOCK = "block"
+FLUSH_END = "end"
+
+
+# Collects WriteLine output and error messages, and hands them to the stream in a few large writes.
+# A None stream means whatever sys.stdout is at flush time, so contextlib.redirect_stdout keeps working.
+# The sink is also file-like, so print(..., file=sink) goes through the same buffer in order.
+class OutputSink:
+    def __init__(self, stream=None, flush_policy=FLUSH_BLOCK, buffer_size=DEFAULT_BUFFER_SIZE):
+        if flush_policy == FLUSH_LINE:
+            self.limit = 0
+        elif flush_policy == FLUSH_BLOCK:
+            self.limit = buffer_size
+        elif flush_policy == FLUSH_END:
+            self.limit = math.inf
+        else:
+            raise ValueError(f"Unknown flush policy '{flush_policy}'.")
+        self.stream = stream
+        self.flush_policy = flush_policy
+        self.pieces = []
+        self.size = 0
+
+    def write_line(self, text):
+        self.pieces.append(text)
+        self.pieces.append("\n")
+        self.size += len(text) + 1
+        if self.size >= self.limit:
+            self.flush()
+
+    def write(self, text):
+        self.pieces.append(text)
+        self.size += len(text)
+        if self.size >= self.limit:
+            self.flush()
+        return len(text)
+
+    def flush(self):
+        if not self.pieces:
+            return
+        text = "".join(self.pieces)
+        self.pieces.clear()
+        self.size = 0
+        stream = self.stream if self.stream is not None else sys.stdout
+        stream.write(text)
+        if self.flush_policy == FLUSH_LINE:
+            stream.flush()
+
+
+# Keeps everything in memory instead of writing it anywhere.
+class CaptureSink(OutputSink):
+    def __init__(self):
+        super().__init__(flush_policy=FLUSH_END)
+
+    def flush(self):
+        pass
+
+    def getvalue(self):
+        return "".join(self.pieces)
+
+    def clear(self):
+        self.pieces.clear()
+        self.size = 0
@@ -1,6 +1,3 @@
-from Runtime.Language_.error_handler import ErrorHandler
-
-
 class Resolver:
     class FunctionType:
         NONE = "none"
@@ -13,20 +10,39 @@ class Resolver:
         CLASS = "class"
         SUBCLASS = "subclass"
 
-    def __init__(self, interpreter):
+    def __init__(self, interpreter, redeclare_globals=False):
         self.interpreter = interpreter
+        self.error_handler = interpreter.error_handler
+        # Lets a top-level name be declared again, as later inputs of a REPL session do.
+        self.redeclare_globals = redeclare_globals
         self.scopes = [{}]
         self.current_function = Resolver.FunctionType.NONE
         self.current_class = Resolver.ClassType.NONE
         self.identifiers = [{}]
+        self.slots = [{}]
+        self.slot_counts = [0]
+        # (expr, name) for every expression resolved to a top-level slot, which belongs to the running interpreter.
+        self.global_references = []
 
     def begin_scope(self):
         self.identifiers.append({})
         self.scopes.append({})
+        self.slots.append({})
+        self.slot_counts.append(0)
 
     def end_scope(self):
         self.identifiers.pop()
         self.scopes.pop()
+        self.slots.pop()
+        self.slot_counts.pop()
+
+    def add_slot(self, name):
+        if len(self.scopes) == 1:
+            # Top-level slots belong to the interpreter's globals so they survive across runs.
+            self.slots[-1][name] = self.interpreter.globals.reserve(name)
+            return
+        self.slots[-1][name] = self.slot_counts[-1]
+        self.slot_counts[-1] += 1
 
     def declare(self, name):
         if not self.scopes or not self.identifiers:
@@ -35,11 +51,12 @@ class Resolver:
         current_scope = self.scopes[-1]
         current_block = self.identifiers[-1]
 
-        if name.lexeme in current_scope:
-            ErrorHandler.error_token(self, token=name, message="Already a variable with this name in this scope.")
+        if name.lexeme in current_scope and not (self.redeclare_globals and len(self.scopes) == 1):
+            self.error_handler.error_token(token=name, message="Already a variable with this name in this scope.")
 
         current_block[name] = 0
         current_scope[name.lexeme] = False
+        self.add_slot(name.lexeme)
 
         self.identifiers[-1] = current_block
         self.scopes[-1] = current_scope
@@ -57,7 +74,9 @@ class Resolver:
         for i, scope in reversed(list(enumerate(self.scopes))):
             if name.lexeme in scope:
                 self.identifiers[i].pop(name, None)
-                self.interpreter.resolve(expr=expr, depth=len(self.scopes) - 1 - i)
+                self.interpreter.resolve(expr=expr, depth=len(self.scopes) - 1 - i, slot=self.slots[i][name.lexeme])
+                if i == 0:
+                    self.global_references.append((expr, name.lexeme))
                 return
 
     def resolve_stmt(self, stmt):
@@ -94,14 +113,17 @@ class Resolver:
 
         if stmt.superclass:
             if stmt.name.lexeme == stmt.superclass.name.lexeme:
-                ErrorHandler.error_token(self, token=stmt.superclass.name, message="A class can't inherit from itself.")
+                self.error_handler.error_token(token=stmt.superclass.name, message="A class can't inherit from itself.")
             self.current_class = Resolver.ClassType.SUBCLASS
             self.resolve_expr(stmt.superclass)
 
             self.begin_scope()
             self.scopes[-1]["base"] = True
+            self.add_slot("base")
 
         self.begin_scope()
+        self.scopes[-1]["this"] = True
+        self.add_slot("this")
 
         for method in stmt.methods:
             declaration = Resolver.FunctionType.INITIALIZER if method.name.lexeme == "init" else Resolver.FunctionType.METHOD
@@ -133,11 +155,11 @@ class Resolver:
 
     def visit_return_stmt(self, stmt):
         if self.current_function == Resolver.FunctionType.NONE:
-            ErrorHandler.error_token(self, token=stmt.keyword, message="Can't return from top-level code.")
+            self.error_handler.error_token(token=stmt.keyword, message="Can't return from top-level code.")
 
         if stmt.value:
             if self.current_function == Resolver.FunctionType.INITIALIZER:
-                ErrorHandler.error_token(self, token=stmt.keyword, message="Can't return a value from an initializer.")
+                self.error_handler.error_token(token=stmt.keyword, message="Can't return a value from an initializer.")
             self.resolve_expr(stmt.value)
 
     def visit_var_stmt(self, stmt):
@@ -194,15 +216,15 @@ class Resolver:
 
     def visit_super_expr(self, expr):
         if self.current_class == Resolver.ClassType.NONE:
-            ErrorHandler.error_token(self, token=expr.keyword, message="Can't use 'super' outside of a class.")
+            self.error_handler.error_token(token=expr.keyword, message="Can't use 'super' outside of a class.")
         elif self.current_class != Resolver.ClassType.SUBCLASS:
-            ErrorHandler.error_token(self, token=expr.keyword,
-                                     message="Can't use 'super' in a class with no superclass.")
+            self.error_handler.error_token(token=expr.keyword,
+                                           message="Can't use 'super' in a class with no superclass.")
         self.resolve_local(expr, name=expr.keyword)
 
     def visit_this_expr(self, expr):
         if self.current_class == Resolver.ClassType.NONE:
-            ErrorHandler.error_token(self, token=expr.keyword, message="Can't use 'this' outside of a class.")
+            self.error_handler.error_token(token=expr.keyword, message="Can't use 'this' outside of a class.")
             return
         self.resolve_local(expr, name=expr.keyword)
 
@@ -211,6 +233,6 @@ class Resolver:
 
     def visit_variable_expr(self, expr):
         if expr.name.lexeme in self.scopes[-1] and not self.scopes[-1][expr.name.lexeme]:
-            ErrorHandler.error_token(self, token=expr.name, message="Can't read local variable in its own initializer.")
+            self.error_handler.error_token(token=expr.name, message="Can't read local variable in its own initializer.")
             return
         self.resolve_local(expr, name=expr.name)
@@ -1,3 +0,0 @@
-class ReturnException(Exception):
-    def __init__(self, value):
-        self.value = value
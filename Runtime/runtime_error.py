@@ -2,3 +2,19 @@ class RuntimeError(Exception):
     def __init__(self, token, message):
         self.token = token
         self.message = message
+
+
+# Errors that end the whole run. Unlike other errors inside a function body, they are not turned
+# into nil by the caller, so they always reach the top level.
+class AbortError(RuntimeError):
+    pass
+
+
+# Raised once Interpreter.max_call_depth is exceeded.
+class StackOverflowError(AbortError):
+    pass
+
+
+# Raised once a run uses up its step budget or passes its deadline, or is interrupted from another thread.
+class LimitError(AbortError):
+    pass
@@ -0,0 +1,67 @@
+import operator
+
+from Token.token_type import TokenType
+from Runtime.Language_.assign_type import AssignType
+
+
+# An operation on two operands of one exact class, which skips every generic type check.
+class Specialization:
+    __slots__ = ("name", "operand_class", "operation")
+
+    def __init__(self, name, operand_class, operation):
+        self.name = name
+        self.operand_class = operand_class
+        self.operation = operation
+
+    def __repr__(self):
+        return self.name
+
+
+OPERATIONS = {
+    TokenType.PLUS: ("Add", operator.add),
+    TokenType.MINUS: ("Sub", operator.sub),
+    TokenType.STAR: ("Mul", operator.mul),
+    TokenType.SLASH: ("Div", operator.truediv),
+    TokenType.GREATER: ("GreaterThan", operator.gt),
+    TokenType.GREATER_EQUAL: ("GreaterEqual", operator.ge),
+    TokenType.LESS: ("LessThan", operator.lt),
+    TokenType.LESS_EQUAL: ("LessEqual", operator.le),
+}
+
+# IntAdd, FloatMul, IntLessThan and the rest, by operator and operand class.
+BINARY_SPECIALIZATIONS = {
+    (operator_type, operand_class): Specialization(prefix + name, operand_class, operation)
+    for prefix, operand_class in (("Int", int), ("Float", float))
+    for operator_type, (name, operation) in OPERATIONS.items()
+}
+
+STR_CONCAT = Specialization("StrConcat", str, operator.add)
+
+# Compound assignments. Only += joins strings; a binary + on two strings is an error.
+ASSIGN_SPECIALIZATIONS = {
+    (assign_type, operand_class): BINARY_SPECIALIZATIONS[operator_type, operand_class]
+    for assign_type, operator_type in ((AssignType.PLUS_ASSIGN, TokenType.PLUS), (AssignType.MINUS_ASSIGN, TokenType.MINUS),
+                                       (AssignType.STAR_ASSIGN, TokenType.STAR), (AssignType.SLASH_ASSIGN, TokenType.SLASH))
+    for operand_class in (int, float)
+}
+ASSIGN_SPECIALIZATIONS[AssignType.PLUS_ASSIGN, str] = STR_CONCAT
+
+# A site whose operands stopped matching its specialization. Its operand class matches no value, so
+# the tree walker always takes the generic path there; see guard_class for the compiled engines.
+GENERIC = Specialization("Generic", None, None)
+
+
+# Called when a site's operands don't match its specialization. A site nobody specialized yet takes
+# the classes it sees first; a specialized one has seen two kinds of operand and goes generic for good.
+def respecialize(specializations, specialization, key, left, right):
+    if specialization is None and left.__class__ is right.__class__:
+        return specializations.get((key, left.__class__), GENERIC)
+    return GENERIC
+
+
+def guard_class(specialization):
+    # The class compiled code tests for before taking its fast path. Generic and unspecialized sites
+    # keep only the int guard the compiled engines always had, since it still tests the operands.
+    if specialization is None or specialization.operand_class is None:
+        return int
+    return specialization.operand_class
@@ -0,0 +1,304 @@
+from Token.token_type import TokenType
+from Ast.Nodes.statement import *
+from Runtime.Language_.assign_type import AssignType
+from Runtime.specialization import BINARY_SPECIALIZATIONS, ASSIGN_SPECIALIZATIONS
+
+SCALAR_TYPES = (CType.INT, CType.FLOAT, CType.STRING, CType.CHAR, CType.BOOL)
+
+# For each declared type, the static types whose values always pass Interpreter.check_type for it.
+# Array types are never listed: the check also retypes the list it is given.
+ACCEPTED_TYPES = {
+    CType.INT: (CType.INT, CType.BOOL),
+    CType.FLOAT: (CType.FLOAT,),
+    CType.DOUBLE: (CType.FLOAT,),
+    CType.STRING: (CType.STRING, CType.CHAR),
+    CType.CHAR: (CType.CHAR,),
+    CType.BOOL: (CType.BOOL,),
+    CType.VOID: SCALAR_TYPES,
+    CType.NONE: SCALAR_TYPES,
+}
+
+# The static type of a variable read, by declared type. A char variable can grow with +=.
+READ_TYPES = {
+    CType.INT: CType.INT,
+    CType.FLOAT: CType.FLOAT,
+    CType.DOUBLE: CType.FLOAT,
+    CType.STRING: CType.STRING,
+    CType.CHAR: CType.STRING,
+    CType.BOOL: CType.BOOL,
+}
+
+COMPARISON_OPERATORS = (TokenType.GREATER, TokenType.GREATER_EQUAL, TokenType.LESS, TokenType.LESS_EQUAL,
+                        TokenType.BANG_EQUAL)
+
+ASSIGN_OPERATORS = {
+    AssignType.PLUS_ASSIGN: TokenType.PLUS,
+    AssignType.MINUS_ASSIGN: TokenType.MINUS,
+    AssignType.STAR_ASSIGN: TokenType.STAR,
+    AssignType.SLASH_ASSIGN: TokenType.SLASH,
+}
+
+# The Python class a value of each static type most likely has. Only a likely one: an int variable can
+# hold a bool, so the specializations seeded from these still check their operands.
+VALUE_CLASSES = {
+    CType.INT: int,
+    CType.FLOAT: float,
+    CType.STRING: str,
+    CType.CHAR: str,
+}
+
+
+def proves(static_type, declared_type):
+    return static_type is not None and static_type in ACCEPTED_TYPES.get(declared_type, ())
+
+
+def literal_type(value):
+    if isinstance(value, bool):
+        return CType.BOOL
+    if isinstance(value, int):
+        return CType.INT
+    if isinstance(value, float):
+        return CType.FLOAT
+    if isinstance(value, str):
+        return CType.CHAR if len(value) == 1 else CType.STRING
+    return None
+
+
+def changes_type(declaration, assign_type):
+    # Whether a compound assignment can leave a value of another type in the declared variable.
+    if declaration.type == CType.BOOL:
+        return True
+    return declaration.type == CType.INT and assign_type == AssignType.SLASH_ASSIGN
+
+
+def static_specialization(specializations, key, left, right):
+    value_class = VALUE_CLASSES.get(left)
+    if value_class is None or value_class is not VALUE_CLASSES.get(right):
+        return None
+    return specializations.get((key, value_class))
+
+
+def arithmetic_type(operator_type, left, right):
+    # Operators that get this far have checked for two ints or two floats, so int and float never mix.
+    if left not in (CType.INT, CType.FLOAT, CType.BOOL) or right not in (CType.INT, CType.FLOAT, CType.BOOL):
+        return None
+    if operator_type == TokenType.SLASH or CType.FLOAT in (left, right):
+        return CType.FLOAT
+    return CType.INT
+
+
+# Infers a static type for expressions over the resolved AST and clears needs_check on every Var and
+# Assign whose runtime type check can never fail. Binary and compound Assign nodes are also seeded with
+# the specialization their operand types predict. A static type means every value the expression can
+# produce passes Interpreter.check_type for it; None means nothing is known. Only variables declared
+# in the checked statements are typed. Parameters are never checked on entry, and inside a function a
+# top-level name may belong to a later redeclaration. An int variable that sees /=, or a bool variable
+# that sees any compound assignment, can end up holding a float, so those are not typed either.
+class TypeChecker:
+    def __init__(self, interpreter):
+        self.interpreter = interpreter
+        self.scopes = [{}]
+        self.function_depth = 0
+        self.unstable = set()
+
+    def check(self, statements):
+        # The first walk finds every unstable declaration, including those changed later in the source;
+        # the second settles the types with all of them known.
+        for _ in range(2):
+            self.scopes = [{}]
+            for statement in statements:
+                self.check_stmt(statement)
+
+    def check_stmt(self, stmt):
+        stmt.accept(visitor=self)
+
+    def check_expr(self, expr):
+        return expr.accept(visitor=self)
+
+    def check_function(self, function):
+        self.function_depth += 1
+        # Parameters shadow outer names but carry no type.
+        self.scopes.append({param.name.lexeme: None for param in function.params})
+        for statement in function.body:
+            self.check_stmt(statement)
+        self.scopes.pop()
+        self.function_depth -= 1
+
+    def find(self, name):
+        # The declaration the name refers to, and whether its type can be relied on here.
+        for depth in range(len(self.scopes) - 1, -1, -1):
+            scope = self.scopes[depth]
+            if name.lexeme in scope:
+                declaration = scope[name.lexeme]
+                if declaration is None:
+                    return None, False
+                if depth == 0:
+                    assign_types = self.interpreter.compound_assigned_names.get(name.lexeme, ())
+                    trusted = not self.function_depth and \
+                              not any(changes_type(declaration, assign_type) for assign_type in assign_types)
+                else:
+                    trusted = True
+                return declaration, trusted
+        return None, False
+
+    def is_top_level(self, name):
+        # True for names declared at the top level, and for names not declared in the checked statements.
+        return not any(name.lexeme in scope for scope in self.scopes[1:])
+
+    def read_type(self, declaration):
+        if declaration in self.unstable:
+            return None
+        return READ_TYPES.get(declaration.type)
+
+    def mark_unstable(self, expr, declaration):
+        if expr.type == AssignType.ASSIGN:
+            return
+        if self.is_top_level(expr.name):
+            # A top-level name keeps its slot when a later run declares it again, and this assignment
+            # then updates the new declaration; see find.
+            self.interpreter.compound_assigned_names.setdefault(expr.name.lexeme, set()).add(expr.type)
+        if declaration is not None and changes_type(declaration, expr.type):
+            self.unstable.add(declaration)
+
+    # ----------------------------
+    # ExprVisitor
+    # ----------------------------
+
+    def visit_list_expr(self, expr):
+        for value in expr.values:
+            self.check_expr(value)
+        return None
+
+    def visit_subscript_expr(self, expr):
+        self.check_expr(expr.name)
+        self.check_expr(expr.index)
+        if expr.value is not None:
+            self.check_expr(expr.value)
+        return None
+
+    def visit_assign_expr(self, expr):
+        value_type = self.check_expr(expr.value)
+        declaration, trusted = self.find(expr.name)
+        self.mark_unstable(expr, declaration)
+        expr.needs_check = not (trusted and proves(value_type, declaration.type))
+        expr.specialization = None
+        if expr.type == AssignType.ASSIGN:
+            expr.ctype = value_type
+        elif trusted:
+            read_type = self.read_type(declaration)
+            expr.ctype = arithmetic_type(ASSIGN_OPERATORS[expr.type], read_type, value_type)
+            expr.specialization = static_specialization(ASSIGN_SPECIALIZATIONS, expr.type, read_type, value_type)
+        else:
+            expr.ctype = None
+        return expr.ctype
+
+    def visit_binary_expr(self, expr):
+        left = self.check_expr(expr.left)
+        right = self.check_expr(expr.right)
+        operator_type = expr.operator.type
+        if operator_type in COMPARISON_OPERATORS:
+            expr.ctype = CType.BOOL
+        elif operator_type == TokenType.EQUAL_EQUAL:
+            # == on instances and lists goes through their own __eq__.
+            expr.ctype = CType.BOOL if left in SCALAR_TYPES and right in SCALAR_TYPES else None
+        else:
+            expr.ctype = arithmetic_type(operator_type, left, right)
+        expr.specialization = static_specialization(BINARY_SPECIALIZATIONS, operator_type, left, right)
+        return expr.ctype
+
+    def visit_call_expr(self, expr):
+        self.check_expr(expr.callee)
+        for argument in expr.arguments:
+            self.check_expr(argument)
+        return None
+
+    def visit_get_expr(self, expr):
+        self.check_expr(expr.object)
+        return None
+
+    def visit_grouping_expr(self, expr):
+        expr.ctype = self.check_expr(expr.expression)
+        return expr.ctype
+
+    def visit_literal_expr(self, expr):
+        expr.ctype = literal_type(expr.value)
+        return expr.ctype
+
+    def visit_logical_expr(self, expr):
+        # The result is one of the operands, unchanged.
+        left = self.check_expr(expr.left)
+        right = self.check_expr(expr.right)
+        expr.ctype = left if left == right else None
+        return expr.ctype
+
+    def visit_set_expr(self, expr):
+        self.check_expr(expr.value)
+        self.check_expr(expr.object)
+        return None
+
+    def visit_super_expr(self, expr):
+        return None
+
+    def visit_this_expr(self, expr):
+        return None
+
+    def visit_unary_expr(self, expr):
+        right = self.check_expr(expr.right)
+        if expr.operator.type == TokenType.BANG:
+            expr.ctype = CType.BOOL
+        elif expr.operator.type == TokenType.MINUS:
+            expr.ctype = arithmetic_type(TokenType.MINUS, right, right)
+        else:
+            expr.ctype = None
+        return expr.ctype
+
+    def visit_variable_expr(self, expr):
+        declaration, trusted = self.find(expr.name)
+        expr.ctype = self.read_type(declaration) if trusted else None
+        return expr.ctype
+
+    # ----------------------------
+    # StmtVisitor
+    # ----------------------------
+
+    def visit_block_stmt(self, stmt):
+        self.scopes.append({})
+        for statement in stmt.statements:
+            self.check_stmt(statement)
+        self.scopes.pop()
+
+    def visit_class_stmt(self, stmt):
+        self.scopes[-1][stmt.name.lexeme] = None
+        if stmt.superclass is not None:
+            self.check_expr(stmt.superclass)
+        for method in stmt.methods:
+            self.check_function(method)
+
+    def visit_expression_stmt(self, stmt):
+        self.check_expr(stmt.expression)
+
+    def visit_function_stmt(self, stmt):
+        self.scopes[-1][stmt.name.lexeme] = None
+        self.check_function(stmt)
+
+    def visit_if_stmt(self, stmt):
+        self.check_expr(stmt.condition)
+        self.check_stmt(stmt.then_branch)
+        if stmt.else_branch is not None:
+            self.check_stmt(stmt.else_branch)
+
+    def visit_print_stmt(self, stmt):
+        self.check_expr(stmt.expression)
+
+    def visit_return_stmt(self, stmt):
+        if stmt.value is not None:
+            self.check_expr(stmt.value)
+
+    def visit_var_stmt(self, stmt):
+        if stmt.initializer is not None:
+            stmt.needs_check = not proves(self.check_expr(stmt.initializer), stmt.type)
+        self.scopes[-1][stmt.name.lexeme] = stmt
+
+    def visit_while_stmt(self, stmt):
+        self.check_expr(stmt.condition)
+        self.check_stmt(stmt.body)
@@ -18,19 +18,20 @@ class Parser:
 
     def parse(self):
         statements = []
-        iteration_count = 0  # Add this line to count the number of iterations
-
+        # Every declaration consumes at least one token, even one that fails, so this always ends.
         while not self.is_at_end():
-            if iteration_count >= 100:  # Add this line as a safeguard to prevent infinite loop
-                break
-
             declaration = self.declaration()
-            iteration_count += 1  # Add this line to increment the iteration count
-
             if declaration is not None:
                 statements.append(declaration)
         return statements
 
+    def parse_stream(self):
+        # Yields top-level declarations as soon as they are parsed, for use with a TokenStream.
+        while not self.is_at_end():
+            declaration = self.declaration()
+            if declaration is not None:
+                yield declaration
+
     def check_type(self, type_token_string):
         type_token_string = type_token_string
         saved_position = self.current
@@ -41,11 +42,12 @@ class Parser:
             self.current = saved_position
         return type_token_string
 
+    # match and check read the token list directly, but like the rest of the parser they never match EOF.
     def match(self, *types):
-        for token_type in types:
-            if self.check(token_type):
-                self.advance()
-                return True
+        token_type = self.tokens[self.current].type
+        if token_type in types and token_type != TokenType.EOF:
+            self.current += 1
+            return True
         return False
 
     def consume(self, token_type, message):
@@ -54,9 +56,7 @@ class Parser:
         raise self.error(self.peek(), message)
 
     def check(self, token_type):
-        if self.is_at_end():
-            return False
-        return self.peek().type == token_type
+        return token_type != TokenType.EOF and self.tokens[self.current].type == token_type
 
     def advance(self):
         if not self.is_at_end():
@@ -140,6 +140,7 @@ class Parser:
         return self.expression_statement()
 
     def for_statement(self):
+        keyword = self.previous()
         self.consume(TokenType.LEFT_PAREN, "Expect '(' after 'for'.")
 
         if self.match(TokenType.SEMICOLON):
@@ -168,7 +169,7 @@ class Parser:
 
         if condition is None:
             condition = Literal(value=True)
-        body = While(condition=condition, body=body)
+        body = While(keyword=keyword, condition=condition, body=body)
 
         if initializer is not None:
             body = Block(statements=[initializer, body])
@@ -222,12 +223,13 @@ class Parser:
         return Var(name=name, type=type_, initializer=initializer)
 
     def while_statement(self):
+        keyword = self.previous()
         self.consume(TokenType.LEFT_PAREN, "Expect '(' after 'while'.")
         condition = self.expression()
         self.consume(TokenType.RIGHT_PAREN, "Expect ')' after condition.")
         body = self.statement()
 
-        return While(condition=condition, body=body)
+        return While(keyword=keyword, condition=condition, body=body)
 
     def expression_statement(self):
         expr = self.expression()
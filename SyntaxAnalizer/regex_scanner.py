@@ -0,0 +1,125 @@
+import re
+import sys
+
+from Token.token_type import TokenType
+from Token.token import Token
+from SyntaxAnalizer.scanner import Scanner, KEYWORDS
+from Runtime.interpreter import can_convert_to_int
+
+OPERATORS = {
+    "(": TokenType.LEFT_PAREN,
+    ")": TokenType.RIGHT_PAREN,
+    "{": TokenType.LEFT_BRACE,
+    "}": TokenType.RIGHT_BRACE,
+    "[": TokenType.LEFT_BRACKET,
+    "]": TokenType.RIGHT_BRACKET,
+    ":": TokenType.COLON,
+    ",": TokenType.COMMA,
+    ".": TokenType.DOT,
+    ";": TokenType.SEMICOLON,
+    "-": TokenType.MINUS,
+    "-=": TokenType.MINUS_EQUAL,
+    "+": TokenType.PLUS,
+    "+=": TokenType.PLUS_EQUAL,
+    "*": TokenType.STAR,
+    "*=": TokenType.STAR_EQUAL,
+    "/": TokenType.SLASH,
+    "/=": TokenType.SLASH_EQUAL,
+    "!": TokenType.BANG,
+    "!=": TokenType.BANG_EQUAL,
+    "=": TokenType.EQUAL,
+    "==": TokenType.EQUAL_EQUAL,
+    "<": TokenType.LESS,
+    "<=": TokenType.LESS_EQUAL,
+    ">": TokenType.GREATER,
+    ">=": TokenType.GREATER_EQUAL,
+}
+
+# Group numbers of MASTER_PATTERN, used to dispatch on match.lastindex.
+NEWLINE, COMMENT, NUMBER, WORD, STRING, OPERATOR, OTHER = range(1, 8)
+
+# Blanks are folded into the following match. Only ASCII input is matched here: numbers and words
+# followed by a non-ASCII character fall through to OTHER, so the character loop in Scanner.scan_token
+# applies its own str.isdigit/isalpha rules to them, and reports any scanning error.
+MASTER_PATTERN = re.compile(r"""
+    [ \r\t]*+
+    (?:
+        (\n)
+      | (//[^\n]*)
+      | ((?>[0-9]+(?:\.[0-9]+)?)(?![^\x00-\x7f])(?!\.[^\x00-\x7f]))
+      | ([A-Za-z_&|][A-Za-z0-9_&|]*+(?![^\x00-\x7f]))
+      | ("[^"]*")
+      | ([-+*/!=<>]=|[(){}\[\]:,.;\-+*/!=<>])
+      | (.|$)
+    )
+""", re.VERBOSE | re.DOTALL)
+
+# Scanner.declares_function for ASCII text: blanks and brackets, then a name, spaces and "(".
+FUNCTION_PATTERN = re.compile(r"[ \[\]]*+([A-Za-z_&|][A-Za-z0-9_&|]*+ *+)?+")
+
+
+class RegexScanner(Scanner):
+    def scan_tokens(self):
+        source = self.source
+        length = len(source)
+        tokens = self.tokens
+        append = tokens.append
+        keyword_type = KEYWORDS.get
+        # Names and operators repeat constantly, so their lexemes are shared rather than copied per token.
+        intern = sys.intern
+        identifier, var = TokenType.IDENTIFIER, TokenType.VAR
+        position = 0
+        line = self.line
+
+        while position < length:
+            for found in MASTER_PATTERN.finditer(source, position):
+                kind = found.lastindex
+                if kind == WORD:
+                    text = intern(found.group(WORD))
+                    type_ = keyword_type(text, identifier)
+                    if type_ is var and self.function_follows(found.end()):
+                        type_ = TokenType.FUN
+                    append(Token(type_, text, None, line))
+                elif kind == OPERATOR:
+                    text = found.group(OPERATOR)
+                    append(Token(OPERATORS[text], intern(text), None, line))
+                elif kind == NEWLINE:
+                    line += 1
+                elif kind == NUMBER:
+                    text = found.group(NUMBER)
+                    value = float(text)
+                    if can_convert_to_int(value):
+                        value = int(value)
+                    append(Token(TokenType.NUMBER, text, value, line))
+                elif kind == STRING:
+                    text = found.group(STRING)
+                    line += text.count("\n")
+                    append(Token(TokenType.STRING, text, text[1:-1], line))
+                elif kind == OTHER:
+                    position = found.start(OTHER)
+                    break
+            else:
+                position = length
+                break
+
+            if position >= length:
+                break
+            # Anything the pattern does not cover goes through the character loop, then matching resumes.
+            self.start = self.current = position
+            self.line = line
+            self.scan_token()
+            position = self.current
+            line = self.line
+
+        self.start = self.current = length
+        self.line = line
+        tokens.append(Token(TokenType.EOF, "", None, line))
+        return tokens
+
+    def function_follows(self, position):
+        found = FUNCTION_PATTERN.match(self.source, position)
+        end = found.end()
+        if end < len(self.source) and self.source[end] > "\x7f":
+            self.current = position
+            return self.declares_function()
+        return found.group(1) is not None and self.source.startswith("(", end)
@@ -1,15 +1,17 @@
 from Token.token_type import TokenType
 from Token.token import Token
-from Runtime.Language_.callbacks import scanner_error
+from Runtime.Language_.error_handler import ErrorHandler
 from Runtime.interpreter import can_convert_to_int
 
 class Scanner:
-    def __init__(self, source):
+    def __init__(self, source, line=1, error_handler=None):
         self.source = source
+        # A scanner built on its own prints its errors to stdout.
+        self.error_handler = error_handler if error_handler is not None else ErrorHandler()
         self.tokens = []
         self.start = 0
         self.current = 0
-        self.line = 1
+        self.line = line
 
     def scan_tokens(self):
         while not self.is_at_end():
@@ -72,7 +74,7 @@ class Scanner:
             elif c.isalpha() or c == "_" or c == "&" or c == "|":
                 self.identifier()
             else:
-                Scanner.error(self.line, "Unexpected character.")
+                self.error(self.line, "Unexpected character.")
 
     def identifier(self):
         while self.peek().isalnum() or self.peek() in {"_", "&", "|"}:
@@ -81,21 +83,27 @@ class Scanner:
         text = self.source[self.start:self.current]
         type_ = KEYWORDS.get(text, TokenType.IDENTIFIER)
 
+        if type_ == TokenType.VAR and self.declares_function():
+            type_ = TokenType.FUN
+        self.add_token(type_)
+
+    def declares_function(self):
+        # A type keyword followed by a name and "(" starts a function declaration rather than a variable.
         saved_position = self.current
-        if type_ == TokenType.VAR:
-            while self.peek() in {" ", "[", "]"}:
+        is_function = False
+        while self.peek() in {" ", "[", "]"}:
+            self.advance()
+        if self.peek().isalpha() or self.peek() in {"_", "&", "|"}:
+            self.advance()
+            while self.peek().isalnum() or self.peek() in {"_", "&", "|"}:
                 self.advance()
-            if self.peek().isalpha() or self.peek() in {"_", "&", "|"}:
+            while self.peek() == " ":
                 self.advance()
-                while self.peek().isalnum() or self.peek() in {"_", "&", "|"}:
-                    self.advance()
-                while self.peek() == " ":
-                    self.advance()
-                if self.peek() == "(":
-                    type_ = TokenType.FUN
+            if self.peek() == "(":
+                is_function = True
 
         self.current = saved_position
-        self.add_token(type_)
+        return is_function
 
     def number(self):
         while self.peek().isdigit():
@@ -118,7 +126,7 @@ class Scanner:
             self.advance()
 
         if self.is_at_end():
-            Scanner.error(self.line, "Unterminated string.")
+            self.error(self.line, "Unterminated string.")
             return
 
         self.advance()
@@ -157,7 +165,7 @@ class Scanner:
         self.tokens.append(token)
 
     def error(self, line, message):
-        scanner_error(line, message)
+        self.error_handler.error(line, message)
 
 
 KEYWORDS = {
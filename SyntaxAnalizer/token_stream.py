@@ -0,0 +1,86 @@
+import re
+from collections import deque
+
+from Token.token_type import TokenType
+from Token.token import Token
+from SyntaxAnalizer.regex_scanner import RegexScanner
+
+DEFAULT_CHUNK_SIZE = 64 * 1024
+
+# The first quote or comment start outside a string literal.
+QUOTE_OR_COMMENT = re.compile(r'"|//')
+
+
+def ends_in_string(text, in_string):
+    position = 0
+    while True:
+        if in_string:
+            position = text.find('"', position)
+            if position < 0:
+                return True
+            position += 1
+            in_string = False
+        else:
+            found = QUOTE_OR_COMMENT.search(text, position)
+            if found is None or found.group() == "//":
+                return False
+            position = found.end()
+            in_string = True
+
+
+def scan_stream(file, scanner_class=RegexScanner, chunk_size=DEFAULT_CHUNK_SIZE, error_handler=None):
+    # Tokens never span lines except string literals, so the file is scanned in chunks of whole lines
+    # that do not end inside a string.
+    line = 1
+    pending = []
+    pending_size = 0
+    in_string = False
+    for text in file:
+        pending.append(text)
+        pending_size += len(text)
+        in_string = ends_in_string(text, in_string)
+        if in_string or pending_size < chunk_size:
+            continue
+        scanner = scanner_class("".join(pending), line=line, error_handler=error_handler)
+        yield from scanner.scan_tokens()[:-1]
+        line = scanner.line
+        pending = []
+        pending_size = 0
+
+    if pending:
+        scanner = scanner_class("".join(pending), line=line, error_handler=error_handler)
+        yield from scanner.scan_tokens()[:-1]
+        line = scanner.line
+    yield Token(TokenType.EOF, "", None, line)
+
+
+class TokenStream:
+    # Indexable like the token list the Parser expects, but only a bounded window of recent tokens is kept.
+    def __init__(self, tokens, capacity=64):
+        self.tokens = iter(tokens)
+        self.capacity = capacity
+        self.buffer = deque()
+        self.offset = 0
+        self.exhausted = False
+
+    def __getitem__(self, index):
+        position = index - self.offset
+        if 0 <= position < len(self.buffer):
+            return self.buffer[position]
+
+        while index >= self.offset + len(self.buffer) and not self.exhausted:
+            token = next(self.tokens, None)
+            if token is None:
+                self.exhausted = True
+                break
+            self.buffer.append(token)
+            if len(self.buffer) > self.capacity:
+                self.buffer.popleft()
+                self.offset += 1
+
+        if index >= self.offset + len(self.buffer):
+            # Past the end of the stream the Parser only ever sees the final EOF token again.
+            return self.buffer[-1]
+        if index < self.offset:
+            raise IndexError(f"Token {index} has left the {self.capacity}-token window.")
+        return self.buffer[index - self.offset]
@@ -1,10 +1,13 @@
 
 class Token:
+    __slots__ = ("type", "lexeme", "literal", "line", "_hash")
+
     def __init__(self, type, lexeme, literal, line):
         self.type = type
         self.lexeme = lexeme
         self.literal = literal
         self.line = line
+        self._hash = None
 
     def __str__(self):
         return f"{self.type} {self.lexeme} {str(self.literal)}"
@@ -16,4 +19,7 @@ class Token:
                self.line == other.line
 
     def __hash__(self):
-        return hash((self.type, self.lexeme, str(self.literal), self.line))
+        # Cached on first use: most tokens are never hashed, and the str(literal) call is not free.
+        if self._hash is None:
+            self._hash = hash((self.type, self.lexeme, str(self.literal), self.line))
+        return self._hash
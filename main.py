@@ -103,14 +103,6 @@ WriteLine(count1);
 from Runtime.Language_.callbacks import report_error, runtime_error, scanner_error, init_language
 from Runtime.Language_.language import Language
 
-#
-# def main_scanner_error(line, message):
-#     print(f"[line {line}] ScannerError: {message}")
-#
-#
-# # Use the new set_scanner_error_handler function
-# Language.set_scanner_error_handler(main_scanner_error)
-
 sharpCode1 = """
 int a = 10;
 
@@ -0,0 +1,27 @@
+import pytest
+
+from Runtime.Language_.session import Session
+from Runtime.output_sink import CaptureSink
+
+ENGINES = ("tree", "vm", "closures", "python")
+
+
+@pytest.fixture(params=ENGINES)
+def engine(request):
+    return request.param
+
+
+@pytest.fixture
+def run(engine):
+    # Runs each source in turn on one fresh Session and returns everything it printed. Keyword arguments
+    # go to the Session; max_steps is set on its interpreter, and engine overrides the fixture's.
+    def run(*sources, engine=engine, max_steps=None, **session_options):
+        output = CaptureSink()
+        session = Session(output=output, **session_options)
+        if max_steps is not None:
+            session.interpreter.set_limits(max_steps=max_steps)
+        for source in sources:
+            session.run(source, engine=engine)
+        return output.getvalue()
+
+    return run
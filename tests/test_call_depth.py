@@ -0,0 +1,14 @@
+import pytest
+
+RECURSION = "int f(int n) { if (n == 0) return 0; return f(n - 1) + 1; } WriteLine(f(%d));"
+CONSTRUCTOR = "int d = 0; class A { void init(int n) { d = d + 1; if (n > 0) { A(n - 1); } } } A(%d); WriteLine(d);"
+
+
+@pytest.mark.parametrize("source", [RECURSION, CONSTRUCTOR])
+def test_max_call_depth_is_enforced(run, source):
+    assert run(source % 100, max_call_depth=50) == "[line 1]: Stack overflow.\n"
+
+
+@pytest.mark.parametrize("source", [RECURSION, CONSTRUCTOR])
+def test_recursion_up_to_default_max_call_depth(run, source):
+    assert not run(source % 9990, max_call_depth=10_000).startswith("[line 1]: Stack overflow.")
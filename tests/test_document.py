@@ -0,0 +1,47 @@
+import random
+
+import pytest
+
+from Runtime.Language_.document import Document
+
+SOURCE = """int a = 1;
+void f(int x) {
+    WriteLine(x + a);
+}
+string s = "hi";
+class C {
+    void m() { WriteLine(1); }
+}
+f(2);
+int b = a + 2;
+"""
+
+SNIPPETS = ["", "\n", "\n\n", ";", "{", "}", "(", ")", '"', "x", "int q = 3;", "WriteLine(a);\n",
+            "if (a > 0) { b = 1; }", "else { }", "return;", '"abc\n def"']
+
+
+def random_edit(rng, document):
+    lines = document.lines
+    start_line = rng.randint(1, len(lines))
+    end_line = rng.randint(start_line, min(len(lines), start_line + 2))
+    start_column = rng.randint(0, len(lines[start_line - 1]))
+    end_column = rng.randint(0, len(lines[end_line - 1]))
+    if start_line == end_line and end_column < start_column:
+        start_column, end_column = end_column, start_column
+    return start_line, start_column, end_line, end_column, rng.choice(SNIPPETS)
+
+
+@pytest.mark.parametrize("seed", range(100))
+def test_incremental_diagnostics_match_full_parse(seed):
+    rng = random.Random(seed)
+    document = Document(SOURCE)
+    for _ in range(20):
+        document.apply_edit(*random_edit(rng, document))
+        expected = [str(diagnostic) for diagnostic in Document(document.text).diagnostics()]
+        assert [str(diagnostic) for diagnostic in document.diagnostics()] == expected
+
+
+def test_diagnostics_are_sorted_by_line():
+    document = Document("int a = ;\n{ int b = 1; int b = 2; }\nint c = ;\n")
+    lines = [diagnostic.line for diagnostic in document.diagnostics()]
+    assert lines == sorted(lines)
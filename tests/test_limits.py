@@ -0,0 +1,15 @@
+import pytest
+
+LOOPS = [
+    "int i = 0; while (i < 10) { WriteLine(i); i = i + 1; }",
+    "for (int i = 0; i < 10; i = i + 1) { WriteLine(i); }",
+    "void f(int n) { int i = 0; while (i < n) { WriteLine(i); i = i + 1; } } f(10);",
+]
+
+
+@pytest.mark.parametrize("source", LOOPS)
+@pytest.mark.parametrize("max_steps", [0, 1, 2, 5])
+def test_step_budget_is_the_same_on_every_engine(run, source, max_steps):
+    expected = run(source, engine="tree", max_steps=max_steps)
+    assert expected.endswith("Step limit exceeded.\n")
+    assert run(source, max_steps=max_steps) == expected
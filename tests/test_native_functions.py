@@ -0,0 +1,13 @@
+import pytest
+
+
+@pytest.mark.parametrize("source", [
+    'int[] a = {1, 2, 3}; Fill(a, "x"); WriteLine(a);',
+    "float[] a = {1.5, 2.5}; Fill(a, 3); WriteLine(a);",
+])
+def test_fill_rejects_value_of_another_type(run, source):
+    assert run(source) == "[line 1]: Unexpected assignment value type.\n"
+
+
+def test_fill_keeps_element_type(run):
+    assert run("int[] a = {1, 2, 3}; Fill(a, 7); WriteLine(Sum(a));") == "21\n"
@@ -0,0 +1,40 @@
+import pytest
+
+from Token.token_type import TokenType
+from SyntaxAnalizer.regex_scanner import RegexScanner
+from SyntaxAnalizer.parser import Parser
+from Runtime.Language_.error_handler import DiagnosticCollector
+
+SOURCE = """int a = 1;
+int[] xs = {1, 2, 3};
+class C { void m(int x) { WriteLine(x); } }
+void f(int n) { if (n > 0) { f(n - 1); } else { WriteLine(xs[0] + a); } }
+for (int i = 0; i < 3; i = i + 1) { C().m(i); }
+while (a < 3) { a += 1; }
+"""
+
+
+def parse(source):
+    collector = DiagnosticCollector()
+    parser = Parser(RegexScanner(source, error_handler=collector).scan_tokens(), collector)
+    return parser, parser.parse(), collector.diagnostics
+
+
+def test_match_and_check_never_take_eof():
+    parser, _, _ = parse("")
+    assert parser.is_at_end()
+    assert not parser.check(TokenType.EOF)
+    assert not parser.match(TokenType.EOF, TokenType.SEMICOLON)
+    assert parser.is_at_end()
+
+
+@pytest.mark.parametrize("end", range(len(SOURCE) + 1))
+def test_every_prefix_parses_without_reading_past_eof(end):
+    parser, _, _ = parse(SOURCE[:end])
+    assert parser.is_at_end()
+
+
+def test_missing_semicolon_at_end():
+    _, _, diagnostics = parse("int a = 1")
+    assert [(diagnostic.where, diagnostic.message) for diagnostic in diagnostics] == \
+           [(" at end", "Expect ';' after variable declaration.")]
@@ -0,0 +1,54 @@
+import io
+
+import pytest
+
+from Token.token_type import TokenType
+from SyntaxAnalizer.scanner import Scanner
+from SyntaxAnalizer.regex_scanner import RegexScanner
+from Runtime.Language_.session import Session
+from Runtime.output_sink import CaptureSink
+from Runtime.compile_cache import CompileCache
+
+
+def run_stream(source):
+    output = CaptureSink()
+    Session(output=output).run_stream(io.StringIO(source))
+    return output.getvalue()
+
+
+@pytest.mark.parametrize("source", [
+    "{ int a = 1; int a = 2; WriteLine(a); }",
+    "return; WriteLine(1);",
+    "int x = ; WriteLine(1);",
+])
+def test_run_stream_stops_at_compile_error(source):
+    assert run_stream(source).splitlines()[-1].startswith("[line 1] Error")
+
+
+def test_run_stream_runs_declarations_before_the_error():
+    assert run_stream("WriteLine(0); return; WriteLine(1);").splitlines()[0] == "0"
+
+
+def test_cached_run_clears_errors_of_earlier_compile(tmp_path):
+    session = Session(output=CaptureSink(), compile_cache=CompileCache(str(tmp_path)))
+    good = "WriteLine(1);"
+    session.run(good, use_cache=True)
+    session.run("int = ;")
+    assert session.had_error
+    session.run(good, use_cache=True)
+    assert not session.had_error
+
+
+def test_clean_run_clears_runtime_error_of_earlier_run():
+    session = Session(output=CaptureSink())
+    session.run('WriteLine(1 + "a");')
+    assert session.had_runtime_error
+    session.run("WriteLine(1);")
+    assert not session.had_runtime_error
+
+
+@pytest.mark.parametrize("scanner_class", [Scanner, RegexScanner])
+def test_scanner_without_error_handler_reports_errors(scanner_class, capsys):
+    tokens = scanner_class('"abc').scan_tokens()
+    assert tokens[-1].type == TokenType.EOF
+    assert capsys.readouterr().out == "[line 1] Error: Unterminated string.\n"
@@ -0,0 +1,11 @@
+def test_compound_assignment_from_earlier_run_keeps_check(run):
+    # f updates the top-level slot of g, which the second run declares again as an int.
+    sources = ["int g = 1; void f() { g /= 2; }", "int g = 3; f(); int k = g; WriteLine(k);"]
+    expected = run(*sources, optimize=False)
+    assert "Value does not match variable's type" in expected
+    assert run(*sources, optimize=True) == expected
+
+
+def test_bool_compound_assignment_from_earlier_run_keeps_check(run):
+    sources = ["bool b = true; void f() { b += 1; }", "bool b = false; f(); bool c = b; WriteLine(c);"]
+    assert run(*sources, optimize=True) == run(*sources, optimize=False)